@@ -6,7 +6,7 @@ import logging.handlers
 import os
 import sys
 from time import monotonic
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 from async_timeout import timeout
 import voluptuous as vol
@@ -19,10 +19,21 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform
+from homeassistant.helpers.startup_timeline import (
+    PHASE_IMPORT,
+    async_record_phase,
+    async_start_timeline,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import DATA_SETUP, DATA_SETUP_STARTED, async_setup_component
 from homeassistant.util.logging import async_activate_log_queue_handler
-from homeassistant.util.package import async_get_user_site, is_virtual_env
+from homeassistant.util.package import (
+    async_get_user_site,
+    installed_versions,
+    is_installed,
+    is_virtual_env,
+)
 from homeassistant.util.yaml import clear_secret_cache
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,6 +45,10 @@ DATA_LOGGING = "logging"
 
 LOG_SLOW_STARTUP_INTERVAL = 60
 
+# Number of integrations imported in the executor at the same time while they
+# wait to be set up, leaving executor threads to the integrations being set up
+PREFETCH_CONCURRENCY = 4
+
 DEBUGGER_INTEGRATIONS = {"ptvsd"}
 CORE_INTEGRATIONS = ("homeassistant", "persistent_notification")
 LOGGING_INTEGRATIONS = {"logger", "system_log", "sentry"}
@@ -330,6 +345,71 @@ def _get_domains(hass: core.HomeAssistant, config: Dict[str, Any]) -> Set[str]:
     return domains
 
 
+async def _async_prefetch_integrations(
+    hass: core.HomeAssistant, config: Dict[str, Any], domains: Set[str]
+) -> None:
+    """Import integrations and their configured platforms in the executor.
+
+    Integrations that depend on requirements which are not installed yet are
+    imported by their setup once the requirements are processed, so an
+    outdated package is never imported before it is upgraded.
+    """
+    platforms: Dict[str, List[str]] = {}
+    for domain in domains:
+        for platform_name, _ in config_per_platform(config, domain):
+            if isinstance(platform_name, str):
+                platforms.setdefault(platform_name, []).append(domain)
+
+    if not hass.config.skip_pip:
+        # Scan the installed packages in the executor if they changed,
+        # checking the requirements is then a lookup.
+        await hass.async_add_executor_job(installed_versions)
+
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+
+    async def async_prefetch(domain: str) -> None:
+        """Import an integration and its platforms."""
+        try:
+            integration = await loader.async_get_integration(hass, domain)
+            dependencies = await loader.async_component_dependencies(hass, domain)
+        except (loader.IntegrationNotFound, loader.CircularDependency):
+            # Reported during setup of the domain
+            return
+
+        if not hass.config.skip_pip:
+            requirements = []
+            for dependency in dependencies:
+                dep_integration = await loader.async_get_integration(hass, dependency)
+                requirements.extend(dep_integration.requirements)
+
+            if not all(is_installed(req) for req in requirements):
+                return
+
+        async with semaphore:
+            with async_record_phase(hass, domain, PHASE_IMPORT):
+                await integration.async_import_modules(platforms.get(domain, ()))
+
+    await asyncio.gather(
+        *(async_prefetch(domain) for domain in domains | set(platforms))
+    )
+
+
+def _log_import_times(hass: core.HomeAssistant) -> None:
+    """Log how long the integrations took to import, slowest first."""
+    import_times: Dict[str, float] = hass.data.get(loader.DATA_IMPORT_TIMES, {})
+
+    if import_times:
+        _LOGGER.debug(
+            "Integration import times: %s",
+            ", ".join(
+                f"{domain}: {duration:.2f}s"
+                for domain, duration in sorted(
+                    import_times.items(), key=lambda item: item[1], reverse=True
+                )
+            ),
+        )
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: Dict[str, Any]
 ) -> None:
@@ -369,90 +449,109 @@ async def _async_set_up_integrations(
                 exc_info=(type(exception), exception, exception.__traceback__),
             )
 
-    domains = _get_domains(hass, config)
+    timeline = async_start_timeline(hass)
+    try:
+        domains = _get_domains(hass, config)
+
+        # Start up debuggers. Start these first in case they want to wait.
+        debuggers = domains & DEBUGGER_INTEGRATIONS
+        if debuggers:
+            _LOGGER.debug("Starting up debuggers %s", debuggers)
+            await async_setup_multi_components(debuggers)
+            domains -= DEBUGGER_INTEGRATIONS
+
+        # Resolve all dependencies of all components so we can find the logging
+        # and integrations that need faster initialization. The integrations are
+        # resolved together first, so only the dependencies not configured
+        # themselves are resolved one by one.
+        await loader.async_get_integrations(hass, domains)
+        resolved_domains_task = asyncio.gather(
+            *(loader.async_component_dependencies(hass, domain) for domain in domains),
+            return_exceptions=True,
+        )
 
-    # Start up debuggers. Start these first in case they want to wait.
-    debuggers = domains & DEBUGGER_INTEGRATIONS
-    if debuggers:
-        _LOGGER.debug("Starting up debuggers %s", debuggers)
-        await async_setup_multi_components(debuggers)
-        domains -= DEBUGGER_INTEGRATIONS
+        # Finish resolving domains
+        for dep_domains in await resolved_domains_task:
+            # Result is either a set or an exception. We ignore exceptions
+            # It will be properly handled during setup of the domain.
+            if isinstance(dep_domains, set):
+                domains.update(dep_domains)
 
-    # Resolve all dependencies of all components so we can find the logging
-    # and integrations that need faster initialization.
-    resolved_domains_task = asyncio.gather(
-        *(loader.async_component_dependencies(hass, domain) for domain in domains),
-        return_exceptions=True,
-    )
+        # Import the integrations while the ones before them are set up
+        prefetch_task = hass.async_create_task(
+            _async_prefetch_integrations(hass, config, set(domains))
+        )
 
-    # Finish resolving domains
-    for dep_domains in await resolved_domains_task:
-        # Result is either a set or an exception. We ignore exceptions
-        # It will be properly handled during setup of the domain.
-        if isinstance(dep_domains, set):
-            domains.update(dep_domains)
+        # setup components
+        logging_domains = domains & LOGGING_INTEGRATIONS
+        stage_1_domains = domains & STAGE_1_INTEGRATIONS
+        stage_2_domains = domains - logging_domains - stage_1_domains
 
-    # setup components
-    logging_domains = domains & LOGGING_INTEGRATIONS
-    stage_1_domains = domains & STAGE_1_INTEGRATIONS
-    stage_2_domains = domains - logging_domains - stage_1_domains
+        if logging_domains:
+            _LOGGER.info("Setting up %s", logging_domains)
 
-    if logging_domains:
-        _LOGGER.info("Setting up %s", logging_domains)
+            await async_setup_multi_components(logging_domains)
 
-        await async_setup_multi_components(logging_domains)
+        # Kick off loading the registries. They don't need to be awaited.
+        asyncio.gather(
+            hass.helpers.device_registry.async_get_registry(),
+            hass.helpers.entity_registry.async_get_registry(),
+            hass.helpers.area_registry.async_get_registry(),
+        )
 
-    # Kick off loading the registries. They don't need to be awaited.
-    asyncio.gather(
-        hass.helpers.device_registry.async_get_registry(),
-        hass.helpers.entity_registry.async_get_registry(),
-        hass.helpers.area_registry.async_get_registry(),
-    )
+        if stage_1_domains:
+            _LOGGER.info("Setting up %s", stage_1_domains)
 
-    if stage_1_domains:
-        _LOGGER.info("Setting up %s", stage_1_domains)
+            await async_setup_multi_components(stage_1_domains)
 
-        await async_setup_multi_components(stage_1_domains)
+        # Load all integrations
+        after_dependencies: Dict[str, Set[str]] = {}
 
-    # Load all integrations
-    after_dependencies: Dict[str, Set[str]] = {}
+        for int_or_exc in (
+            await loader.async_get_integrations(hass, stage_2_domains)
+        ).values():
+            # Exceptions are handled in async_setup_component.
+            if (
+                isinstance(int_or_exc, loader.Integration)
+                and int_or_exc.after_dependencies
+            ):
+                after_dependencies[int_or_exc.domain] = set(
+                    int_or_exc.after_dependencies
+                )
 
-    for int_or_exc in await asyncio.gather(
-        *(loader.async_get_integration(hass, domain) for domain in stage_2_domains),
-        return_exceptions=True,
-    ):
-        # Exceptions are handled in async_setup_component.
-        if isinstance(int_or_exc, loader.Integration) and int_or_exc.after_dependencies:
-            after_dependencies[int_or_exc.domain] = set(int_or_exc.after_dependencies)
+        last_load = None
+        while stage_2_domains:
+            domains_to_load = set()
 
-    last_load = None
-    while stage_2_domains:
-        domains_to_load = set()
+            for domain in stage_2_domains:
+                after_deps = after_dependencies.get(domain)
+                # Load if integration has no after_dependencies or they are
+                # all loaded
+                if not after_deps or not after_deps - hass.config.components:
+                    domains_to_load.add(domain)
 
-        for domain in stage_2_domains:
-            after_deps = after_dependencies.get(domain)
-            # Load if integration has no after_dependencies or they are
-            # all loaded
-            if not after_deps or not after_deps - hass.config.components:
-                domains_to_load.add(domain)
+            if not domains_to_load or domains_to_load == last_load:
+                break
 
-        if not domains_to_load or domains_to_load == last_load:
-            break
+            _LOGGER.debug("Setting up %s", domains_to_load)
 
-        _LOGGER.debug("Setting up %s", domains_to_load)
+            await async_setup_multi_components(domains_to_load)
 
-        await async_setup_multi_components(domains_to_load)
+            last_load = domains_to_load
+            stage_2_domains -= domains_to_load
 
-        last_load = domains_to_load
-        stage_2_domains -= domains_to_load
+        # These are stage 2 domains that never have their after_dependencies
+        # satisfied.
+        if stage_2_domains:
+            _LOGGER.debug("Final set up: %s", stage_2_domains)
 
-    # These are stage 2 domains that never have their after_dependencies
-    # satisfied.
-    if stage_2_domains:
-        _LOGGER.debug("Final set up: %s", stage_2_domains)
+            await async_setup_multi_components(stage_2_domains)
 
-        await async_setup_multi_components(stage_2_domains)
+        await prefetch_task
+        _log_import_times(hass)
 
-    # Wrap up startup
-    _LOGGER.debug("Waiting for startup to wrap up")
-    await hass.async_block_till_done()
+        # Wrap up startup
+        _LOGGER.debug("Waiting for startup to wrap up")
+        await hass.async_block_till_done()
+    finally:
+        timeline.async_stop()
@@ -2,7 +2,7 @@
 import asyncio
 import importlib
 import logging
-from typing import Any, Awaitable, Callable, List, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 import voluptuous as vol
 
@@ -23,7 +23,12 @@ from homeassistant.const import (
 )
 from homeassistant.core import Context, CoreState, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import condition, extract_domain_configs, script
+from homeassistant.helpers import (
+    condition,
+    extract_domain_configs,
+    script,
+    template as template_helper,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
@@ -211,8 +216,8 @@ async def async_setup(hass, config):
     component.async_register_entity_service(SERVICE_TURN_OFF, {}, "async_turn_off")
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Reload the automations whose config changed."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -249,6 +254,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         cond_func,
         action_script,
         initial_state,
+        raw_config=None,
     ):
         """Initialize an automation entity."""
         self._id = automation_id
@@ -262,6 +268,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         self._is_enabled = False
         self._referenced_entities: Optional[Set[str]] = None
         self._referenced_devices: Optional[Set[str]] = None
+        self.raw_config = raw_config
 
     @property
     def name(self):
@@ -498,9 +505,17 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations that already run with the same config are kept, so their
+    triggers stay attached and their runs are not interrupted. The ones that
+    are no longer configured or whose config changed are removed.
+
     This method is a coroutine.
     """
     entities = []
+    running: Dict[Tuple[Optional[str], str], List[AutomationEntity]] = {}
+
+    for entity in component.entities:
+        running.setdefault((entity.unique_id, entity.name), []).append(entity)
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf = config[config_key]
@@ -509,6 +524,11 @@ async def _async_process_config(hass, config, component):
             automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
 
+            # Templates only compare equal once they are attached to hass
+            template_helper.attach(hass, config_block)
+            if _async_keep_running(running, (automation_id, name), config_block):
+                continue
+
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
             action_script = script.Script(
@@ -530,14 +550,32 @@ async def _async_process_config(hass, config, component):
                 cond_func,
                 action_script,
                 initial_state,
+                config_block,
             )
 
             entities.append(entity)
 
+    removed = [entity for candidates in running.values() for entity in candidates]
+    if removed:
+        await asyncio.gather(*[entity.async_remove() for entity in removed])
+
     if entities:
         await component.async_add_entities(entities)
 
 
+@callback
+def _async_keep_running(running, key, config_block):
+    """Keep a running automation if its config did not change."""
+    candidates = running.get(key, [])
+
+    for idx, entity in enumerate(candidates):
+        if entity.raw_config == config_block:
+            del candidates[idx]
+            return True
+
+    return False
+
+
 async def _async_process_if(hass, config, p_config):
     """Process if checks."""
     if_configs = p_config[CONF_CONDITION]
@@ -1,18 +1,33 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import timedelta
+import heapq
 from itertools import groupby
+import json
 import logging
 import time
-from typing import Optional, cast
+from typing import Optional
 
 from aiohttp import web
-from sqlalchemy import and_, func
+from aiohttp.hdrs import CONTENT_TYPE
+from sqlalchemy import and_, case, distinct, func
+from sqlalchemy.exc import SQLAlchemyError
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import States, process_timestamp
+from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES,
+    StateAttributes,
+    States,
+    Statistics,
+    process_timestamp,
+)
+from homeassistant.components.recorder.statistics import (
+    PERIOD_HOUR,
+    PERIODS,
+    period_start,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     ATTR_HIDDEN,
@@ -20,10 +35,12 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import split_entity_id
+from homeassistant.core import State, split_entity_id
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -55,7 +72,7 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    STATE_ATTRIBUTES,
     States.last_changed,
     States.last_updated,
     States.created,
@@ -63,6 +80,33 @@ QUERY_STATES = [
     States.context_user_id,
 ]
 
+# Columns of the states only drawn as a line in minimal responses, these
+# are not converted to State objects. Their attributes are only selected
+# when they mention the hidden attribute, to check it once decoded.
+QUERY_STATES_MINIMAL = [
+    States.state_id,
+    States.entity_id,
+    States.state,
+    States.last_changed,
+    case(
+        [(STATE_ATTRIBUTES.like(f'%"{ATTR_HIDDEN}":%'), STATE_ATTRIBUTES)], else_=None,
+    ).label("hidden_attributes"),
+]
+
+# Maximum number of states read by primary key in a single query
+MAX_STATE_IDS_PER_QUERY = 500
+# Number of entities whose states are streamed per executor job and session
+STREAM_ENTITIES_PER_JOB = 50
+# Last element of a streamed history response that could not be completed
+STREAM_ERROR = b'{"error": "Failed to fetch the history of all entities"}'
+
+
+def _query_states(session, columns=None):
+    """Query the QUERY_STATES columns, joining in the shared attributes."""
+    return session.query(*(columns or QUERY_STATES)).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -70,6 +114,51 @@ def get_significant_states(hass, *args, **kwargs):
         return _get_significant_states(hass, session, *args, **kwargs)
 
 
+def _significant_states_query(
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    columns=None,
+):
+    """Query the significant states sorted by entity_id and last_updated."""
+    query = _filter_significant_states(
+        _query_states(session, columns),
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+    return query.order_by(States.entity_id, States.last_updated)
+
+
+def _filter_significant_states(
+    query, start_time, end_time, entity_ids, filters, significant_changes_only
+):
+    """Filter a query of states down to the significant states."""
+    if significant_changes_only:
+        query = query.filter(
+            (
+                States.domain.in_(SIGNIFICANT_DOMAINS)
+                | (States.last_changed == States.last_updated)
+            )
+            & (States.last_updated > start_time)
+        )
+    else:
+        query = query.filter(States.last_updated > start_time)
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query
+
+
 def _get_significant_states(
     hass,
     session,
@@ -90,26 +179,34 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    if significant_changes_only:
-        query = session.query(*QUERY_STATES).filter(
-            (
-                States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
-            )
-            & (States.last_updated > start_time)
+    query = _significant_states_query(
+        session, start_time, end_time, entity_ids, filters, significant_changes_only
+    )
+
+    if minimal_response:
+        minimal_query = _significant_states_query(
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            QUERY_STATES_MINIMAL,
+        )
+        # Both are sorted by entity_id and an entity is only in one of them
+        states = heapq.merge(
+            execute(
+                query.filter(States.domain.in_(NEED_ATTRIBUTE_DOMAINS)),
+                to_native=False,
+            ),
+            execute(
+                minimal_query.filter(~States.domain.in_(NEED_ATTRIBUTE_DOMAINS)),
+                to_native=False,
+            ),
+            key=lambda state: state.entity_id,
         )
     else:
-        query = session.query(*QUERY_STATES).filter(States.last_updated > start_time)
-
-    if filters:
-        query = filters.apply(query, entity_ids)
-
-    if end_time is not None:
-        query = query.filter(States.last_updated < end_time)
-
-    query = query.order_by(States.entity_id, States.last_updated)
-
-    states = execute(query, to_native=False)
+        states = execute(query, to_native=False)
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
@@ -131,7 +228,7 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
     """Return states changes during UTC period start_time - end_time."""
 
     with session_scope(hass=hass) as session:
-        query = session.query(*QUERY_STATES).filter(
+        query = _query_states(session).filter(
             (States.last_changed == States.last_updated)
             & (States.last_updated > start_time)
         )
@@ -140,7 +237,7 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             query = query.filter(States.last_updated < end_time)
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
@@ -151,18 +248,60 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
         return _sorted_states_to_json(hass, session, states, start_time, entity_ids)
 
 
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=PERIOD_HOUR
+):
+    """Return the rollups of the periods between start_time and end_time.
+
+    Rollups are kept when the states are purged, so they can answer
+    queries over long ranges from a few rows per entity and day.
+    """
+    timer_start = time.perf_counter()
+
+    with session_scope(hass=hass) as session:
+        query = (
+            session.query(Statistics)
+            .filter(Statistics.period == period)
+            .filter(Statistics.start >= period_start(period, start_time))
+        )
+
+        if end_time is not None:
+            query = query.filter(Statistics.start < end_time)
+
+        if entity_ids is not None:
+            query = query.filter(Statistics.entity_id.in_(entity_ids))
+
+        query = query.order_by(Statistics.entity_id, Statistics.start)
+
+        result = defaultdict(list)
+        # Set all entity IDs to empty lists in result set to maintain the order
+        if entity_ids is not None:
+            for ent_id in entity_ids:
+                result[ent_id] = []
+
+        for row in execute(query, to_native=False):
+            result[row.entity_id].append(row.to_dict())
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("statistics_during_period took %fs", elapsed)
+
+    # Filter out the empty lists if some entities had no rollups.
+    return {key: val for key, val in result.items() if val}
+
+
 def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
 
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        query = session.query(*QUERY_STATES).filter(
+        query = _query_states(session).filter(
             States.last_changed == States.last_updated
         )
 
         if entity_id is not None:
-            query = query.filter_by(entity_id=entity_id.lower())
+            query = query.filter(States.entity_id == entity_id.lower())
 
         entity_ids = [entity_id] if entity_id is not None else None
 
@@ -210,7 +349,7 @@ def _get_states_with_session(
         if run is None:
             return []
 
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     if entity_ids and len(entity_ids) == 1:
         # Use an entirely different (and extremely fast) query if we only
@@ -304,88 +443,225 @@ def _sorted_states_to_json(
             result[ent_id] = []
 
     # Get the states at the start time
-    timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            session, start_time, entity_ids, run=run, filters=filters
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
         ):
-            state.last_changed = start_time
-            state.last_updated = start_time
             result[state.entity_id].append(state)
 
+    # Append all changes to it
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        _entity_states_to_json(ent_id, result[ent_id], group, minimal_response)
+
+    if minimal_response:
+        _load_full_states(session, result.values())
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_significant_entity_ids(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    ordered_entity_ids=None,
+):
+    """Return the entities with significant states and their start states.
+
+    The entities in entity_ids or else ordered_entity_ids come first in that
+    order, followed by the other entities sorted by entity_id. The states
+    of each entity can then be fetched one entity at a time with
+    _get_entity_significant_states.
+    """
+    start_states = {}
+    if include_start_time_state:
+        start_states = {
+            state.entity_id: state
+            for state in _get_start_time_states(
+                hass, session, start_time, entity_ids, filters
+            )
+        }
+
+    if entity_ids:
+        found = list(entity_ids)
+    else:
+        query = _filter_significant_states(
+            session.query(distinct(States.entity_id)),
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+        found = {ent_id for (ent_id,) in execute(query, to_native=False)}
+        found = sorted(found.union(start_states))
+
+    ordered = [ent_id for ent_id in ordered_entity_ids or [] if ent_id in found]
+    return ordered + [ent_id for ent_id in found if ent_id not in ordered], start_states
+
+
+def _get_entity_significant_states(
+    session,
+    entity_id,
+    start_state,
+    start_time,
+    end_time=None,
+    filters=None,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Return the significant states of a single entity.
+
+    Gives the same list as _get_significant_states does for the entity.
+    """
+    ent_results = [start_state] if start_state is not None else []
+    minimal_rows = (
+        minimal_response and split_entity_id(entity_id)[0] not in NEED_ATTRIBUTE_DOMAINS
+    )
+    query = _significant_states_query(
+        session,
+        start_time,
+        end_time,
+        [entity_id],
+        filters,
+        significant_changes_only,
+        QUERY_STATES_MINIMAL if minimal_rows else None,
+    )
+    _entity_states_to_json(
+        entity_id, ent_results, execute(query, to_native=False), minimal_response
+    )
+
+    if minimal_rows:
+        _load_full_states(session, [ent_results])
+
+    return ent_results
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at the start time as the first data points."""
+    timer_start = time.perf_counter()
+
+    run = recorder.run_information_from_instance(hass, start_time)
+    states = _get_states_with_session(
+        session, start_time, entity_ids, run=run, filters=filters
+    )
+    for state in states:
+        state.last_changed = start_time
+        state.last_updated = start_time
+
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug("getting %d first datapoints took %fs", len(states), elapsed)
+
+    return states
+
+
+def _minimal_row_hidden(row):
+    """Return if a QUERY_STATES_MINIMAL row is the state of a hidden entity."""
+    if row.hidden_attributes is None:
+        return False
+
+    try:
+        return bool(json.loads(row.hidden_attributes).get(ATTR_HIDDEN, False))
+    except ValueError:
+        _LOGGER.exception("Error decoding the attributes of %s", row.entity_id)
+        return False
+
+
+def _entity_states_to_json(ent_id, ent_results, group, minimal_response):
+    """Append the sorted states of an entity to its results."""
+    group = iter(group)
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(
+            [
+                native_state
+                for native_state in (States.to_native(db_state) for db_state in group)
+                if (
+                    domain != SCRIPT_DOMAIN
+                    or native_state.attributes.get(ATTR_CAN_CANCEL)
+                )
+                and not native_state.attributes.get(ATTR_HIDDEN, False)
+            ]
+        )
+        return
 
     # Called in a tight loop so cache the function
     # here
     _process_timestamp = process_timestamp
 
-    # Append all changes to it
-    for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(
-                [
-                    native_state
-                    for native_state in (
-                        States.to_native(db_state) for db_state in group
-                    )
-                    if (
-                        domain != SCRIPT_DOMAIN
-                        or native_state.attributes.get(ATTR_CAN_CANCEL)
-                    )
-                    and not native_state.attributes.get(ATTR_HIDDEN, False)
-                ]
-            )
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed". The rows are QUERY_STATES_MINIMAL rows,
+    # the first and last are loaded by _load_full_states.
+    if not ent_results:
+        first_state = next(group, None)
+        if first_state is None:
+            return
+        ent_results.append(first_state)
+
+    initial_state = ent_results[-1]
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    for db_state in group:
+        if _minimal_row_hidden(db_state):
             continue
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(States.to_native(next(group)))
-
-        initial_state = ent_results[-1]
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            if ATTR_HIDDEN in db_state.attributes and States.to_native(
-                db_state
-            ).attributes.get(ATTR_HIDDEN, False):
-                continue
-
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp(
-                        db_state.last_changed
-                    ).isoformat(),
-                }
-            )
-            prev_state = db_state
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
 
-        if (
-            prev_state
-            and prev_state != initial_state
-            and len(ent_results) != initial_state_count
-        ):
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = States.to_native(prev_state)
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp(db_state.last_changed).isoformat(),
+            }
+        )
+        prev_state = db_state
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    if (
+        prev_state
+        and prev_state != initial_state
+        and len(ent_results) != initial_state_count
+    ):
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = prev_state
+
+
+def _load_full_states(session, results):
+    """Replace the minimal rows left at the ends of results by full states."""
+    pending = {}
+    for ent_results in results:
+        if not ent_results:
+            continue
+        for idx in {0, len(ent_results) - 1}:
+            if not isinstance(ent_results[idx], (State, dict)):
+                pending[ent_results[idx].state_id] = (ent_results, idx)
+
+    state_ids = list(pending)
+    for chunk_start in range(0, len(state_ids), MAX_STATE_IDS_PER_QUERY):
+        query = (
+            _query_states(session)
+            .add_columns(States.state_id)
+            .filter(
+                States.state_id.in_(
+                    state_ids[chunk_start : chunk_start + MAX_STATE_IDS_PER_QUERY]
+                )
+            )
+        )
+        for row in execute(query, to_native=False):
+            ent_results, idx = pending[row.state_id]
+            ent_results[idx] = States.to_native(row)
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -471,21 +747,97 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
+        period = request.query.get("statistics")
+        if period is not None:
+            if period not in PERIODS:
+                return self.json_message("Invalid statistics period", HTTP_BAD_REQUEST)
+
+            result = await hass.async_add_executor_job(
+                statistics_during_period,
                 hass,
                 start_time,
                 end_time,
                 entity_ids,
-                include_start_time_state,
+                period,
+            )
+            return self.json(list(result.values()))
+
+        # Optionally order the result to respect the ordering given
+        # by any entities explicitly included in the configuration.
+        ordered_entity_ids = None
+        if self.use_include_order:
+            ordered_entity_ids = self.filters.included_entities
+
+        timer_start = time.perf_counter()
+
+        stream_entity_ids, start_states = await hass.async_add_executor_job(
+            self._significant_entity_ids,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            ordered_entity_ids,
+        )
+
+        batches = [
+            stream_entity_ids[idx : idx + STREAM_ENTITIES_PER_JOB]
+            for idx in range(0, len(stream_entity_ids), STREAM_ENTITIES_PER_JOB)
+        ]
+
+        async def async_fetch_batch(batch):
+            """Fetch the json of the entities of a batch in the executor."""
+            return await hass.async_add_executor_job(
+                self._entities_significant_states_json,
+                hass,
+                {ent_id: start_states.pop(ent_id, None) for ent_id in batch},
+                start_time,
+                end_time,
                 significant_changes_only,
                 minimal_response,
-            ),
-        )
+            )
+
+        # The first batch is fetched before the response is prepared, so a
+        # failing query still results in an error status.
+        ent_jsons = await async_fetch_batch(batches[0]) if batches else []
+
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        # Only the states of one batch of entities are loaded at a time, they
+        # are written before the states of the next batch are fetched.
+        separator = b"["
+        for batch in batches[1:] + [None]:
+            for ent_json in ent_jsons:
+                await response.write(separator + ent_json)
+                separator = b","
+
+            if batch is None:
+                break
+
+            try:
+                ent_jsons = await async_fetch_batch(batch)
+            except (SQLAlchemyError, ValueError):
+                _LOGGER.exception("Error streaming the history of %s", ", ".join(batch))
+                # The status was already sent, end with an error element
+                await response.write(separator + STREAM_ERROR)
+                separator = b","
+                break
+
+        await response.write(b"[]" if separator == b"[" else b"]")
+        await response.write_eof()
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug(
+                "Streamed %d entities in %fs", len(stream_entity_ids), elapsed
+            )
+
+        return response
 
-    def _sorted_significant_states_json(
+    def _significant_entity_ids(
         self,
         hass,
         start_time,
@@ -493,13 +845,11 @@ class HistoryPeriodView(HomeAssistantView):
         entity_ids,
         include_start_time_state,
         significant_changes_only,
-        minimal_response,
+        ordered_entity_ids,
     ):
-        """Fetch significant stats from the database as json."""
-        timer_start = time.perf_counter()
-
+        """Fetch the entities to stream and their start states."""
         with session_scope(hass=hass) as session:
-            result = _get_significant_states(
+            return _get_significant_entity_ids(
                 hass,
                 session,
                 start_time,
@@ -508,28 +858,46 @@ class HistoryPeriodView(HomeAssistantView):
                 self.filters,
                 include_start_time_state,
                 significant_changes_only,
-                minimal_response,
+                ordered_entity_ids,
             )
 
-        result = list(result.values())
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            elapsed = time.perf_counter() - timer_start
-            _LOGGER.debug("Extracted %d states in %fs", sum(map(len, result)), elapsed)
+    def _entities_significant_states_json(
+        self,
+        hass,
+        start_states,
+        start_time,
+        end_time,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Fetch the significant states of entities as json, per entity.
 
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
-        if self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
-
-        return self.json(result)
+        Takes the start state by entity_id of the entities to fetch.
+        """
+        ent_jsons = []
+        with session_scope(hass=hass) as session:
+            for entity_id, start_state in start_states.items():
+                ent_results = _get_entity_significant_states(
+                    session,
+                    entity_id,
+                    start_state,
+                    start_time,
+                    end_time,
+                    self.filters,
+                    significant_changes_only,
+                    minimal_response,
+                )
+                if ent_results:
+                    ent_jsons.append(
+                        json.dumps(
+                            ent_results,
+                            sort_keys=True,
+                            cls=JSONEncoder,
+                            allow_nan=False,
+                        ).encode("UTF-8")
+                    )
+
+        return ent_jsons
 
 
 class Filters:
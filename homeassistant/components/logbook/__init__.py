@@ -3,26 +3,28 @@ from datetime import timedelta
 from itertools import groupby
 import json
 import logging
-import time
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import false, or_
 from sqlalchemy.orm import aliased
 import voluptuous as vol
 
 from homeassistant.components import sun
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import Events, States, process_timestamp
-from homeassistant.components.recorder.util import (
-    QUERY_RETRY_WAIT,
-    RETRIES,
-    session_scope,
+from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES,
+    Events,
+    StateAttributes,
+    States,
+    process_timestamp,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     ATTR_DOMAIN,
     ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_HIDDEN,
     ATTR_NAME,
+    ATTR_UNIT_OF_MEASUREMENT,
     CONF_EXCLUDE,
     CONF_INCLUDE,
     EVENT_HOMEASSISTANT_START,
@@ -52,6 +54,8 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+HEADER_NEXT_AFTER = "X-Logbook-Next-After"
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -183,13 +187,34 @@ class LogbookView(HomeAssistantView):
             if end_day is None:
                 return self.json_message("Invalid end_time", HTTP_BAD_REQUEST)
 
+        limit = request.query.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+            if limit < 1:
+                return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+
+        after = request.query.get("after")
+        if after is not None:
+            try:
+                after = int(after)
+            except ValueError:
+                return self.json_message("Invalid after", HTTP_BAD_REQUEST)
+
         hass = request.app["hass"]
 
         def json_events():
             """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(hass, self.config, start_day, end_day, entity_id)
+            entries, next_after = _get_events_page(
+                hass, self.config, start_day, end_day, entity_id, limit, after
             )
+            headers = None
+            if next_after is not None:
+                # Pass as after to get the next page
+                headers = {HEADER_NEXT_AFTER: str(next_after)}
+            return self.json(entries, headers=headers)
 
         return await hass.async_add_job(json_events)
 
@@ -201,6 +226,12 @@ def humanify(hass, events, prev_states=None):
     - if 2+ sensor updates in GROUP_BY_MINUTES, show last
     - if Home Assistant stop and start happen in same minute call it restarted
     """
+    for _, entry in _humanify_events(hass, events, prev_states):
+        yield entry
+
+
+def _humanify_events(hass, events, prev_states=None):
+    """Generate the entries of events together with the event of each entry."""
     if prev_states is None:
         prev_states = {}
 
@@ -245,7 +276,7 @@ def humanify(hass, events, prev_states=None):
                 data["when"] = event.time_fired
                 data["domain"] = domain
                 data["context_user_id"] = event.context_user_id
-                yield data
+                yield event, data
 
             if event.event_type == EVENT_STATE_CHANGED:
                 entity_id = event.entity_id
@@ -270,7 +301,7 @@ def humanify(hass, events, prev_states=None):
                     hass, entity_id, event, ATTR_FRIENDLY_NAME
                 ) or split_entity_id(entity_id)[1].replace("_", " ")
 
-                yield {
+                yield event, {
                     "when": event.time_fired,
                     "name": name,
                     "message": _entry_message_from_event(
@@ -285,7 +316,7 @@ def humanify(hass, events, prev_states=None):
                 if start_stop_events.get(event.time_fired_minute) == 2:
                     continue
 
-                yield {
+                yield event, {
                     "when": event.time_fired,
                     "name": "Home Assistant",
                     "message": "started",
@@ -299,7 +330,7 @@ def humanify(hass, events, prev_states=None):
                 else:
                     action = "stopped"
 
-                yield {
+                yield event, {
                     "when": event.time_fired,
                     "name": "Home Assistant",
                     "message": action,
@@ -317,7 +348,7 @@ def humanify(hass, events, prev_states=None):
                     except IndexError:
                         pass
 
-                yield {
+                yield event, {
                     "when": event.time_fired,
                     "name": event_data.get(ATTR_NAME),
                     "message": event_data.get(ATTR_MESSAGE),
@@ -326,33 +357,8 @@ def humanify(hass, events, prev_states=None):
                 }
 
 
-def _get_related_entity_ids(session, entity_filter):
-    timer_start = time.perf_counter()
-
-    query = session.query(States).with_entities(States.entity_id).distinct()
-
-    for tryno in range(RETRIES):
-        try:
-            result = [row.entity_id for row in query if entity_filter(row.entity_id)]
-
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                elapsed = time.perf_counter() - timer_start
-                _LOGGER.debug(
-                    "fetching %d distinct domain/entity_id pairs took %fs",
-                    len(result),
-                    elapsed,
-                )
-
-            return result
-        except SQLAlchemyError as err:
-            _LOGGER.error("Error executing query: %s", err)
-
-            if tryno == RETRIES - 1:
-                raise
-            time.sleep(QUERY_RETRY_WAIT)
-
-
-def _generate_filter_from_config(config):
+def _get_filter_lists(config):
+    """Return the included and excluded domains and entities of the config."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -367,13 +373,76 @@ def _generate_filter_from_config(config):
         included_entities = include.get(CONF_ENTITIES, [])
         included_domains = include.get(CONF_DOMAINS, [])
 
-    return generate_filter(
-        included_domains, included_entities, excluded_domains, excluded_entities
-    )
+    return included_domains, included_entities, excluded_domains, excluded_entities
+
+
+def _generate_filter_from_config(config):
+    return generate_filter(*_get_filter_lists(config))
+
+
+def _in(column, values):
+    """Return a condition matching the rows where column is in values."""
+    if not values:
+        return false()
+    return column.in_(values)
+
+
+def _generate_filter_sql_from_config(config):
+    """Return the SQL condition on states matching the configured filter.
+
+    Follows the same rules as generate_filter, returns None if every
+    entity passes.
+    """
+    (
+        include_domains,
+        include_entities,
+        exclude_domains,
+        exclude_entities,
+    ) = _get_filter_lists(config)
+    have_exclude = bool(exclude_entities or exclude_domains)
+    have_include = bool(include_entities or include_domains)
+
+    if not have_include and not have_exclude:
+        return None
+
+    domain_included = _in(States.domain, include_domains)
+    entity_included = _in(States.entity_id, include_entities)
+    domain_excluded = _in(States.domain, exclude_domains)
+    entity_excluded = _in(States.entity_id, exclude_entities)
+
+    if have_include and not have_exclude:
+        return entity_included | domain_included
+
+    if not have_include and have_exclude:
+        return ~entity_excluded & ~domain_excluded
+
+    if include_domains:
+        return (domain_included & ~entity_excluded) | (
+            ~domain_included & entity_included
+        )
+
+    if exclude_domains:
+        return (domain_excluded & entity_included) | (
+            ~domain_excluded & ~entity_excluded
+        )
+
+    return entity_included
 
 
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
+    return _get_events_page(hass, config, start_day, end_day, entity_id)[0]
+
+
+def _get_events_page(
+    hass, config, start_day, end_day, entity_id=None, limit=None, after=None
+):
+    """Get a page of the events for a period of time.
+
+    Pages hold at most limit entries following the event with event_id
+    after. Returns the entries and the event_id to request the next page
+    after, or None if this is the last page.
+    """
     entities_filter = _generate_filter_from_config(config)
 
     def yield_events(query):
@@ -384,17 +453,11 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
                 yield event
 
     with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
-        elif config.get(CONF_EXCLUDE) or config.get(CONF_INCLUDE):
-            entity_ids = _get_related_entity_ids(session, entities_filter)
-        else:
-            entity_ids = None
-
         old_state = aliased(States, name="old_state")
 
         query = (
             session.query(
+                Events.event_id,
                 Events.event_type,
                 Events.event_data,
                 Events.time_fired,
@@ -403,34 +466,116 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
                 States.state,
                 States.entity_id,
                 States.domain,
-                States.attributes,
+                STATE_ATTRIBUTES,
                 old_state.state_id.label("old_state_id"),
             )
-            .order_by(Events.time_fired)
+            .order_by(Events.time_fired, Events.event_id)
             .outerjoin(States, (Events.event_id == States.event_id))
             .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
             .filter(
                 Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
             )
             .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
         )
 
-        if entity_ids:
-            query = query.filter(
-                (
-                    (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
-                )
-                | (States.state_id.is_(None))
-            )
+        # Only state changes are filtered in the database, other events
+        # are filtered on the data they describe by _keep_event.
+        state_filter = States.last_updated == States.last_changed
+        if entity_id is not None:
+            state_filter &= States.entity_id == entity_id.lower()
         else:
-            query = query.filter(
-                (States.last_updated == States.last_changed)
-                | (States.state_id.is_(None))
+            entities_filter_sql = _generate_filter_sql_from_config(config)
+            if entities_filter_sql is not None:
+                state_filter &= entities_filter_sql
+
+        hidden_or_continuous = _hidden_or_continuous_filter_sql(
+            hass, session, start_day, end_day
+        )
+        if hidden_or_continuous is not None:
+            state_filter &= ~hidden_or_continuous
+
+        query = query.filter(state_filter | (States.state_id.is_(None)))
+
+        if after is not None:
+            after_time_fired = (
+                session.query(Events.time_fired)
+                .filter(Events.event_id == after)
+                .scalar()
             )
+            if after_time_fired is None:
+                query = query.filter(Events.event_id > after)
+            else:
+                query = query.filter(
+                    (Events.time_fired > after_time_fired)
+                    | (
+                        (Events.time_fired == after_time_fired)
+                        & (Events.event_id > after)
+                    )
+                )
 
-        prev_states = {}
-        return list(humanify(hass, yield_events(query), prev_states))
+        # Rows are read until an entry past the limit shows there is a next
+        # page. humanify groups whole batches of rows, so entries are grouped
+        # the same as without a limit.
+        entries = []
+        last_event_id = next_after = None
+        for event, entry in _humanify_events(hass, yield_events(query)):
+            if limit is not None and len(entries) == limit:
+                next_after = last_event_id
+                break
+            entries.append(entry)
+            last_event_id = event.event_id
+
+    return entries, next_after
+
+
+def _hidden_or_continuous_filter_sql(hass, session, start_day, end_day):
+    """Return the SQL condition on states of hidden and continuous entities.
+
+    Only the few shared attributes of the period that mention hidden are
+    decoded, to match hidden states exactly. Continuous sensors are matched
+    by the unit of their current state, like humanify does. Other states
+    are still checked on their decoded attributes by _keep_event and
+    humanify. Returns None if no state matches.
+    """
+    hidden_attributes_ids = [
+        attributes_id
+        for attributes_id, shared_attrs in (
+            session.query(StateAttributes.attributes_id, StateAttributes.shared_attrs)
+            .filter(StateAttributes.shared_attrs.like(f'%"{ATTR_HIDDEN}":%'))
+            .filter(
+                StateAttributes.attributes_id.in_(
+                    session.query(States.attributes_id).filter(
+                        (States.last_updated > start_day)
+                        & (States.last_updated < end_day)
+                    )
+                )
+            )
+        )
+        if json.loads(shared_attrs).get(ATTR_HIDDEN)
+    ]
+    continuous_entity_ids = [
+        state.entity_id
+        for state in hass.states.all()
+        if state.domain in CONTINUOUS_DOMAINS
+        and state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    ]
+
+    conditions = []
+    if hidden_attributes_ids:
+        conditions.append(
+            States.attributes_id.isnot(None)
+            & States.attributes_id.in_(hidden_attributes_ids)
+        )
+    if continuous_entity_ids:
+        conditions.append(States.entity_id.in_(continuous_entity_ids))
+
+    if not conditions:
+        return None
+    return or_(*conditions)
 
 
 def _get_attribute(hass, entity_id, event, attribute):
@@ -574,6 +719,7 @@ class LazyEventPartialState:
         "_event_data",
         "_time_fired",
         "_attributes",
+        "event_id",
         "event_type",
         "entity_id",
         "state",
@@ -586,6 +732,7 @@ class LazyEventPartialState:
         self._event_data = None
         self._time_fired = None
         self._attributes = None
+        self.event_id = self._row.event_id
         self.event_type = self._row.event_type
         self.entity_id = self._row.entity_id
         self.state = self._row.state
@@ -2,14 +2,12 @@
 import asyncio
 from functools import partial, wraps
 import inspect
-from itertools import groupby
 import json
 import logging
-from operator import attrgetter
 import os
 import ssl
 import sys
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import attr
 import requests.certs
@@ -59,6 +57,7 @@ from .debug_info import log_messages
 from .discovery import MQTT_DISCOVERY_UPDATED, clear_discovery_hash, set_discovery_hash
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .subscription import async_subscribe_topics, async_unsubscribe_topics
+from .topic_trie import TopicTrie
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -120,6 +119,10 @@ ATTR_RETAIN = CONF_RETAIN
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Subscription changes are collected this long and sent in a single packet
+SUBSCRIBE_COOLDOWN = 0.1  # seconds
+MAX_TOPICS_PER_PACKET = 500
+
 CONNECTION_SUCCESS = "connection_success"
 CONNECTION_FAILED = "connection_failed"
 CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
@@ -407,10 +410,14 @@ async def async_subscribe(
     msg_callback: MessageCallbackType,
     qos: int = DEFAULT_QOS,
     encoding: Optional[str] = "utf-8",
+    *,
+    wait: bool = True,
 ):
     """Subscribe to an MQTT topic.
 
-    Call the return value to unsubscribe.
+    Call the return value to unsubscribe. Returns once the broker was
+    subscribed to and raises HomeAssistantError if that failed. Pass
+    wait=False to only queue the subscription.
     """
     # Count callback parameters which don't have a default value
     non_default = 0
@@ -441,6 +448,7 @@ async def async_subscribe(
         ),
         qos,
         encoding,
+        wait=wait,
     )
     return async_remove
 
@@ -753,6 +761,13 @@ class MQTT:
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        self._subscription_trie = TopicTrie()
+        # Subscriptions to send by topic with the highest requested qos
+        self._pending_subscriptions: Dict[str, int] = {}
+        self._pending_unsubscribes: Set[str] = set()
+        self._pending_flush: Optional[asyncio.Future] = None
+        # Topics a SUBSCRIBE packet was sent for
+        self._subscribed_topics: Set[str] = set()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
@@ -840,9 +855,16 @@ class MQTT:
         msg_callback: MessageCallbackType,
         qos: int,
         encoding: Optional[str] = None,
+        *,
+        wait: bool = True,
     ) -> Callable[[], None]:
         """Set up a subscription to a topic with the provided qos.
 
+        The topic is subscribed to with the next batch of subscription
+        changes, which is shared by all concurrent calls. Wait until that
+        batch was sent and raise if the broker could not be subscribed to,
+        unless wait is False.
+
         This method is a coroutine.
         """
         if not isinstance(topic, str):
@@ -850,10 +872,15 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_trie.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
-            await self._async_perform_subscription(topic, qos)
+            flushed = self._async_queue_subscriptions([(topic, qos)])
+            if wait:
+                error = (await asyncio.shield(flushed)).get(topic)
+                if error is not None:
+                    raise error
 
         @callback
         def async_remove() -> None:
@@ -861,6 +888,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_trie.remove(topic, subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -868,31 +896,127 @@ class MQTT:
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscriptions(
+        self, subscriptions: List[Tuple[str, int]]
+    ) -> asyncio.Future:
+        """Queue topics to subscribe to with the next packet."""
+        for topic, qos in subscriptions:
+            self._pending_unsubscribes.discard(topic)
+            self._pending_subscriptions[topic] = max(
+                qos, self._pending_subscriptions.get(topic, 0)
+            )
+        return self._async_schedule_flush()
+
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> None:
+        """Queue a topic to unsubscribe from with the next packet."""
+        if (
+            self._pending_subscriptions.pop(topic, None) is None
+            or topic in self._subscribed_topics
+        ):
+            self._pending_unsubscribes.add(topic)
+        self._async_schedule_flush()
+
+    @callback
+    def _async_schedule_flush(self) -> asyncio.Future:
+        """Send the queued subscription changes after the cooldown.
+
+        Return a future resolving to the errors of the topics that could not
+        be subscribed to, once the changes were sent.
+        """
+        if self._pending_flush is None:
+            self._pending_flush = self.hass.loop.create_future()
+            self.hass.async_create_task(
+                self._async_flush_subscriptions(self._pending_flush)
+            )
+        return self._pending_flush
+
+    async def _async_flush_subscriptions(self, flushed: asyncio.Future) -> None:
+        """Send the queued subscription changes.
+
+        Changes queued within the cooldown are sent in as few SUBSCRIBE and
+        UNSUBSCRIBE packets as possible instead of one packet per topic. A
+        packet that fails is logged and the remaining packets are still sent.
 
         This method is a coroutine.
         """
-        _LOGGER.debug("Unsubscribing from %s", topic)
+        errors: Dict[str, HomeAssistantError] = {}
+
+        try:
+            await asyncio.sleep(SUBSCRIBE_COOLDOWN)
+        except asyncio.CancelledError:
+            self._pending_flush = None
+            flushed.cancel()
+            raise
+
+        self._pending_flush = None
+        subscriptions = list(self._pending_subscriptions.items())
+        unsubscribes = sorted(self._pending_unsubscribes)
+        self._pending_subscriptions = {}
+        self._pending_unsubscribes = set()
+
+        try:
+            # Everything is subscribed to again when reconnected.
+            if not self.connected:
+                return
+
+            for idx in range(0, len(unsubscribes), MAX_TOPICS_PER_PACKET):
+                topics = unsubscribes[idx : idx + MAX_TOPICS_PER_PACKET]
+                try:
+                    await self._async_unsubscribe(topics)
+                except HomeAssistantError as err:
+                    _LOGGER.error(
+                        "Failed to unsubscribe from %s: %s", ", ".join(topics), err
+                    )
+                else:
+                    self._subscribed_topics.difference_update(topics)
+
+            for idx in range(0, len(subscriptions), MAX_TOPICS_PER_PACKET):
+                batch = subscriptions[idx : idx + MAX_TOPICS_PER_PACKET]
+                topics = [topic for topic, _ in batch]
+                try:
+                    await self._async_perform_subscription(batch)
+                except HomeAssistantError as err:
+                    _LOGGER.error(
+                        "Failed to subscribe to %s: %s", ", ".join(topics), err
+                    )
+                    errors.update((topic, err) for topic in topics)
+                else:
+                    self._subscribed_topics.update(topics)
+        finally:
+            if not flushed.done():
+                flushed.set_result(errors)
+
+    async def _async_unsubscribe(self, topics: List[str]) -> None:
+        """Unsubscribe from topics.
+
+        This method is a coroutine.
+        """
+        _LOGGER.debug("Unsubscribing from %s", ", ".join(topics))
         async with self._paho_lock:
             result: int = None
             result, _ = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
+                self._mqttc.unsubscribe, topics
             )
             _raise_on_error(result)
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
-        _LOGGER.debug("Subscribing to %s", topic)
+    async def _async_perform_subscription(
+        self, subscriptions: List[Tuple[str, int]]
+    ) -> None:
+        """Perform a paho-mqtt subscription to topics."""
+        _LOGGER.debug(
+            "Subscribing to %s", ", ".join(topic for topic, _ in subscriptions)
+        )
 
         async with self._paho_lock:
             result: int = None
             result, _ = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
+                self._mqttc.subscribe, subscriptions
             )
             _raise_on_error(result)
 
@@ -916,12 +1040,15 @@ class MQTT:
         dispatcher_send(self.hass, MQTT_CONNECTED)
         _LOGGER.info("Connected to MQTT server (%s)", result_code)
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        # Queue all subscriptions, the topics are re-subscribed to with the
+        # highest requested qos in as few packets as possible.
+        self.hass.add_job(
+            self._async_queue_subscriptions,
+            [
+                (subscription.topic, subscription.qos)
+                for subscription in self.subscriptions
+            ],
+        )
 
         if self.birth_message:
             self.hass.add_job(
@@ -947,16 +1074,22 @@ class MQTT:
             msg.payload,
         )
         timestamp = dt_util.utcnow()
+        # Payloads decoded so far, None if the encoding failed
+        decoded: Dict[str, Optional[str]] = {}
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
+        for subscription in self._subscription_trie.match(msg.topic):
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
+                if subscription.encoding not in decoded:
+                    try:
+                        decoded[subscription.encoding] = msg.payload.decode(
+                            subscription.encoding
+                        )
+                    except (AttributeError, UnicodeDecodeError):
+                        decoded[subscription.encoding] = None
+
+                payload = decoded[subscription.encoding]
+                if payload is None:
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
                         msg.payload,
@@ -996,20 +1129,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1,4 +1,5 @@
 """Support for tracking MQTT enabled devices."""
+import asyncio
 import logging
 
 import voluptuous as vol
@@ -35,6 +36,7 @@ async def async_setup_scanner(hass, config, async_see, discovery_info=None):
     payload_not_home = config[CONF_PAYLOAD_NOT_HOME]
     source_type = config.get(CONF_SOURCE_TYPE)
 
+    subscriptions = []
     for dev_id, topic in devices.items():
 
         @callback
@@ -53,6 +55,11 @@ async def async_setup_scanner(hass, config, async_see, discovery_info=None):
 
             hass.async_create_task(async_see(**see_args))
 
-        await mqtt.async_subscribe(hass, topic, async_message_received, qos)
+        subscriptions.append(
+            mqtt.async_subscribe(hass, topic, async_message_received, qos)
+        )
+
+    # Subscribe concurrently, so all topics are sent in one packet
+    await asyncio.gather(*subscriptions)
 
     return True
@@ -1,4 +1,5 @@
 """Helper to handle a set of topics to subscribe to."""
+import asyncio
 import logging
 from typing import Any, Callable, Dict, Optional
 
@@ -78,6 +79,7 @@ async def async_subscribe_topics(
     """
     current_subscriptions = new_state if new_state is not None else {}
     new_state = {}
+    resubscribes = []
     for key, value in topics.items():
         # Extract the new requested subscription
         requested = EntitySubscription(
@@ -90,9 +92,12 @@ async def async_subscribe_topics(
         )
         # Get the current subscription state
         current = current_subscriptions.pop(key, None)
-        await requested.resubscribe_if_necessary(hass, current)
+        resubscribes.append(requested.resubscribe_if_necessary(hass, current))
         new_state[key] = requested
 
+    # Subscribe concurrently, so all topics are sent in one packet
+    await asyncio.gather(*resubscribes)
+
     # Go through all remaining subscriptions and unsubscribe them
     for remaining in current_subscriptions.values():
         if remaining.unsubscribe_callback is not None:
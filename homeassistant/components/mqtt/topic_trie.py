@@ -0,0 +1,97 @@
+"""Index of MQTT subscriptions by topic filter."""
+from itertools import count
+from typing import Any, Dict, List, Tuple
+
+
+class _Node:
+    """Level of a topic filter in the trie."""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: List[Tuple[int, Any]] = []
+
+
+class TopicTrie:
+    """Trie of items keyed by MQTT topic filters.
+
+    Every level of a topic filter is a node, so the items whose filter
+    matches a topic are found with a single walk of the trie instead of
+    matching every filter. Wildcards follow the MQTT specification: `+`
+    matches one level, `#` matches the parent level and every level below
+    it, and neither matches a first level starting with `$`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _Node()
+        self._sequence = count()
+
+    def add(self, topic: str, item: Any) -> None:
+        """Add an item for a topic filter."""
+        node = self._root
+        for level in topic.split("/"):
+            node = node.children.setdefault(level, _Node())
+        node.entries.append((next(self._sequence), item))
+
+    def remove(self, topic: str, item: Any) -> None:
+        """Remove an item from a topic filter, pruning emptied levels."""
+        path = []
+        node = self._root
+        for level in topic.split("/"):
+            path.append((node, level))
+            node = node.children.get(level)
+            if node is None:
+                raise KeyError(topic)
+
+        for idx, (_, entry) in enumerate(node.entries):
+            if entry is item:
+                del node.entries[idx]
+                break
+        else:
+            raise KeyError(topic)
+
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.entries or child.children:
+                break
+            del parent.children[level]
+
+    def match(self, topic: str) -> List[Any]:
+        """Return the items whose topic filter matches a topic.
+
+        Items are returned in the order they were added.
+        """
+        levels = topic.split("/")
+        last = len(levels)
+        wildcards = not topic.startswith("$")
+        matches: List[Tuple[int, Any]] = []
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, idx = stack.pop()
+            children = node.children
+
+            if idx == last:
+                matches.extend(node.entries)
+            else:
+                child = children.get(levels[idx])
+                if child is not None:
+                    stack.append((child, idx + 1))
+                if (wildcards or idx) and "+" in children:
+                    stack.append((children["+"], idx + 1))
+
+            if (wildcards or idx) and "#" in children:
+                matches.extend(children["#"].entries)
+
+        if len(matches) > 1:
+            matches.sort(key=_entry_sequence)
+
+        return [item for _, item in matches]
+
+
+def _entry_sequence(entry: Tuple[int, Any]) -> int:
+    """Return the sequence number of an entry."""
+    return entry[0]
@@ -1,4 +1,5 @@
 """Support for GPS tracking MQTT enabled devices."""
+import asyncio
 import json
 import logging
 
@@ -39,6 +40,7 @@ async def async_setup_scanner(hass, config, async_see, discovery_info=None):
     devices = config[CONF_DEVICES]
     qos = config[CONF_QOS]
 
+    subscriptions = []
     for dev_id, topic in devices.items():
 
         @callback
@@ -60,7 +62,12 @@ async def async_setup_scanner(hass, config, async_see, discovery_info=None):
             kwargs = _parse_see_args(dev_id, data)
             hass.async_create_task(async_see(**kwargs))
 
-        await mqtt.async_subscribe(hass, topic, async_message_received, qos)
+        subscriptions.append(
+            mqtt.async_subscribe(hass, topic, async_message_received, qos)
+        )
+
+    # Subscribe concurrently, so all topics are sent in one packet
+    await asyncio.gather(*subscriptions)
 
     return True
 
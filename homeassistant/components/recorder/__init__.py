@@ -1,10 +1,9 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
-import queue
 import threading
 import time
 from typing import Any, Dict, Optional
@@ -34,8 +33,10 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
 from . import migration, purge
-from .const import DATA_INSTANCE
-from .models import Base, Events, RecorderRuns, States
+from .const import DATA_INSTANCE, QUEUE_POLICIES, QUEUE_POLICY_COALESCE
+from .event_queue import EventQueue
+from .models import Base, Events, RecorderRuns, StateAttributes, States
+from .statistics import StatisticsCompiler
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,6 +59,10 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
+# Queue events without a limit unless configured, so no history is lost
+DEFAULT_MAX_QUEUE_SIZE = 0
+# Number of shared attributes ids remembered by the recorder thread
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 KEEPALIVE_TIME = 30
 
 CONF_AUTO_PURGE = "auto_purge"
@@ -68,6 +73,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_QUEUE_POLICY = "queue_policy"
 
 FILTER_SCHEMA = vol.Schema(
     {
@@ -110,6 +117,12 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MAX_QUEUE_SIZE, default=DEFAULT_MAX_QUEUE_SIZE
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_QUEUE_POLICY, default=QUEUE_POLICY_COALESCE
+                    ): vol.In(QUEUE_POLICIES),
                 }
             ),
         )
@@ -183,6 +196,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         include=include,
         exclude=exclude,
+        max_queue_size=conf[CONF_MAX_QUEUE_SIZE],
+        queue_policy=conf[CONF_QUEUE_POLICY],
     )
     instance.async_initialize()
     instance.start()
@@ -215,6 +230,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         include: Dict,
         exclude: Dict,
+        max_queue_size: int = 0,
+        queue_policy: str = QUEUE_POLICY_COALESCE,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -223,7 +240,7 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
-        self.queue: Any = queue.Queue()
+        self.queue: Any = EventQueue(max_queue_size, queue_policy)
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -242,8 +259,14 @@ class Recorder(threading.Thread):
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
-        self._old_state_ids = {}
+        self._old_states = {}
+        self._statistics = StatisticsCompiler()
+        # Ids of recently written attributes by their JSON, least recent first
+        self._state_attributes_ids: OrderedDict = OrderedDict()
+        # Attributes added to the session but not yet committed
+        self._pending_state_attributes: Dict[str, StateAttributes] = {}
         self.event_session = None
+        self.last_commit_duration: Optional[float] = None
         self.get_session = None
         self._completed_database_setup = False
 
@@ -346,7 +369,7 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
-        self.event_session = self.get_session()
+        self._open_event_session()
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed.  This reduces the disk io.
@@ -358,7 +381,11 @@ class Recorder(threading.Thread):
                 self.queue.task_done()
                 return
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+                # Pending states may reference attributes the purge removes
+                self._commit_event_session_or_retry()
+                if not purge.purge_old_data(self, event.keep_days, event.repack):
+                    # Record the events queued meanwhile before the next batch
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
             if event.event_type == EVENT_TIME_CHANGED:
@@ -384,28 +411,39 @@ class Recorder(threading.Thread):
                     continue
 
             try:
-                dbevent = Events.from_event(event)
                 if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent.event_data = "{}"
+                    # The state is stored in the states table
+                    dbevent = Events.from_event(event, event_data="{}")
+                else:
+                    dbevent = Events.from_event(event)
                 self.event_session.add(dbevent)
-                self.event_session.flush()
             except (TypeError, ValueError):
+                dbevent = None
                 _LOGGER.warning("Event is not JSON serializable: %s", event)
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
+                dbevent = None
                 _LOGGER.exception("Error adding event: %s", err)
 
             if dbevent and event.event_type == EVENT_STATE_CHANGED:
                 try:
                     dbstate = States.from_event(event)
-                    dbstate.old_state_id = self._old_state_ids.get(dbstate.entity_id)
-                    dbstate.event_id = dbevent.event_id
+                    old_state = self._old_states.get(dbstate.entity_id)
+                    if old_state is not None and old_state.state_id is None:
+                        # Written in the same batch, let the session link it
+                        dbstate.old_state = old_state
+                    elif old_state is not None:
+                        dbstate.old_state_id = old_state.state_id
+                    dbstate.event = dbevent
+                    self._set_state_attributes(dbstate)
                     self.event_session.add(dbstate)
-                    self.event_session.flush()
+                    new_state = event.data.get("new_state")
+                    if new_state is not None:
+                        self._statistics.add_state(self.event_session, new_state)
                     if "new_state" in event.data:
-                        self._old_state_ids[dbstate.entity_id] = dbstate.state_id
-                    elif dbstate.entity_id in self._old_state_ids:
-                        del self._old_state_ids[dbstate.entity_id]
+                        self._old_states[dbstate.entity_id] = dbstate
+                    elif dbstate.entity_id in self._old_states:
+                        del self._old_states[dbstate.entity_id]
                 except (TypeError, ValueError):
                     _LOGGER.warning(
                         "State is not JSON serializable: %s",
@@ -415,13 +453,57 @@ class Recorder(threading.Thread):
                     # Must catch the exception to prevent the loop from collapsing
                     _LOGGER.exception("Error adding state change: %s", err)
 
-            # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
+            # If they do not have a commit interval we commit as soon as
+            # the queue is drained, so a backlog is written in one batch.
+            if not self.commit_interval and self.queue.empty():
                 self._commit_event_session_or_retry()
 
             self.queue.task_done()
 
+    def _set_state_attributes(self, dbstate):
+        """Move the attributes of a state to a shared attributes row."""
+        shared_attrs = dbstate.attributes
+        dbstate.attributes = None
+
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._state_attributes_ids.move_to_end(shared_attrs)
+            dbstate.attributes_id = attributes_id
+            return
+
+        pending = self._pending_state_attributes.get(shared_attrs)
+        if pending is not None:
+            dbstate.state_attributes = pending
+            return
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        with self.event_session.no_autoflush:
+            attributes_id = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .scalar()
+            )
+        if attributes_id is not None:
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            dbstate.attributes_id = attributes_id
+            return
+
+        pending = StateAttributes(hash=attr_hash, shared_attrs=shared_attrs)
+        self._pending_state_attributes[shared_attrs] = pending
+        dbstate.state_attributes = pending
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of shared attributes."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes_ids.move_to_end(shared_attrs)
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
+    def clear_state_attributes_cache(self):
+        """Forget the ids of shared attributes, they may have been purged."""
+        self._state_attributes_ids.clear()
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -485,23 +567,49 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while closing event session: %s", err)
 
         try:
-            self.event_session = self.get_session()
+            self._open_event_session()
         except Exception as err:  # pylint: disable=broad-except
             # Must catch the exception to prevent the loop from collapsing
             _LOGGER.exception("Error while creating new event session: %s", err)
 
+    def _open_event_session(self):
+        """Open the session used to write events.
+
+        Rows are only flushed when the session is committed, so all events
+        received since the last commit are written in a single unit of work.
+        The states are kept after the commit to link the next state of the
+        same entity to them without reloading them.
+        """
+        self.event_session = self.get_session()
+        self.event_session.expire_on_commit = False
+        self._statistics.reset()
+
     def _commit_event_session(self):
+        start = time.perf_counter()
         try:
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self._pending_state_attributes = {}
+            self._statistics.reset()
+            # States of the failed batch were never written
+            self._old_states = {
+                entity_id: dbstate
+                for entity_id, dbstate in self._old_states.items()
+                if dbstate.state_id is not None
+            }
             raise
+        self.last_commit_duration = time.perf_counter() - start
+
+        for shared_attrs, dbattrs in self._pending_state_attributes.items():
+            self._cache_state_attributes_id(shared_attrs, dbattrs.attributes_id)
+        self._pending_state_attributes = {}
 
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        self.queue.put_event(event)
 
     def block_till_done(self):
         """Block till all events processed."""
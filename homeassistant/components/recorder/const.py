@@ -1,3 +1,7 @@
 """Recorder constants."""
 
 DATA_INSTANCE = "recorder_instance"
+
+QUEUE_POLICY_DROP_OLDEST = "drop_oldest"
+QUEUE_POLICY_COALESCE = "coalesce"
+QUEUE_POLICIES = [QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_COALESCE]
@@ -0,0 +1,120 @@
+"""Bounded queue of events waiting to be written by the recorder."""
+import logging
+import queue
+from typing import Any, Dict, List
+
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+from .const import QUEUE_POLICY_COALESCE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventQueue(queue.Queue):
+    """Queue of events for the recorder thread.
+
+    Only events put with put_event are limited by max_events, which is
+    unlimited if 0. Other tasks like purges or the shutdown marker do not count
+    towards max_events and are always accepted and never dropped. Events are
+    put from the event loop, so putting never blocks. When max_events events
+    are queued new events are handled according to the policy:
+
+    - drop_oldest: drop the oldest queued event.
+    - coalesce: replace the queued state change of the same entity, or drop
+      the oldest queued event if there is none.
+    """
+
+    def __init__(self, max_events: int = 0, policy: str = QUEUE_POLICY_COALESCE):
+        """Initialize the queue."""
+        super().__init__()
+        self.max_events = max_events
+        self.policy = policy
+        self.dropped = 0
+        # Events and holders of coalesced state changes in the queue
+        self.queued_events = 0
+        # Holders of queued state changes by entity_id, used to coalesce
+        self._pending_states: Dict[str, List[Event]] = {}
+
+    def put_event(self, event: Event) -> None:
+        """Put an event in the queue, respecting max_events."""
+        with self.not_full:
+            if (
+                self.max_events
+                and self.queued_events >= self.max_events
+                and self._coalesce_or_drop_oldest(event)
+            ):
+                return
+
+            if self.policy == QUEUE_POLICY_COALESCE and (
+                event.event_type == EVENT_STATE_CHANGED
+            ):
+                holder = [event]
+                self._pending_states[event.data.get(ATTR_ENTITY_ID)] = holder
+                self._put(holder)
+            else:
+                self._put(event)
+
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _coalesce_or_drop_oldest(self, event: Event) -> bool:
+        """Make room for an event in a full queue.
+
+        Returns True if the event was merged into a queued state change.
+        """
+        if self.dropped == 0:
+            _LOGGER.warning(
+                "The recorder queue reached the maximum of %d events, "
+                "events will be %s",
+                self.max_events,
+                "coalesced" if self.policy == QUEUE_POLICY_COALESCE else "dropped",
+            )
+
+        self.dropped += 1
+
+        if self.policy == QUEUE_POLICY_COALESCE and (
+            event.event_type == EVENT_STATE_CHANGED
+        ):
+            holder = self._pending_states.get(event.data.get(ATTR_ENTITY_ID))
+            if holder is not None:
+                holder[0] = event
+                return True
+
+        for idx, item in enumerate(self.queue):
+            if isinstance(item, (Event, list)):
+                del self.queue[idx]
+                self.queued_events -= 1
+                self._forget_holder(item)
+                self.unfinished_tasks -= 1
+                break
+
+        return False
+
+    def _forget_holder(self, item: Any) -> None:
+        """Stop coalescing into a holder that left the queue."""
+        if not isinstance(item, list):
+            return
+
+        entity_id = item[0].data.get(ATTR_ENTITY_ID)
+        if self._pending_states.get(entity_id) is item:
+            del self._pending_states[entity_id]
+
+    def _put(self, item: Any) -> None:
+        """Put an item in the queue, counting events."""
+        if isinstance(item, (Event, list)):
+            self.queued_events += 1
+        self.queue.append(item)
+
+    def _get(self) -> Any:
+        """Get the next item, unwrapping coalesced state changes."""
+        item = self.queue.popleft()
+
+        if isinstance(item, (Event, list)):
+            self.queued_events -= 1
+
+        if isinstance(item, list):
+            self._forget_holder(item)
+            return item[0]
+
+        return item
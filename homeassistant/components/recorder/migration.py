@@ -5,6 +5,7 @@ import os
 from sqlalchemy import Table, text
 from sqlalchemy.engine import reflection
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.schema import CreateTable
 
 from .models import SCHEMA_VERSION, Base, SchemaChanges
 from .util import session_scope
@@ -57,6 +58,20 @@ def migrate_schema(instance):
             os.remove(instance.hass.config.path(PROGRESS_FILE))
 
 
+def _create_table(engine, table_name):
+    """Create a table described in the models, without its indexes.
+
+    The indexes are added with _create_index. Tables that exist already,
+    like the ones created with the missing tables, are left untouched.
+    """
+    if table_name in reflection.Inspector.from_engine(engine).get_table_names():
+        _LOGGER.debug("Table %s already exists", table_name)
+        return
+
+    _LOGGER.info("Creating table `%s`", table_name)
+    engine.execute(CreateTable(Base.metadata.tables[table_name]))
+
+
 def _create_index(engine, table_name, index_name):
     """Create an index for the specified table.
 
@@ -254,6 +269,14 @@ def _apply_update(engine, new_version, old_version):
         _add_columns(engine, "states", ["old_state_id INTEGER"])
         _create_index(engine, "states", "ix_states_context_parent_id")
         _create_index(engine, "events", "ix_events_context_parent_id")
+    elif new_version == 9:
+        _create_table(engine, "state_attributes")
+        _create_index(engine, "state_attributes", "ix_state_attributes_hash")
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 10:
+        _create_table(engine, "statistics")
+        _create_index(engine, "statistics", "ix_statistics_entity_id_period_start")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,19 +1,24 @@
 """Models for SQLAlchemy."""
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
     distinct,
+    func,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
@@ -24,7 +29,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 8
+SCHEMA_VERSION = 10
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,11 +51,11 @@ class Events(Base):  # type: ignore
     context_parent_id = Column(String(36), index=True)
 
     @staticmethod
-    def from_event(event):
+    def from_event(event, event_data=None):
         """Create an event database object from a native event."""
         return Events(
             event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
+            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
             origin=str(event.origin),
             time_fired=event.time_fired,
             context_id=event.context.id,
@@ -85,6 +90,9 @@ class States(Base):  # type: ignore
     state = Column(String(255))
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
@@ -92,6 +100,14 @@ class States(Base):  # type: ignore
     context_user_id = Column(String(36), index=True)
     context_parent_id = Column(String(36), index=True)
     old_state_id = Column(Integer)
+    event = relationship("Events", uselist=False)
+    state_attributes = relationship("StateAttributes", lazy="joined")
+    old_state = relationship(
+        "States",
+        primaryjoin="foreign(States.old_state_id) == States.state_id",
+        remote_side=[state_id],
+        uselist=False,
+    )
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -129,13 +145,20 @@ class States(Base):  # type: ignore
         return dbstate
 
     def to_native(self):
-        """Convert to an HA state object."""
+        """Convert to an HA state object.
+
+        Also works on rows that select the STATE_ATTRIBUTES column instead of
+        States objects, those rows always have the attributes filled in.
+        """
         context = Context(id=self.context_id, user_id=self.context_user_id)
+        attributes = self.attributes
+        if attributes is None:
+            attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 context=context,
@@ -149,6 +172,60 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """Attributes shared by states, stored once."""
+
+    __tablename__ = "state_attributes"
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up shared attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+
+# Attributes of a state for queries that select columns instead of States
+# objects. Needs an outer join of StateAttributes on States.attributes_id,
+# states recorded before the attributes were shared keep them in States.
+STATE_ATTRIBUTES = func.coalesce(StateAttributes.shared_attrs, States.attributes).label(
+    "attributes"
+)
+
+
+class Statistics(Base):  # type: ignore
+    """Rollup of the numeric states of an entity over an hour or a day."""
+
+    __tablename__ = "statistics"
+    statistic_id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    period = Column(String(8))
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+
+    __table_args__ = (
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+    )
+
+    def to_dict(self):
+        """Return a JSON friendly representation of the rollup."""
+        return {
+            "entity_id": self.entity_id,
+            "period": self.period,
+            "start": process_timestamp(self.start).isoformat(),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+            "count": self.count,
+        }
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -1,37 +1,84 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
 from sqlalchemy.exc import SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, States
+from .models import Events, StateAttributes, States, Statistics
+from .statistics import HOURLY_KEEP_DAYS, PERIOD_HOUR
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows of each table deleted per batch, bounds how long a batch holds the
+# database so events keep being recorded in between
+MAX_ROWS_TO_PURGE = 1000
+
 
 def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
+    """Purge a batch of events and states older than purge_days ago.
+
+    Hourly rollups are purged once they are older than HOURLY_KEEP_DAYS.
+
+    Every batch is committed on its own so an interrupted purge leaves no
+    work behind, the next purge continues with the oldest remaining rows.
+
+    Returns True when there is nothing left to purge.
+    """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
 
     try:
+        start = time.perf_counter()
+
         with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
+            states = (
+                session.query(States.state_id, States.last_updated)
                 .filter(States.last_updated < purge_before)
-                .delete(synchronize_session=False)
+                .order_by(States.last_updated)
+                .limit(MAX_ROWS_TO_PURGE)
+                .all()
             )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            state_ids = [state.state_id for state in states]
+            if state_ids:
+                session.query(States).filter(States.state_id.in_(state_ids)).delete(
+                    synchronize_session=False
+                )
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            # Keep the events of the states left for the next batch
+            events_before = purge_before
+            if len(states) == MAX_ROWS_TO_PURGE:
+                events_before = states[-1].last_updated
+
+            event_ids = [
+                event_id
+                for (event_id,) in session.query(Events.event_id)
+                .filter(Events.time_fired < events_before)
+                .order_by(Events.event_id)
+                .limit(MAX_ROWS_TO_PURGE)
+            ]
+            if event_ids:
+                session.query(Events).filter(Events.event_id.in_(event_ids)).delete(
+                    synchronize_session=False
+                )
+
+            statistic_ids = _purge_hourly_statistics(session, purge_days)
+
+        _LOGGER.debug(
+            "Deleted %s states, %s events and %s hourly rollups in %.3fs",
+            len(state_ids),
+            len(event_ids),
+            len(statistic_ids),
+            time.perf_counter() - start,
+        )
+
+        if MAX_ROWS_TO_PURGE in (len(state_ids), len(event_ids), len(statistic_ids)):
+            return False
+
+        _purge_unused_state_attributes(instance)
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +87,39 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+
+    return True
+
+
+def _purge_hourly_statistics(session, purge_days):
+    """Delete a batch of the expired hourly rollups, return their ids."""
+    purge_before = dt_util.utcnow() - timedelta(days=max(purge_days, HOURLY_KEEP_DAYS))
+    statistic_ids = [
+        statistic_id
+        for (statistic_id,) in session.query(Statistics.statistic_id)
+        .filter(Statistics.period == PERIOD_HOUR)
+        .filter(Statistics.start < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if statistic_ids:
+        session.query(Statistics).filter(
+            Statistics.statistic_id.in_(statistic_ids)
+        ).delete(synchronize_session=False)
+
+    return statistic_ids
+
+
+def _purge_unused_state_attributes(instance):
+    """Delete shared attributes no longer used by any state."""
+    with session_scope(session=instance.get_session()) as session:
+        in_use = session.query(States.attributes_id).filter(
+            States.attributes_id.isnot(None)
+        )
+        deleted_rows = (
+            session.query(StateAttributes)
+            .filter(~StateAttributes.attributes_id.in_(in_use))
+            .delete(synchronize_session=False)
+        )
+        _LOGGER.debug("Deleted %s shared attributes", deleted_rows)
+
+    instance.clear_state_attributes_cache()
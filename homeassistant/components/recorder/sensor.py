@@ -0,0 +1,91 @@
+"""Sensors reporting the state of the recorder write queue."""
+from datetime import timedelta
+
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+ATTR_DROPPED_EVENTS = "dropped_events"
+ATTR_MAX_QUEUE_SIZE = "max_queue_size"
+ATTR_QUEUE_POLICY = "queue_policy"
+
+ICON = "mdi:database"
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder sensors."""
+    instance = hass.data[DATA_INSTANCE]
+
+    async_add_entities(
+        [RecorderQueueSensor(instance), RecorderCommitDurationSensor(instance)], True
+    )
+
+
+class RecorderSensor(Entity):
+    """Base class for recorder sensors."""
+
+    def __init__(self, instance):
+        """Initialize the sensor."""
+        self._instance = instance
+        self._state = None
+
+    @property
+    def icon(self):
+        """Icon to display in the front end."""
+        return ICON
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+
+class RecorderQueueSensor(RecorderSensor):
+    """Number of events waiting to be written by the recorder."""
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "Recorder queue"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return "events"
+
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        queue = self._instance.queue
+        return {
+            ATTR_DROPPED_EVENTS: queue.dropped,
+            ATTR_MAX_QUEUE_SIZE: queue.max_events,
+            ATTR_QUEUE_POLICY: queue.policy,
+        }
+
+    async def async_update(self):
+        """Update the state of the sensor."""
+        self._state = self._instance.queue.queued_events
+
+
+class RecorderCommitDurationSensor(RecorderSensor):
+    """Duration of the last commit of the recorder."""
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "Recorder commit duration"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return TIME_MILLISECONDS
+
+    async def async_update(self):
+        """Update the state of the sensor."""
+        duration = self._instance.last_commit_duration
+        if duration is not None:
+            self._state = round(duration * 1000, 1)
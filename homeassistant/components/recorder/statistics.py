@@ -0,0 +1,116 @@
+"""Hourly and daily rollups of numeric states."""
+from datetime import datetime, timedelta
+import math
+from typing import Dict, Optional, Tuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+from .models import Statistics
+
+PERIOD_HOUR = "hour"
+PERIOD_DAY = "day"
+PERIODS = (PERIOD_HOUR, PERIOD_DAY)
+
+# Days the hourly rollups are kept, or as long as the states if that is
+# longer. Daily rollups are kept forever, they are the long term history
+# of an entity with a single row per day.
+HOURLY_KEEP_DAYS = 30
+
+
+def period_start(period: str, point_in_time: datetime) -> datetime:
+    """Return the UTC start of the period containing point_in_time.
+
+    Days start at midnight in the configured time zone.
+    """
+    if period == PERIOD_HOUR:
+        return dt_util.as_utc(point_in_time).replace(minute=0, second=0, microsecond=0)
+
+    return dt_util.as_utc(dt_util.start_of_local_day(dt_util.as_local(point_in_time)))
+
+
+def period_length(period: str) -> timedelta:
+    """Return the nominal length of a period."""
+    if period == PERIOD_HOUR:
+        return timedelta(hours=1)
+
+    return timedelta(days=1)
+
+
+def numeric_value(state: State) -> Optional[float]:
+    """Return the value of a state to aggregate, or None to skip it.
+
+    Only states with a unit of measurement are aggregated, those are the
+    states the history graphs draw as lines. Values like "nan" and "inf"
+    would make the rollups of the whole period meaningless.
+    """
+    if ATTR_UNIT_OF_MEASUREMENT not in state.attributes:
+        return None
+
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+
+    return value if math.isfinite(value) else None
+
+
+class StatisticsCompiler:
+    """Keep the rollups of the current periods up to date.
+
+    Rollups are updated in the session of the recorder as states are
+    added, so they are written in the same commit as the states. The rows
+    of the current period of each entity are kept to update them without
+    reading them back.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self._rows: Dict[Tuple[str, str], Tuple[datetime, Statistics]] = {}
+
+    def add_state(self, session, state: State) -> None:
+        """Add a recorded state to the rollups of its periods."""
+        value = numeric_value(state)
+        if value is None:
+            return
+
+        for period in PERIODS:
+            start = period_start(period, state.last_updated)
+            row = self._get_row(session, state.entity_id, period, start)
+
+            if row.count:
+                row.mean += (value - row.mean) / (row.count + 1)
+                row.min = min(row.min, value)
+                row.max = max(row.max, value)
+                row.count += 1
+            else:
+                row.mean = row.min = row.max = value
+                row.count = 1
+            row.last = value
+
+    def reset(self) -> None:
+        """Forget the kept rows, they were not written."""
+        self._rows = {}
+
+    def _get_row(self, session, entity_id, period, start) -> Statistics:
+        """Return the row of a period, creating it if needed."""
+        key = (entity_id, period)
+        kept = self._rows.get(key)
+        if kept is not None and kept[0] == start:
+            return kept[1]
+
+        with session.no_autoflush:
+            row = (
+                session.query(Statistics)
+                .filter(Statistics.entity_id == entity_id)
+                .filter(Statistics.period == period)
+                .filter(Statistics.start == start)
+                .first()
+            )
+        if row is None:
+            row = Statistics(entity_id=entity_id, period=period, start=start, count=0)
+            session.add(row)
+
+        self._rows[key] = (start, row)
+        return row
@@ -17,6 +17,7 @@ from homeassistant.const import (
     STATE_ON,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import template
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import make_entity_service_schema
 from homeassistant.helpers.entity import ToggleEntity
@@ -143,8 +144,8 @@ async def async_setup(hass, config):
     await _async_process_config(hass, config, component)
 
     async def reload_service(service):
-        """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        """Call a service to reload the scripts whose config changed."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -205,7 +206,12 @@ async def async_setup(hass, config):
 
 
 async def _async_process_config(hass, config, component):
-    """Process script configuration."""
+    """Process script configuration.
+
+    Scripts that already exist with the same config are kept, so their runs
+    are not interrupted. The ones that are no longer configured or whose
+    config changed are removed, which also removes their service.
+    """
 
     async def service_handler(service):
         """Execute a service call to script.<script name>."""
@@ -216,9 +222,24 @@ async def _async_process_config(hass, config, component):
             return
         await script.async_turn_on(variables=service.data, context=service.context)
 
+    configs = config.get(DOMAIN, {})
+    # Templates only compare equal once they are attached to hass
+    template.attach(hass, configs)
+    removed = [
+        entity
+        for entity in component.entities
+        if configs.get(entity.object_id) != entity.raw_config
+    ]
+    if removed:
+        await asyncio.gather(*[entity.async_remove() for entity in removed])
+
+    existing = {entity.object_id for entity in component.entities}
     scripts = []
 
-    for object_id, cfg in config.get(DOMAIN, {}).items():
+    for object_id, cfg in configs.items():
+        if object_id in existing:
+            continue
+
         scripts.append(
             ScriptEntity(
                 hass,
@@ -226,6 +247,7 @@ async def _async_process_config(hass, config, component):
                 cfg.get(CONF_ALIAS, object_id),
                 cfg.get(CONF_ICON),
                 cfg[CONF_SEQUENCE],
+                cfg,
             )
         )
         hass.services.async_register(
@@ -247,10 +269,11 @@ class ScriptEntity(ToggleEntity):
 
     icon = None
 
-    def __init__(self, hass, object_id, name, icon, sequence):
+    def __init__(self, hass, object_id, name, icon, sequence, raw_config=None):
         """Initialize the script."""
         self.object_id = object_id
         self.icon = icon
+        self.raw_config = raw_config
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self.script = Script(
             hass, sequence, name, self.async_write_ha_state, logger=_LOGGER
@@ -7,8 +7,11 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
 from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, Unauthorized
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers import config_validation as cv, profiling, startup_timeline
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
@@ -22,6 +25,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -30,6 +34,10 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_manifest_get)
+    async_reg(hass, handle_start_profiler)
+    async_reg(hass, handle_stop_profiler)
+    async_reg(hass, handle_profiler_stats)
+    async_reg(hass, handle_startup_timeline)
 
 
 def pong_message(iden):
@@ -65,7 +73,7 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            connection.send_message(messages.cached_event_message(msg["id"], event))
 
     else:
 
@@ -75,7 +83,7 @@ def handle_subscribe_events(hass, connection, msg):
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
+            connection.send_message(messages.cached_event_message(msg["id"], event))
 
     connection.subscriptions[msg["id"]] = hass.bus.async_listen(
         event_type, forward_events
@@ -106,6 +114,56 @@ def handle_unsubscribe_events(hass, connection, msg):
         )
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities once, followed by only what
+    changed for every state change.
+    """
+    entity_ids = msg.get("entity_ids")
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward entity state changes to websocket."""
+        if not entity_perm(event.data["entity_id"], POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    if entity_ids is None:
+        states = hass.states.async_all()
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+    else:
+        states = [hass.states.get(entity_id) for entity_id in entity_ids]
+        connection.subscriptions[msg["id"]] = async_track_state_change_event(
+            hass, entity_ids, forward_entity_changes
+        )
+
+    connection.send_result(msg["id"])
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                const.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state_dict(state)
+                    for state in states
+                    if state is not None and entity_perm(state.entity_id, POLICY_READ)
+                }
+            },
+        )
+    )
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "call_service",
@@ -219,6 +277,59 @@ async def handle_manifest_get(hass, connection, msg):
         connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Integration not found")
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "profiler/start"})
+@decorators.require_admin
+def handle_start_profiler(hass, connection, msg):
+    """Handle start profiler command."""
+    profiling.async_start_profiler(hass)
+    connection.send_result(msg["id"])
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "profiler/stop"})
+@decorators.require_admin
+def handle_stop_profiler(hass, connection, msg):
+    """Handle stop profiler command, returning the final measurements."""
+    profiler = profiling.async_stop_profiler(hass)
+
+    if profiler is None:
+        connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Profiler not running")
+        return
+
+    connection.send_result(msg["id"], profiler.as_dict())
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "profiler/stats"})
+@decorators.require_admin
+def handle_profiler_stats(hass, connection, msg):
+    """Handle profiler stats command."""
+    profiler = profiling.async_get_profiler(hass)
+
+    if profiler is None:
+        connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Profiler not running")
+        return
+
+    connection.send_result(msg["id"], profiler.as_dict())
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "startup/timeline"})
+@decorators.require_admin
+def handle_startup_timeline(hass, connection, msg):
+    """Handle startup timeline command."""
+    timeline = startup_timeline.async_get_timeline(hass)
+
+    if timeline is None:
+        connection.send_error(
+            msg["id"], const.ERR_NOT_FOUND, "Startup timeline not recorded"
+        )
+        return
+
+    connection.send_result(msg["id"], timeline.as_dict())
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(hass, connection, msg):
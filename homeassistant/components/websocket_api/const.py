@@ -31,6 +31,22 @@ ERR_TIMEOUT = "timeout"
 
 TYPE_RESULT = "result"
 
+# Keys of the compressed states sent to entity subscriptions
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+# Keys of the events sent to entity subscriptions
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+
+# Keys of the state changes sent to entity subscriptions
+STATE_DIFF_ADDITIONS = "+"
+STATE_DIFF_REMOVALS = "-"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
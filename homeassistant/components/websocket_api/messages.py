@@ -1,13 +1,24 @@
 """Message templates for websocket commands."""
 
+from collections import OrderedDict
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
 import voluptuous as vol
 
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util.json import (
+    find_paths_unserializable_data,
+    format_unserializable_data,
+)
 
 from . import const
 
 # mypy: allow-untyped-defs
 
+_LOGGER = logging.getLogger(__name__)
+
 # Minimal requirements of a message
 MINIMAL_MESSAGE_SCHEMA = vol.Schema(
     {vol.Required("id"): cv.positive_int, vol.Required("type"): cv.string},
@@ -17,6 +28,17 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+# Placeholder of the id in cached messages, replaced for each connection
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = f'"{IDEN_TEMPLATE}"'
+
+EVENT_MESSAGE_CACHE_SIZE = 128
+
+# Serialized messages by id of the event. The event is kept with its message
+# so its id can't be reused by another event while cached.
+_EVENT_MESSAGE_CACHE: "OrderedDict[int, Tuple[Event, str]]" = OrderedDict()
+_STATE_DIFF_MESSAGE_CACHE: "OrderedDict[int, Tuple[Event, str]]" = OrderedDict()
+
 
 def result_message(iden, result=None):
     """Return a success result message."""
@@ -36,3 +58,139 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden: int, event: Event) -> str:
+    """Return a serialized event message.
+
+    The event is serialized once for all connections subscribed to it,
+    only the id of the message differs.
+    """
+    return _cached_message(
+        _EVENT_MESSAGE_CACHE, event, lambda: event_message(IDEN_TEMPLATE, event)
+    ).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return a serialized entity event message of a state_changed event."""
+    return _cached_message(
+        _STATE_DIFF_MESSAGE_CACHE,
+        event,
+        lambda: event_message(IDEN_TEMPLATE, state_diff_event(event)),
+    ).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+def _cached_message(
+    cache: "OrderedDict[int, Tuple[Event, str]]",
+    event: Event,
+    create_message: Callable[[], Dict[str, Any]],
+) -> str:
+    """Return the serialized message of an event from a cache."""
+    key = id(event)
+    cached = cache.get(key)
+
+    if cached is None:
+        cached = (event, message_to_json(create_message()))
+        cache[key] = cached
+        if len(cache) > EVENT_MESSAGE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    return cached[1]
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compressed dict of a state.
+
+    Timestamps are sent as seconds since epoch and the last updated time
+    only when it differs from the last changed time.
+    """
+    compressed = {
+        const.COMPRESSED_STATE_STATE: state.state,
+        const.COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        const.COMPRESSED_STATE_CONTEXT: state.context.id,
+        const.COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+
+    if state.last_updated != state.last_changed:
+        compressed[const.COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+
+    return compressed
+
+
+def state_diff_event(event: Event) -> Dict[str, Any]:
+    """Return the entity event of a state_changed event.
+
+    Added entities are sent as a compressed state, removed entities by
+    entity_id and changed entities only with what changed.
+    """
+    entity_id = event.data["entity_id"]
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+
+    if new_state is None:
+        return {const.ENTITY_EVENT_REMOVE: [entity_id]}
+
+    if old_state is None:
+        return {const.ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+
+    return {const.ENTITY_EVENT_CHANGE: {entity_id: _state_diff(old_state, new_state)}}
+
+
+def _state_diff(old_state: State, new_state: State) -> Dict[str, Any]:
+    """Return what changed between two states of an entity."""
+    additions: Dict[str, Any] = {}
+    diff = {const.STATE_DIFF_ADDITIONS: additions}
+
+    if old_state.state != new_state.state:
+        additions[const.COMPRESSED_STATE_STATE] = new_state.state
+
+    if old_state.last_changed != new_state.last_changed:
+        additions[
+            const.COMPRESSED_STATE_LAST_CHANGED
+        ] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[
+            const.COMPRESSED_STATE_LAST_UPDATED
+        ] = new_state.last_updated.timestamp()
+
+    if old_state.context.id != new_state.context.id:
+        additions[const.COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+
+    changed = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed:
+        additions[const.COMPRESSED_STATE_ATTRIBUTES] = changed
+
+    removed: List[str] = [key for key in old_attributes if key not in new_attributes]
+    if removed:
+        diff[const.STATE_DIFF_REMOVALS] = {const.COMPRESSED_STATE_ATTRIBUTES: removed}
+
+    return diff
+
+
+def message_to_json(message: Dict[str, Any]) -> str:
+    """Serialize a websocket message to JSON.
+
+    Returns an error message for the same id if the message can't be
+    serialized.
+    """
+    try:
+        return const.JSON_DUMP(message)
+    except (ValueError, TypeError):
+        _LOGGER.error(
+            "Unable to serialize to JSON. Bad data found at %s",
+            format_unserializable_data(
+                find_paths_unserializable_data(message, dump=const.JSON_DUMP)
+            ),
+        )
+        return const.JSON_DUMP(
+            error_message(
+                message["id"], const.ERR_UNKNOWN_ERROR, "Invalid JSON in response"
+            )
+        )
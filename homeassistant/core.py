@@ -82,6 +82,7 @@ if TYPE_CHECKING:
     from homeassistant.auth import AuthManager
     from homeassistant.config_entries import ConfigEntries
     from homeassistant.components.http import HomeAssistantHTTP
+    from homeassistant.helpers.profiling import BusProfiler
 
 
 block_async_io.enable()
@@ -158,6 +159,50 @@ def async_loop_exception_handler(_: Any, context: Dict) -> None:
     )
 
 
+class HassJobType(enum.Enum):
+    """Represent how a job is run."""
+
+    Coroutinefunction = 1
+    Callback = 2
+    Executor = 3
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    The type of the target is determined once when the job is created, so
+    it is not checked again every time the job is run.
+    """
+
+    __slots__ = ("job_type", "target", "__weakref__")
+
+    def __init__(self, target: Callable[..., Any]) -> None:
+        """Create a job object."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine not allowed to be passed to HassJob")
+
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the representation of the job."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_callable_job_type(target: Callable[..., Any]) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    if is_callback(check_target):
+        return HassJobType.Callback
+    return HassJobType.Executor
+
+
 class CoreState(enum.Enum):
     """Represent the current state of Home Assistant."""
 
@@ -342,6 +387,34 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        task = None
+
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(hassjob.target(*args))
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, hassjob.target, *args
+            )
+
+        # If a task is scheduled
+        if self._track_task and task is not None:
+            self._pending_tasks.append(task)
+
+        return task
+
     @callback
     def async_create_task(self, target: Coroutine) -> asyncio.tasks.Task:
         """Create a task from within the eventloop.
@@ -400,6 +473,20 @@ class HomeAssistant:
         else:
             self.async_add_job(target, *args)
 
+    @callback
+    def async_run_hass_job(self, hassjob: HassJob, *args: Any) -> None:
+        """Run a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            hassjob.target(*args)
+        else:
+            self.async_add_hass_job(hassjob, *args)
+
     def block_till_done(self) -> None:
         """Block until all pending work is done."""
         asyncio.run_coroutine_threadsafe(
@@ -553,8 +640,9 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[HassJob]] = {}
         self._hass = hass
+        self._profiler: Optional["BusProfiler"] = None
 
     @callback
     def async_listeners(self) -> Dict[str, int]:
@@ -605,11 +693,28 @@ class EventBus:
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.async_event_fired(event_type)
+
         if not listeners:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        if profiler is not None:
+            for job in listeners:
+                profiler.async_add_job(event_type, job, event)
+            return
+
+        for job in listeners:
+            self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def async_set_profiler(self, profiler: Optional["BusProfiler"]) -> None:
+        """Measure the fired events and their listeners with a profiler.
+
+        Pass None to stop profiling. This method must be run in the event loop.
+        """
+        self._profiler = profiler
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -628,22 +733,28 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen(
+        self, event_type: str, listener: Union[Callable, HassJob]
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        The listener can be a HassJob to avoid determining its type again.
+
         This method must be run in the event loop.
         """
+        job = listener if isinstance(listener, HassJob) else HassJob(listener)
+
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(job)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [job]
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            self._async_remove_listener(event_type, job)
 
         return remove_listener
 
@@ -666,7 +777,9 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen_once(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen_once(
+        self, event_type: str, listener: Union[Callable, HassJob]
+    ) -> CALLBACK_TYPE:
         """Listen once for event of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
@@ -676,6 +789,8 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        job = listener if isinstance(listener, HassJob) else HassJob(listener)
+        onetime_job: Optional[HassJob] = None
 
         @callback
         def onetime_listener(event: Event) -> None:
@@ -688,19 +803,20 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
-            self._async_remove_listener(event_type, onetime_listener)
-            self._hass.async_run_job(listener, event)
+            self._async_remove_listener(event_type, cast(HassJob, onetime_job))
+            self._hass.async_run_hass_job(job, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        onetime_job = HassJob(onetime_listener)
+        return self.async_listen(event_type, onetime_job)
 
     @callback
-    def _async_remove_listener(self, event_type: str, listener: Callable) -> None:
+    def _async_remove_listener(self, event_type: str, job: HassJob) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(job)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -708,7 +824,7 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning("Unable to remove unknown listener %s", job)
 
 
 class State:
@@ -1,8 +1,8 @@
 """Helpers for Home Assistant dispatcher & internal component/platform."""
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Union
 
-from homeassistant.core import callback
+from homeassistant.core import HassJob, callback
 from homeassistant.loader import bind_hass
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.logging import catch_log_exception
@@ -32,12 +32,15 @@ def dispatcher_connect(
 @callback
 @bind_hass
 def async_dispatcher_connect(
-    hass: HomeAssistantType, signal: str, target: Callable[..., Any]
+    hass: HomeAssistantType, signal: str, target: Union[Callable[..., Any], HassJob]
 ) -> Callable[[], None]:
     """Connect a callable function to a signal.
 
     This method must be run in the event loop.
     """
+    if isinstance(target, HassJob):
+        target = target.target
+
     if DATA_DISPATCHER not in hass.data:
         hass.data[DATA_DISPATCHER] = {}
 
@@ -54,13 +57,14 @@ def async_dispatcher_connect(
         ),
     )
 
-    hass.data[DATA_DISPATCHER][signal].append(wrapped_target)
+    job = HassJob(wrapped_target)
+    hass.data[DATA_DISPATCHER][signal].append(job)
 
     @callback
     def async_remove_dispatcher() -> None:
         """Remove signal listener."""
         try:
-            hass.data[DATA_DISPATCHER][signal].remove(wrapped_target)
+            hass.data[DATA_DISPATCHER][signal].remove(job)
         except (KeyError, ValueError):
             # KeyError is key target listener did not exist
             # ValueError if listener did not exist within signal
@@ -84,5 +88,5 @@ def async_dispatcher_send(hass: HomeAssistantType, signal: str, *args: Any) -> N
     """
     target_list = hass.data.get(DATA_DISPATCHER, {}).get(signal, [])
 
-    for target in target_list:
-        hass.async_add_job(target, *args)
+    for job in target_list:
+        hass.async_add_hass_job(job, *args)
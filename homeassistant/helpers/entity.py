@@ -111,6 +111,9 @@ class Entity(ABC):
     # Entry in the entity registry
     registry_entry: Optional[RegistryEntry] = None
 
+    # Seconds the last update took, without waiting for parallel updates
+    last_update_duration: Optional[float] = None
+
     # Hold list for functions to call on remove.
     _on_remove: Optional[List[CALLBACK_TYPE]] = None
 
@@ -458,6 +461,7 @@ class Entity(ABC):
             await self.parallel_updates.acquire()
 
         assert self.hass is not None
+        start = timer()
         if warning:
             update_warn = self.hass.loop.call_later(
                 SLOW_UPDATE_WARNING,
@@ -476,6 +480,7 @@ class Entity(ABC):
                     self.update  # type: ignore
                 )
         finally:
+            self.last_update_duration = timer() - start
             self._update_staged = False
             if warning:
                 update_warn.cancel()
@@ -24,7 +24,7 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.loader import async_get_integration, bind_hass
 from homeassistant.setup import async_prepare_setup_platform
 
-from .entity_platform import EntityPlatform
+from .entity_platform import DATA_DOMAIN_ENTITIES, EntityPlatform
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=15)
 DATA_INSTANCES = "entity_components"
@@ -78,6 +78,9 @@ class EntityComponent:
 
         self.config: Optional[ConfigType] = None
 
+        self._entities: Dict[str, entity.Entity] = hass.data.setdefault(
+            DATA_DOMAIN_ENTITIES, {}
+        ).setdefault(domain, {})
         self._platforms: Dict[
             Union[str, Tuple[str, Optional[timedelta], Optional[str]]], EntityPlatform
         ] = {domain: self._async_init_entity_platform(domain, None)}
@@ -95,11 +98,7 @@ class EntityComponent:
 
     def get_entity(self, entity_id: str) -> Optional[entity.Entity]:
         """Get an entity."""
-        for platform in self._platforms.values():
-            entity_obj = platform.entities.get(entity_id)
-            if entity_obj is not None:
-                return entity_obj
-        return None
+        return self._entities.get(entity_id)
 
     def setup(self, config: ConfigType) -> None:
         """Set up a full entity component.
@@ -206,7 +205,7 @@ class EntityComponent:
         async def handle_service(call: Callable) -> None:
             """Handle the service."""
             await self.hass.helpers.service.entity_service_call(
-                self._platforms.values(), func, call, required_features
+                self._entities, func, call, required_features
             )
 
         self.hass.services.async_register(self.domain, name, handle_service, schema)
@@ -2,9 +2,11 @@
 import asyncio
 from contextvars import ContextVar
 from datetime import datetime, timedelta
+from functools import partial
 from logging import Logger
+import random
 from types import ModuleType
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
 from homeassistant.const import DEVICE_DEFAULT_NAME
 from homeassistant.core import CALLBACK_TYPE, callback, split_entity_id, valid_entity_id
@@ -15,6 +17,8 @@ from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
 from .event import async_call_later, async_track_time_interval
+from .profiling import SampleStats
+from .startup_timeline import PHASE_PLATFORMS, async_record_phase
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -25,6 +29,28 @@ SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
+DATA_DOMAIN_ENTITIES = "domain_entities"
+DATA_INTEGRATION_ENTITIES = "integration_entities"
+
+# Largest part of the scan interval the first poll of an entity is moved
+# forward by, so entities with the same scan interval do not poll together
+POLL_JITTER = 0.5
+# Number of consecutive polls of an entity longer than its polling interval
+# before the interval is doubled, up to MAX_POLL_BACKOFF times the scan interval
+SLOW_POLL_THRESHOLD = 3
+MAX_POLL_BACKOFF = 8
+
+
+class _PollState:
+    """Polling state of an entity that is polled less often."""
+
+    __slots__ = ("backoff", "slow_polls", "ticks_to_skip")
+
+    def __init__(self) -> None:
+        """Initialize the poll state."""
+        self.backoff = 1
+        self.slow_polls = 0
+        self.ticks_to_skip = 0
 
 
 class EntityPlatform:
@@ -51,12 +77,25 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
+        # Entities of all platforms of the same domain, and of all platforms
+        # with the same platform name, to look them up in service calls
+        self.domain_entities: Dict[str, Entity] = hass.data.setdefault(
+            DATA_DOMAIN_ENTITIES, {}
+        ).setdefault(domain, {})
+        self.integration_entities: Dict[str, Entity] = hass.data.setdefault(
+            DATA_INTEGRATION_ENTITIES, {}
+        ).setdefault(platform_name, {})
         self._tasks: List[asyncio.Future] = []
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
+        # Methods to cancel the polling of the entities
+        self._poll_unsubs: Dict[str, CALLBACK_TYPE] = {}
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
+        # Entities with an update in progress, and the entities that are
+        # polled less often because their updates take too long
+        self._polling: Set[str] = set()
+        self._poll_states: Dict[str, _PollState] = {}
+        # Durations of the updates of the polled entities of the platform
+        self.poll_durations = SampleStats()
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -173,17 +212,18 @@ class EntityPlatform:
         )
 
         try:
-            task = async_create_setup_task()
+            with async_record_phase(hass, self.platform_name, PHASE_PLATFORMS):
+                task = async_create_setup_task()
 
-            await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
+                await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
 
-            # Block till all entities are done
-            if self._tasks:
-                pending = [task for task in self._tasks if not task.done()]
-                self._tasks.clear()
+                # Block till all entities are done
+                if self._tasks:
+                    pending = [task for task in self._tasks if not task.done()]
+                    self._tasks.clear()
 
-                if pending:
-                    await asyncio.gather(*pending)
+                    if pending:
+                        await asyncio.gather(*pending)
 
             hass.config.components.add(full_name)
             return True
@@ -291,14 +331,24 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
+    @callback
+    def _async_schedule_polling(self, entity_id: str) -> None:
+        """Poll an entity for the first time at a random point in the interval.
+
+        Every entity keeps its own point in the interval afterwards, so the
+        polls of the entities of a platform are spread over the interval.
+        """
+        delay = self.scan_interval.total_seconds() * (1 - POLL_JITTER * random.random())
+        self._poll_unsubs[entity_id] = async_call_later(
+            self.hass, delay, partial(self._async_start_polling, entity_id)
+        )
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass, self._update_entity_states, self.scan_interval,
+    async def _async_start_polling(self, entity_id: str, now: datetime) -> None:
+        """Poll an entity every scan interval from now on."""
+        self._poll_unsubs[entity_id] = async_track_time_interval(
+            self.hass, partial(self._async_poll_entity, entity_id), self.scan_interval,
         )
+        await self._async_poll_entity(entity_id, now)
 
     async def _async_add_entity(
         self, entity, update_before_add, entity_registry, device_registry
@@ -443,13 +493,30 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        self.domain_entities[entity_id] = entity
+        self.integration_entities[entity_id] = entity
+
+        @callback
+        def remove_entity_cb() -> None:
+            """Remove entity from entities list."""
+            self.entities.pop(entity_id)
+            self.domain_entities.pop(entity_id)
+            self.integration_entities.pop(entity_id)
+            self._poll_states.pop(entity_id, None)
+            unsub_polling = self._poll_unsubs.pop(entity_id, None)
+            if unsub_polling is not None:
+                unsub_polling()
+
+        entity.async_on_remove(remove_entity_cb)
 
         await entity.async_internal_added_to_hass()
         await entity.async_added_to_hass()
 
         entity.async_write_ha_state()
 
+        if entity.should_poll:
+            self._async_schedule_polling(entity_id)
+
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
 
@@ -466,10 +533,6 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_destroy(self) -> None:
         """Destroy an entity platform.
 
@@ -482,13 +545,6 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_extract_from_service(self, service_call, expand_group=True):
         """Extract all known and available entities from a service call.
 
@@ -515,45 +571,93 @@ class EntityPlatform:
         async def handle_service(call):
             """Handle the service."""
             await service.entity_service_call(
-                self.hass,
-                self.hass.data[DATA_ENTITY_PLATFORM][self.platform_name],
-                func,
-                call,
-                required_features,
+                self.hass, self.integration_entities, func, call, required_features
             )
 
         self.hass.services.async_register(
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
+    async def _async_poll_entity(self, entity_id: str, now: datetime) -> None:
+        """Update the state of a polling entity.
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        An entity still updating since a previous interval is skipped, and an
+        entity whose updates take too long is polled less often.
 
         This method must be run in the event loop.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
+        entity = self.entities.get(entity_id)
+        if entity is None or not entity.should_poll:
+            return
+
+        state = self._poll_states.get(entity_id)
+
+        if state is not None and state.ticks_to_skip:
+            state.ticks_to_skip -= 1
+            return
+
+        if entity_id in self._polling:
             self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
+                "Updating %s took longer than the scheduled update interval %s",
+                entity_id,
                 self.scan_interval,
             )
             return
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        if state is not None:
+            state.ticks_to_skip = state.backoff - 1
+
+        self._polling.add(entity_id)
+        entity.last_update_duration = None
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            self._polling.discard(entity_id)
+            # Not set when an update was already in progress
+            if entity.last_update_duration is not None:
+                self.poll_durations.async_add(entity.last_update_duration)
+                self._async_poll_done(entity_id, entity.last_update_duration)
+
+    @callback
+    def _async_poll_done(self, entity_id: str, duration: float) -> None:
+        """Adapt the polling interval of an entity to its last update.
+
+        The duration does not include the time spent waiting for
+        PARALLEL_UPDATES.
+        """
+        if entity_id not in self.entities:
+            return
 
-            if tasks:
-                await asyncio.gather(*tasks)
+        interval = self.scan_interval.total_seconds()
+        state = self._poll_states.get(entity_id)
+
+        if state is not None and duration <= interval / 2:
+            # Fast again, back to the scan interval
+            del self._poll_states[entity_id]
+            return
+
+        if duration <= interval * (state.backoff if state is not None else 1):
+            if state is not None:
+                state.slow_polls = 0
+            return
+
+        if state is None:
+            state = self._poll_states[entity_id] = _PollState()
+
+        state.slow_polls += 1
+
+        if state.slow_polls < SLOW_POLL_THRESHOLD or state.backoff >= MAX_POLL_BACKOFF:
+            return
+
+        state.slow_polls = 0
+        state.backoff *= 2
+        self.logger.warning(
+            "Updating %s took longer than %s %d times in a row, updating it every %s",
+            entity_id,
+            self.scan_interval * (state.backoff // 2),
+            SLOW_POLL_THRESHOLD,
+            self.scan_interval * state.backoff,
+        )
 
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
@@ -1,7 +1,10 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
 import attr
 
@@ -14,13 +17,28 @@ from homeassistant.const import (
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
 )
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.profiling import async_get_profiler
 from homeassistant.helpers.sun import get_astral_event_next
 from homeassistant.helpers.template import Template
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
+TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+
+TRACK_POINT_IN_TIME_SCHEDULER = "track_point_in_time_scheduler"
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -49,6 +67,11 @@ def threaded_listener_factory(async_factory: Callable[..., Any]) -> CALLBACK_TYP
     return factory
 
 
+def _to_hass_job(action: Union[Callable[..., Any], HassJob]) -> HassJob:
+    """Return a HassJob for an action, unless it already is one."""
+    return action if isinstance(action, HassJob) else HassJob(action)
+
+
 @callback
 @bind_hass
 def async_track_state_change(
@@ -69,6 +92,7 @@ def async_track_state_change(
     """
     match_from_state = process_state_match(from_state)
     match_to_state = process_state_match(to_state)
+    job = _to_hass_job(action)
 
     # Ensure it is a lowercase list with entity ids we want to match on
     if entity_ids == MATCH_ALL:
@@ -81,12 +105,6 @@ def async_track_state_change(
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -96,14 +114,93 @@ def async_track_state_change(
             new_state = new_state.state
 
         if match_from_state(old_state) and match_to_state(new_state):
-            hass.async_run_job(
-                action,
+            hass.async_run_hass_job(
+                job,
                 event.data.get("entity_id"),
                 event.data.get("old_state"),
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+
+    return async_track_state_change_event(hass, entity_ids, state_change_listener)
+
+
+@callback
+@bind_hass
+def async_track_state_change_event(
+    hass: HomeAssistant,
+    entity_ids: Union[str, Iterable[str]],
+    action: Union[Callable[[Event], None], HassJob],
+) -> CALLBACK_TYPE:
+    """Track specific state change events indexed by entity_id.
+
+    All trackers share a single state_changed listener that looks up the
+    interested actions by entity_id, so the cost of a state change scales
+    with the number of actions tracking that entity instead of the total
+    number of trackers.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    entity_callbacks: Dict[str, List[HassJob]] = hass.data.setdefault(
+        TRACK_STATE_CHANGE_CALLBACKS, {}
+    )
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by entity_id."""
+            entity_id = event.data.get("entity_id")
+
+            if entity_id not in entity_callbacks:
+                return
+
+            profiler = async_get_profiler(hass)
+
+            for job in entity_callbacks[entity_id][:]:
+                try:
+                    if profiler is None:
+                        hass.async_run_hass_job(job, event)
+                    else:
+                        profiler.async_run_job(EVENT_STATE_CHANGED, job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s", entity_id
+                    )
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+        )
+
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+
+    entity_ids = [entity_id.lower() for entity_id in entity_ids]
+    job = _to_hass_job(action)
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            callbacks = entity_callbacks.get(entity_id)
+            if callbacks is None or job not in callbacks:
+                continue
+
+            callbacks.remove(job)
+            if not callbacks:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
@@ -122,6 +219,7 @@ def async_track_template(
 
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
+    job = _to_hass_job(action)
 
     @callback
     def template_condition_listener(entity_id: str, from_s: State, to_s: State) -> None:
@@ -132,7 +230,7 @@ def async_track_template(
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            hass.async_run_hass_job(job, entity_id, from_s, to_s)
         elif not template_result:
             already_triggered = False
 
@@ -160,6 +258,7 @@ def async_track_same_state(
     """
     async_remove_state_for_cancel: Optional[CALLBACK_TYPE] = None
     async_remove_state_for_listener: Optional[CALLBACK_TYPE] = None
+    job = _to_hass_job(action)
 
     @callback
     def clear_listener() -> None:
@@ -179,7 +278,7 @@ def async_track_same_state(
         nonlocal async_remove_state_for_listener
         async_remove_state_for_listener = None
         clear_listener()
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     @callback
     def state_for_cancel_listener(
@@ -210,11 +309,12 @@ def async_track_point_in_time(
 ) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in time."""
     utc_point_in_time = dt_util.as_utc(point_in_time)
+    job = _to_hass_job(action)
 
     @callback
     def utc_converter(utc_now: datetime) -> None:
         """Convert passed in UTC now to local now."""
-        hass.async_run_job(action, dt_util.as_local(utc_now))
+        hass.async_run_hass_job(job, dt_util.as_local(utc_now))
 
     return async_track_point_in_utc_time(hass, utc_converter, utc_point_in_time)
 
@@ -222,36 +322,171 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
-@callback
-@bind_hass
-def async_track_point_in_utc_time(
-    hass: HomeAssistant, action: Callable[..., Any], point_in_time: datetime
-) -> CALLBACK_TYPE:
-    """Add a listener that fires once after a specific point in UTC time."""
-    # Ensure point_in_time is UTC
-    point_in_time = dt_util.as_utc(point_in_time)
+class PointInTimeScheduler:
+    """Run actions at points in UTC time from a single time listener.
+
+    Pending actions are kept in a heap ordered by their point in time, so a
+    time_changed tick only looks at the actions that are due instead of
+    invoking one listener per pending action.
+
+    Actions can pass a function to calculate their point in time again when
+    the time rolls back, so recurring actions are not delayed by a clock that
+    jumps backwards.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._schedule: List[List[Any]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+        self._last_now = dt_util.utcnow()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of actions waiting to run."""
+        return len(self._schedule) - self._cancelled
 
     @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
+    def async_schedule(
+        self,
+        action: Union[Callable[..., Any], HassJob],
+        point_in_time: datetime,
+        calculate_next: Optional[Callable[[datetime], datetime]] = None,
+    ) -> CALLBACK_TYPE:
+        """Schedule an action to run once at a point in UTC time.
+
+        If calculate_next is given it is called with the new time when the
+        time rolls back and has to return the new point in UTC time.
+        """
+        # Entries are [point_in_time, sequence, job, calculate_next]. The
+        # sequence keeps actions with the same point in time in registration
+        # order and the job is cleared when the entry is cancelled or has
+        # run.
+        entry = [
+            point_in_time,
+            next(self._counter),
+            _to_hass_job(action),
+            calculate_next,
+        ]
+        heapq.heappush(self._schedule, entry)
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def async_cancel() -> None:
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+
+            entry[2] = None
+            self._cancelled += 1
+
+            if self._cancelled * 2 > len(self._schedule):
+                self._async_compact()
+
+        return async_cancel
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop cancelled entries from the schedule."""
+        self._schedule = [entry for entry in self._schedule if entry[2] is not None]
+        heapq.heapify(self._schedule)
+        self._cancelled = 0
+
+        if not self._schedule:
+            self._async_stop_listening()
+
+    @callback
+    def _async_stop_listening(self) -> None:
+        """Stop listening for time changes."""
+        if self._unsub_time is not None:
+            self._unsub_time()
+            self._unsub_time = None
+
+    @callback
+    def _async_time_rolled_back(self, now: datetime) -> None:
+        """Calculate the point in time again for actions that support it."""
+        for entry in self._schedule:
+            if entry[2] is not None and entry[3] is not None:
+                entry[0] = entry[3](now)
+
+        heapq.heapify(self._schedule)
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run all actions that are due."""
         now = event.data[ATTR_NOW]
 
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
+        if now.tzinfo is None:
+            # The time_changed event reports UTC time
+            now = now.replace(tzinfo=dt_util.UTC)
+
+        if now < self._last_now:
+            self._async_time_rolled_back(now)
+
+        self._last_now = now
+        schedule = self._schedule
+        due = []
+
+        while schedule and schedule[0][0] <= now:
+            entry = heapq.heappop(schedule)
+            if entry[2] is None:
+                self._cancelled -= 1
+            else:
+                due.append(entry[2])
+                entry[2] = None
 
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
+        # Actions scheduled while running the due ones have to wait for the
+        # next time_changed event, like a newly added listener would.
+        profiler = async_get_profiler(self.hass)
 
-        hass.async_run_job(action, now)
+        for job in due:
+            try:
+                if profiler is None:
+                    self.hass.async_run_hass_job(job, now)
+                else:
+                    profiler.async_run_job(EVENT_TIME_CHANGED, job, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while running scheduled action %s", job)
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
+        if not self._schedule:
+            self._async_stop_listening()
+
+
+@callback
+def _async_get_point_in_time_scheduler(hass: HomeAssistant) -> PointInTimeScheduler:
+    """Return the point in time scheduler, creating it when needed."""
+    scheduler: Optional[PointInTimeScheduler] = hass.data.get(
+        TRACK_POINT_IN_TIME_SCHEDULER
+    )
+
+    if scheduler is None:
+        scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER] = PointInTimeScheduler(
+            hass
+        )
 
-    return async_unsub
+    return scheduler
+
+
+@callback
+@bind_hass
+def async_track_point_in_utc_time(
+    hass: HomeAssistant,
+    action: Union[Callable[..., Any], HassJob],
+    point_in_time: datetime,
+) -> CALLBACK_TYPE:
+    """Add a listener that fires once after a specific point in UTC time."""
+    # Ensure point_in_time is UTC
+    point_in_time = dt_util.as_utc(point_in_time)
+
+    return _async_get_point_in_time_scheduler(hass).async_schedule(
+        action, point_in_time
+    )
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -280,6 +515,7 @@ def async_track_time_interval(
 ) -> CALLBACK_TYPE:
     """Add a listener that fires repetitively at every timedelta interval."""
     remove = None
+    job = _to_hass_job(action)
 
     def next_interval() -> datetime:
         """Return the next interval."""
@@ -289,10 +525,13 @@ def async_track_time_interval(
     def interval_listener(now: datetime) -> None:
         """Handle elapsed intervals."""
         nonlocal remove
-        remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
-        hass.async_run_job(action, now)
+        remove = async_track_point_in_utc_time(
+            hass, interval_listener_job, next_interval()
+        )
+        hass.async_run_hass_job(job, now)
 
-    remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
+    interval_listener_job = HassJob(interval_listener)
+    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
 
     def remove_listener() -> None:
         """Remove interval listener."""
@@ -314,6 +553,12 @@ class SunListener:
     offset: Optional[timedelta] = attr.ib()
     _unsub_sun: Optional[CALLBACK_TYPE] = attr.ib(default=None)
     _unsub_config: Optional[CALLBACK_TYPE] = attr.ib(default=None)
+    _job: HassJob = attr.ib(init=False)
+
+    @_job.default
+    def _job_default(self) -> HassJob:
+        """Return the job of the action."""
+        return _to_hass_job(self.action)
 
     @callback
     def async_attach(self) -> None:
@@ -353,7 +598,7 @@ class SunListener:
         """Handle solar event."""
         self._unsub_sun = None
         self._listen_next_sun_event()
-        self.hass.async_run_job(self.action)
+        self.hass.async_run_hass_job(self._job)
 
     @callback
     def _handle_config_event(self, _event: Any) -> None:
@@ -405,12 +650,14 @@ def async_track_utc_time_change(
     """Add a listener that will fire if time matches a pattern."""
     # We do not have to wrap the function with time pattern matching logic
     # if no pattern given
+    job = _to_hass_job(action)
+
     if all(val is None for val in (hour, minute, second)):
 
         @callback
         def time_change_listener(event: Event) -> None:
             """Fire every time event that comes in."""
-            hass.async_run_job(action, event.data[ATTR_NOW])
+            hass.async_run_hass_job(job, event.data[ATTR_NOW])
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
@@ -418,42 +665,44 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    next_time = None
-
-    def calculate_next(now: datetime) -> None:
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
+    scheduler = _async_get_point_in_time_scheduler(hass)
+    cancel_callback: Optional[CALLBACK_TYPE] = None
 
+    def calculate_next(now: datetime) -> datetime:
+        """Calculate the next time the trigger should fire."""
         localized_now = dt_util.as_local(now) if local else now
-        next_time = dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
+        return dt_util.as_utc(
+            dt_util.find_next_time_expression_time(
+                localized_now, matching_seconds, matching_minutes, matching_hours
+            )
         )
 
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
-
     @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
-
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
+    def pattern_time_change_listener(now: datetime) -> None:
+        """Fire the action and schedule the next matching time."""
+        nonlocal cancel_callback
+
+        cancel_callback = scheduler.async_schedule(
+            pattern_time_change_job,
+            calculate_next(now + timedelta(seconds=1)),
+            calculate_next,
+        )
+        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
 
-        last_now = now
+    pattern_time_change_job = HassJob(pattern_time_change_listener)
+    # Passing calculate_next makes sure rolling back the clock doesn't
+    # prevent the timer from triggering.
+    cancel_callback = scheduler.async_schedule(
+        pattern_time_change_job, calculate_next(dt_util.utcnow()), calculate_next
+    )
 
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
+    @callback
+    def unsub_pattern_time_change_listener() -> None:
+        """Cancel the time listener."""
+        assert cancel_callback is not None
+        cancel_callback()
 
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+    return unsub_pattern_time_change_listener
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
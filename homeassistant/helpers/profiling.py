@@ -0,0 +1,297 @@
+"""Profile the listeners of the event bus."""
+import asyncio
+from collections import deque
+import functools
+import math
+from time import monotonic, perf_counter
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from homeassistant.core import HassJob, HassJobType, HomeAssistant, callback
+from homeassistant.loader import bind_hass
+
+DATA_PROFILER = "bus_profiler"
+
+# Number of most recent samples kept to compute percentiles
+SAMPLE_SIZE = 1000
+PERCENTILES = (50, 90, 99)
+
+# Seconds between two measurements of the event loop lag
+LAG_INTERVAL = 1.0
+
+
+def _percentile(values: List[float], percentile: int) -> float:
+    """Return a percentile of sorted values using the nearest rank."""
+    return values[max(0, math.ceil(len(values) * percentile / 100) - 1)]
+
+
+def _job_name(job: HassJob) -> str:
+    """Return a name identifying the target of a job."""
+    target = job.target
+    while isinstance(target, functools.partial):
+        target = target.func
+
+    name = getattr(target, "__qualname__", None)
+    if name is None:
+        return repr(target)
+
+    return f"{target.__module__}.{name}"
+
+
+class SampleStats:
+    """Count, total, maximum and percentiles of measured values."""
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    @callback
+    def async_add(self, value: float) -> None:
+        """Add a measured value."""
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self._samples.append(value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the stats as a dictionary."""
+        samples = sorted(self._samples)
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+        for percentile in PERCENTILES:
+            result[f"p{percentile}"] = (
+                _percentile(samples, percentile) if samples else None
+            )
+        return result
+
+
+class BusProfiler:
+    """Measure how often events are fired and how long their listeners take.
+
+    Listeners are measured per event type in seconds. Callbacks and executor
+    jobs are measured while they run, coroutine functions until they are
+    done, including the time they spent waiting. The lag of the event loop
+    and the number of jobs waiting for the executor are sampled every
+    LAG_INTERVAL seconds. The durations of the polls of entity platforms,
+    which are always measured, are reported as well.
+
+    The actions run by the shared listeners of the event helpers, the state
+    change trackers and the point in time scheduler, are measured as
+    listeners of state_changed and time_changed next to the shared listener
+    running them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.event_counts: Dict[str, int] = {}
+        self.listeners: Dict[Tuple[str, str], SampleStats] = {}
+        self.loop_lag = SampleStats()
+        self.executor_queue = SampleStats()
+        # Profiled jobs of the listeners by event type, dropped once a
+        # listener is removed
+        self._jobs: Dict[str, "WeakKeyDictionary[HassJob, HassJob]"] = {}
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+        self._lag_handle: Optional[asyncio.TimerHandle] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start profiling the event bus."""
+        self._started = monotonic()
+        self.hass.bus.async_set_profiler(self)
+        self._async_schedule_lag_check()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop profiling the event bus."""
+        self._stopped = monotonic()
+        self.hass.bus.async_set_profiler(None)
+        if self._lag_handle is not None:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+        self._jobs.clear()
+
+    @callback
+    def async_event_fired(self, event_type: str) -> None:
+        """Count a fired event."""
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+
+    @callback
+    def async_add_job(self, event_type: str, job: HassJob, *args: Any) -> None:
+        """Schedule a listener of an event type and measure it."""
+        self.hass.async_add_hass_job(
+            self._async_profiled_job(event_type, job), job, *args
+        )
+
+    @callback
+    def async_run_job(self, event_type: str, job: HassJob, *args: Any) -> None:
+        """Run a listener of an event type like async_run_hass_job and measure it."""
+        self.hass.async_run_hass_job(
+            self._async_profiled_job(event_type, job), job, *args
+        )
+
+    @callback
+    def _async_profiled_job(self, event_type: str, job: HassJob) -> HassJob:
+        """Return the job measuring a listener, built once per listener."""
+        jobs = self._jobs.get(event_type)
+        if jobs is None:
+            jobs = self._jobs[event_type] = WeakKeyDictionary()
+        profiled_job = jobs.get(job)
+
+        if profiled_job is None:
+            stats_key = (event_type, _job_name(job))
+            stats = self.listeners.get(stats_key)
+            if stats is None:
+                stats = self.listeners[stats_key] = SampleStats()
+            profiled_job = jobs[job] = self._wrap_job(job.job_type, stats)
+
+        return profiled_job
+
+    def _wrap_job(self, job_type: HassJobType, stats: SampleStats) -> HassJob:
+        """Return a job running the job passed as first argument, measuring it.
+
+        The job to measure is passed on every run, so that the cached profiled
+        job does not keep a removed listener alive.
+        """
+        if job_type == HassJobType.Coroutinefunction:
+
+            async def profiled_coro(job: HassJob, *args: Any) -> None:
+                """Measure a coroutine function."""
+                start = perf_counter()
+                try:
+                    await job.target(*args)
+                finally:
+                    stats.async_add(perf_counter() - start)
+
+            return HassJob(profiled_coro)
+
+        if job_type == HassJobType.Callback:
+
+            @callback
+            def profiled_callback(job: HassJob, *args: Any) -> None:
+                """Measure a callback."""
+                start = perf_counter()
+                try:
+                    job.target(*args)
+                finally:
+                    stats.async_add(perf_counter() - start)
+
+            return HassJob(profiled_callback)
+
+        loop = self.hass.loop
+
+        def profiled_executor(job: HassJob, *args: Any) -> None:
+            """Measure an executor function."""
+            start = perf_counter()
+            try:
+                job.target(*args)
+            finally:
+                loop.call_soon_threadsafe(stats.async_add, perf_counter() - start)
+
+        return HassJob(profiled_executor)
+
+    @callback
+    def _async_schedule_lag_check(self) -> None:
+        """Schedule the next measurement of the event loop lag."""
+        loop = self.hass.loop
+        self._lag_handle = loop.call_later(
+            LAG_INTERVAL, self._async_check_lag, loop.time() + LAG_INTERVAL
+        )
+
+    @callback
+    def _async_check_lag(self, expected: float) -> None:
+        """Measure how late the event loop ran a scheduled callback."""
+        self.loop_lag.async_add(max(0.0, self.hass.loop.time() - expected))
+        self.executor_queue.async_add(self._executor_queue_size())
+        self._async_schedule_lag_check()
+
+    def _executor_queue_size(self) -> int:
+        """Return the number of jobs waiting for an executor thread."""
+        # pylint: disable=protected-access
+        return self.hass.executor._work_queue.qsize()  # type: ignore
+
+    def _polling_as_dict(self) -> List[Dict[str, Any]]:
+        """Return the poll durations of the entity platforms, slowest first."""
+        # pylint: disable=import-outside-toplevel
+        from .entity_platform import DATA_ENTITY_PLATFORM
+
+        polling = [
+            {
+                "domain": platform.domain,
+                "platform": platform.platform_name,
+                **platform.poll_durations.as_dict(),
+            }
+            for platforms in self.hass.data.get(DATA_ENTITY_PLATFORM, {}).values()
+            for platform in platforms
+            if platform.poll_durations.count
+        ]
+        polling.sort(key=_listener_total, reverse=True)
+        return polling
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the measurements, the slowest listeners first."""
+        listeners = [
+            {"event_type": event_type, "listener": name, **stats.as_dict()}
+            for (event_type, name), stats in self.listeners.items()
+        ]
+        listeners.sort(key=_listener_total, reverse=True)
+        duration = 0.0
+        if self._started is not None:
+            duration = (self._stopped or monotonic()) - self._started
+
+        return {
+            "duration": duration,
+            "events": dict(self.event_counts),
+            "listeners": listeners,
+            "polling": self._polling_as_dict(),
+            "loop_lag": self.loop_lag.as_dict(),
+            "executor_queue": {
+                "current": self._executor_queue_size(),
+                **self.executor_queue.as_dict(),
+            },
+        }
+
+
+def _listener_total(listener: Dict[str, Any]) -> float:
+    """Return the total time spent in a listener or platform."""
+    return listener["total"]  # type: ignore
+
+
+@callback
+@bind_hass
+def async_start_profiler(hass: HomeAssistant) -> BusProfiler:
+    """Start profiling the event bus, or return the running profiler."""
+    profiler: Optional[BusProfiler] = hass.data.get(DATA_PROFILER)
+
+    if profiler is None:
+        profiler = hass.data[DATA_PROFILER] = BusProfiler(hass)
+        profiler.async_start()
+
+    return profiler
+
+
+@callback
+@bind_hass
+def async_get_profiler(hass: HomeAssistant) -> Optional[BusProfiler]:
+    """Return the running profiler, if any."""
+    return hass.data.get(DATA_PROFILER)
+
+
+@callback
+@bind_hass
+def async_stop_profiler(hass: HomeAssistant) -> Optional[BusProfiler]:
+    """Stop profiling the event bus and return the stopped profiler."""
+    profiler: Optional[BusProfiler] = hass.data.pop(DATA_PROFILER, None)
+
+    if profiler is not None:
+        profiler.async_stop()
+
+    return profiler
@@ -26,10 +26,19 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "core.restore_state"
 STORAGE_VERSION = 1
+# States that changed since all states were last saved
+DELTA_STORAGE_KEY = "core.restore_state.delta"
 
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
 
+# How long between saving all states instead of the changed ones, which also
+# refreshes the last seen time of the states that did not change
+COMPACT_INTERVAL = timedelta(days=1)
+
+# Save all states once the changed states are this part of all states
+COMPACT_RATIO = 0.5
+
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
@@ -88,6 +97,15 @@ class RestoreStateData:
                     }
                     _LOGGER.debug("Created cache with %s", list(data.last_states))
 
+                try:
+                    changed_states = await data.delta_store.async_load()
+                except HomeAssistantError as exc:
+                    _LOGGER.error("Error loading changed states", exc_info=exc)
+                    changed_states = None
+
+                if changed_states:
+                    data.async_apply_changed_states(changed_states)
+
                 if hass.state == CoreState.running:
                     data.async_setup_dump()
                 else:
@@ -107,10 +125,41 @@ class RestoreStateData:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
         self.store: Store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder, compact=True
+        )
+        self.delta_store: Store = Store(
+            hass, STORAGE_VERSION, DELTA_STORAGE_KEY, encoder=JSONEncoder, compact=True
         )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # The saved state of every entity, to find the ones that changed
+        self._saved_states: Dict[str, State] = {}
+        # The states that changed since all states were last saved
+        self._changed_states: Dict[str, Dict[str, Any]] = {}
+        self._last_compact: Optional[datetime] = None
+        # If the delta store holds changed states that have to be cleared
+        self._delta_saved = False
+        self._dump_lock = asyncio.Lock()
+
+    @callback
+    def async_apply_changed_states(self, changed_states: List[Dict]) -> None:
+        """Update the last states with the changed states that were saved.
+
+        Changed states older than the last save of all states are left
+        over from an interrupted save and are ignored.
+        """
+        for item in changed_states:
+            if not valid_entity_id(item["state"]["entity_id"]):
+                continue
+
+            stored_state = StoredState.from_dict(item)
+            current = self.last_states.get(stored_state.state.entity_id)
+
+            if current is None or stored_state.last_seen >= current.last_seen:
+                self.last_states[stored_state.state.entity_id] = stored_state
+
+        # Clear them from the delta store when all states are saved
+        self._delta_saved = True
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -155,17 +204,68 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        """Save the current state machine to storage.
+
+        Only the states that changed since the last dump are saved, in the
+        delta store. All states are saved again on the first dump, once a
+        day, when a state is no longer stored or when the changed states
+        grow too large.
+        """
+        async with self._dump_lock:
+            now = dt_util.utcnow()
+            stored_states = self.async_get_stored_states()
+            saved_states = self._saved_states
+            self._saved_states = {}
+            changed = False
+
+            for stored_state in stored_states:
+                entity_id = stored_state.state.entity_id
+                self._saved_states[entity_id] = stored_state.state
+
+                if saved_states.get(entity_id) is not stored_state.state:
+                    self._changed_states[entity_id] = stored_state.as_dict()
+                    changed = True
+
+            if (
+                self._last_compact is None
+                or now - self._last_compact >= COMPACT_INTERVAL
+                or not saved_states.keys() <= self._saved_states.keys()
+                or len(self._changed_states) > len(stored_states) * COMPACT_RATIO
+            ):
+                await self._async_save_all_states(stored_states, now)
+                return
+
+            if not changed:
+                _LOGGER.debug("No changed states to dump")
+                return
+
+            _LOGGER.debug("Dumping %s changed states", len(self._changed_states))
+            try:
+                await self.delta_store.async_save(list(self._changed_states.values()))
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving changed states", exc_info=exc)
+                return
+
+            self._delta_saved = True
+
+    async def _async_save_all_states(
+        self, stored_states: List[StoredState], now: datetime
+    ) -> None:
+        """Save all states and clear the changed states."""
         _LOGGER.debug("Dumping states")
         try:
             await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+                [stored_state.as_dict() for stored_state in stored_states]
             )
+            if self._delta_saved:
+                await self.delta_store.async_save([])
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return
+
+        self._last_compact = now
+        self._changed_states = {}
+        self._delta_saved = False
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -338,7 +338,9 @@ def async_set_service_schema(
 async def entity_service_call(hass, platforms, func, call, required_features=None):
     """Handle an entity service call.
 
-    Calls all platforms simultaneously.
+    The entities to target are looked up in platforms, either a dictionary
+    of the registered entities by entity_id or an iterable of entity
+    platforms. Calls all entities simultaneously.
     """
     if call.context.user_id:
         user = await hass.auth.async_get_user(call.context.user_id)
@@ -348,11 +350,14 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     else:
         entity_perms = None
 
-    target_all_entities = call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL
-
-    if not target_all_entities:
-        # A set of entities we're trying to target.
-        entity_ids = await async_extract_entity_ids(hass, call, True)
+    if isinstance(platforms, dict):
+        registered_entities = platforms
+    else:
+        registered_entities = {
+            entity.entity_id: entity
+            for platform in platforms
+            for entity in platform.entities.values()
+        }
 
     # If the service function is a string, we'll pass it the service call data
     if isinstance(func, str):
@@ -365,62 +370,44 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     else:
         data = call
 
-    # Check the permissions
-
     # A list with entities to call the service on.
     entity_candidates = []
 
-    if entity_perms is None:
-        for platform in platforms:
-            if target_all_entities:
-                entity_candidates.extend(platform.entities.values())
-            else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
-
-    elif target_all_entities:
+    if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
         # If we target all entities, we will select all entities the user
         # is allowed to control.
-        for platform in platforms:
-            entity_candidates.extend(
-                [
-                    entity
-                    for entity in platform.entities.values()
-                    if entity_perms(entity.entity_id, POLICY_CONTROL)
-                ]
-            )
+        if entity_perms is None:
+            entity_candidates = list(registered_entities.values())
+        else:
+            entity_candidates = [
+                entity
+                for entity_id, entity in registered_entities.items()
+                if entity_perms(entity_id, POLICY_CONTROL)
+            ]
 
     else:
-        for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
+        # Look up the targeted entities directly instead of walking all of them
+        missing = []
 
-                if entity.entity_id not in entity_ids:
-                    continue
-
-                if not entity_perms(entity.entity_id, POLICY_CONTROL):
-                    raise Unauthorized(
-                        context=call.context,
-                        entity_id=entity.entity_id,
-                        permission=POLICY_CONTROL,
-                    )
+        for entity_id in await async_extract_entity_ids(hass, call, True):
+            entity = registered_entities.get(entity_id)
 
-                platform_entities.append(entity)
+            if entity is None:
+                missing.append(entity_id)
+                continue
 
-            entity_candidates.extend(platform_entities)
+            if entity_perms is not None and not entity_perms(entity_id, POLICY_CONTROL):
+                raise Unauthorized(
+                    context=call.context,
+                    entity_id=entity_id,
+                    permission=POLICY_CONTROL,
+                )
 
-    if not target_all_entities:
-        for entity in entity_candidates:
-            entity_ids.remove(entity.entity_id)
+            entity_candidates.append(entity)
 
-        if entity_ids:
+        if missing:
             _LOGGER.warning(
-                "Unable to find referenced entities %s", ", ".join(sorted(entity_ids))
+                "Unable to find referenced entities %s", ", ".join(sorted(missing))
             )
 
     entities = []
@@ -0,0 +1,155 @@
+"""Record where the time goes while integrations are set up at startup."""
+import asyncio
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.loader import bind_hass
+
+DATA_STARTUP_TIMELINE = "startup_timeline"
+
+# Seconds between two measurements of the event loop lag
+LAG_INTERVAL = 0.1
+
+PHASE_DEPENDENCIES = "dependencies"
+PHASE_REQUIREMENTS = "requirements"
+PHASE_IMPORT = "import"
+PHASE_CONFIG = "config"
+PHASE_SETUP = "setup"
+PHASE_ENTRIES = "entries"
+PHASE_PLATFORMS = "platforms"
+
+
+class StartupTimeline:
+    """Timeline of the phases of setting up integrations.
+
+    The phases of each integration are recorded with their start relative
+    to the start of the timeline and their duration. Phases that happen
+    more than once, like setting up the platforms of an integration, add up.
+    The lag of the event loop is sampled every LAG_INTERVAL seconds, the
+    lag sampled during a phase is reported as the time the event loop was
+    blocked during that phase.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timeline."""
+        self.hass = hass
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+        self._phases: List[Tuple[str, str, float, float]] = []
+        self._lag_times: List[float] = []
+        self._lag_totals: List[float] = [0.0]
+        self._lag_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def running(self) -> bool:
+        """Return if the timeline is being recorded."""
+        return self._started is not None and self._stopped is None
+
+    @callback
+    def async_start(self) -> None:
+        """Start recording the timeline."""
+        self._started = self.hass.loop.time()
+        self._async_schedule_lag_check()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop recording the timeline."""
+        self._stopped = self.hass.loop.time()
+        if self._lag_handle is not None:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+
+    @callback
+    def async_add_phase(self, domain: str, phase: str, start: float) -> None:
+        """Add a phase of an integration that started at a loop time."""
+        self._phases.append((domain, phase, start, self.hass.loop.time()))
+
+    @callback
+    def _async_schedule_lag_check(self) -> None:
+        """Schedule the next measurement of the event loop lag."""
+        loop = self.hass.loop
+        self._lag_handle = loop.call_later(
+            LAG_INTERVAL, self._async_check_lag, loop.time() + LAG_INTERVAL
+        )
+
+    @callback
+    def _async_check_lag(self, expected: float) -> None:
+        """Measure how late the event loop ran a scheduled callback."""
+        now = self.hass.loop.time()
+        self._lag_times.append(now)
+        self._lag_totals.append(self._lag_totals[-1] + max(0.0, now - expected))
+        self._async_schedule_lag_check()
+
+    def _loop_blocked(self, start: float, end: float) -> float:
+        """Return the lag of the event loop measured between two loop times."""
+        first = bisect_left(self._lag_times, start)
+        last = bisect_right(self._lag_times, end)
+        return self._lag_totals[last] - self._lag_totals[first]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the timeline, the integrations in the order they started."""
+        started = self._started or 0.0
+        integrations: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+        for domain, phase, start, end in self._phases:
+            phases = integrations.setdefault(domain, {})
+            stats = phases.get(phase)
+            if stats is None:
+                stats = phases[phase] = {
+                    "start": start - started,
+                    "duration": 0.0,
+                    "loop_blocked": 0.0,
+                }
+            stats["duration"] += end - start
+            stats["loop_blocked"] += self._loop_blocked(start, end)
+
+        timeline = [
+            {"domain": domain, "phases": phases}
+            for domain, phases in integrations.items()
+        ]
+        timeline.sort(key=_integration_start)
+
+        return {
+            "duration": (self._stopped or self.hass.loop.time()) - started,
+            "loop_blocked": self._lag_totals[-1],
+            "integrations": timeline,
+        }
+
+
+def _integration_start(integration: Dict[str, Any]) -> float:
+    """Return when the first phase of an integration started."""
+    return min(stats["start"] for stats in integration["phases"].values())
+
+
+@callback
+@bind_hass
+def async_start_timeline(hass: HomeAssistant) -> StartupTimeline:
+    """Start recording the startup timeline."""
+    timeline = hass.data[DATA_STARTUP_TIMELINE] = StartupTimeline(hass)
+    timeline.async_start()
+    return timeline
+
+
+@callback
+@bind_hass
+def async_get_timeline(hass: HomeAssistant) -> Optional[StartupTimeline]:
+    """Return the startup timeline, if it was recorded."""
+    return hass.data.get(DATA_STARTUP_TIMELINE)
+
+
+@contextmanager
+def async_record_phase(hass: HomeAssistant, domain: str, phase: str) -> Iterator[None]:
+    """Record a phase of setting up an integration while startup is recorded."""
+    timeline: Optional[StartupTimeline] = hass.data.get(DATA_STARTUP_TIMELINE)
+
+    if timeline is None or not timeline.running:
+        yield
+        return
+
+    start = hass.loop.time()
+    try:
+        yield
+    finally:
+        timeline.async_add_phase(domain, phase, start)
@@ -3,10 +3,16 @@ import asyncio
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
-from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    CoreState,
+    Event,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
@@ -15,6 +21,10 @@ from homeassistant.util import json as json_util
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+DATA_STORAGE_WRITER = "storage_writer"
+# Seconds a delayed save waits for the saves of other stores, so they are
+# written together
+WRITE_COALESCE_DELAY = 0.3
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -55,6 +65,103 @@ async def async_migrator(
     return config
 
 
+class _StorageWriter:
+    """Write the data of stores together in a single executor job.
+
+    Delayed saves are flushed WRITE_COALESCE_DELAY seconds after the first
+    one, so the delayed saves of the registries during startup are written
+    together instead of each taking an executor thread. Other writes, and
+    all writes once Home Assistant is stopping, are flushed in the next
+    iteration of the event loop together with the pending delayed saves.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self._pending: List[Tuple["Store", Dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    async def async_write(
+        self, store: "Store", data: Dict, delayed: bool = False
+    ) -> None:
+        """Write the data of a store with the next flush."""
+        future = self.hass.loop.create_future()
+        self._pending.append((store, data, future))
+        if delayed and not self.hass.is_stopping:
+            self._async_schedule_flush(WRITE_COALESCE_DELAY)
+        else:
+            self._async_schedule_flush(0)
+        await future
+
+    @callback
+    def _async_final_write(self, _event: Event) -> None:
+        """Flush the pending delayed saves without waiting."""
+        if self._pending:
+            self._async_schedule_flush(0)
+
+    @callback
+    def _async_schedule_flush(self, delay: float) -> None:
+        """Flush the pending writes after a delay, unless flushed earlier."""
+        when = self.hass.loop.time() + delay
+        if self._flush_handle is not None:
+            if self._flush_handle.when() <= when:
+                return
+            self._flush_handle.cancel()
+        self._flush_handle = self.hass.loop.call_at(when, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write the pending data in the executor."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        self.hass.async_create_task(self._async_write_pending(pending))
+
+    async def _async_write_pending(
+        self, pending: List[Tuple["Store", Dict, asyncio.Future]]
+    ) -> None:
+        """Write the pending data and resolve the writes."""
+        errors = await self.hass.async_add_executor_job(_write_pending, pending)
+
+        for (_, _, future), err in zip(pending, errors):
+            if future.done():
+                continue
+            if err is None:
+                future.set_result(None)
+            else:
+                future.set_exception(err)
+
+
+def _write_pending(
+    pending: List[Tuple["Store", Dict, asyncio.Future]]
+) -> List[Optional[Exception]]:
+    """Write the data of stores, returning the error of each write."""
+    errors: List[Optional[Exception]] = []
+
+    for store, data, _ in pending:
+        try:
+            store._write_data(store.path, data)  # pylint: disable=protected-access
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(err)
+        else:
+            errors.append(None)
+
+    return errors
+
+
+@callback
+def _async_get_writer(hass: HomeAssistant) -> _StorageWriter:
+    """Return the writer shared by the stores."""
+    writer: Optional[_StorageWriter] = hass.data.get(DATA_STORAGE_WRITER)
+
+    if writer is None:
+        writer = hass.data[DATA_STORAGE_WRITER] = _StorageWriter(hass)
+
+    return writer
+
+
 @bind_hass
 class Store:
     """Class to help storing data."""
@@ -67,8 +174,13 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        Compact stores are written without indentation, which is several
+        times faster for large data that is not meant to be edited by hand.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -79,6 +191,8 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
+        self._last_written: Optional[str] = None
 
     @property
     def path(self):
@@ -190,7 +304,7 @@ class Store:
             return
         self._unsub_delay_listener = None
         self._async_cleanup_final_write_listener()
-        await self._async_handle_write_data()
+        await self._async_handle_write_data(delayed=True)
 
     async def _async_callback_final_write(self, _event):
         """Handle a write because Home Assistant is in final write state."""
@@ -198,7 +312,7 @@ class Store:
         self._async_cleanup_delay_listener()
         await self._async_handle_write_data()
 
-    async def _async_handle_write_data(self, *_args):
+    async def _async_handle_write_data(self, *_args, delayed=False):
         """Handle writing the config."""
 
         async with self._write_lock:
@@ -214,19 +328,25 @@ class Store:
             self._data = None
 
             try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
-                )
+                await _async_get_writer(self.hass).async_write(self, data, delayed)
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     def _write_data(self, path: str, data: Dict) -> None:
-        """Write the data."""
+        """Write the data, unless it did not change since the last write."""
+        json_data = json_util.serialize_json(
+            path, data, encoder=self._encoder, compact=self._compact
+        )
+        if json_data == self._last_written:
+            _LOGGER.debug("Data for %s did not change, not writing", self.key)
+            return
+
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.write_json(path, json_data, self._private)
+        self._last_written = json_data
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -234,6 +354,7 @@ class Store:
 
     async def async_remove(self):
         """Remove all data."""
+        self._last_written = None
         try:
             await self.hass.async_add_executor_job(os.unlink, self.path)
         except FileNotFoundError:
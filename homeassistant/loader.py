@@ -11,12 +11,14 @@ import json
 import logging
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -36,6 +38,8 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_IMPORT_TIMES = "integration_import_times"
+DATA_COMPONENT_DEPENDENCIES = "component_dependencies"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -272,69 +276,187 @@ class Integration:
             )
         return cache[full_name]  # type: ignore
 
+    async def async_get_component(self) -> ModuleType:
+        """Return the component, importing it in the executor."""
+        await self.async_import_modules()
+        return self.get_component()
+
+    async def async_get_platform(self, platform_name: str) -> ModuleType:
+        """Return a platform for an integration, importing it in the executor."""
+        await self.async_import_modules([platform_name], component=False)
+        return self.get_platform(platform_name)
+
+    async def async_import_modules(
+        self, platform_names: Iterable[str] = (), *, component: bool = True
+    ) -> None:
+        """Import the component and platforms in the executor.
+
+        Keeps the event loop running while an integration and its requirements
+        are imported. Modules that fail to import are imported again by
+        get_component and get_platform, which raise the error.
+        """
+        cache = self.hass.data.get(DATA_COMPONENTS, {})
+        names = [
+            f"{self.pkg_path}.{platform_name}"
+            for platform_name in platform_names
+            if f"{self.domain}.{platform_name}" not in cache
+        ]
+        if component and self.domain not in cache:
+            names.insert(0, self.pkg_path)
+
+        names = [name for name in names if name not in sys.modules]
+        if not names:
+            return
+
+        duration = await self.hass.async_add_executor_job(_import_modules, names)
+        import_times = self.hass.data.setdefault(DATA_IMPORT_TIMES, {})
+        import_times[self.domain] = import_times.get(self.domain, 0) + duration
+
     def __repr__(self) -> str:
         """Text representation of class."""
         return f"<Integration {self.domain}: {self.pkg_path}>"
 
 
+def _import_modules(names: List[str]) -> float:
+    """Import modules, returning how long it took."""
+    start = timer()
+
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    return timer() - start
+
+
 async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integration:
     """Get an integration."""
     cache = hass.data.get(DATA_INTEGRATIONS)
+    if cache is not None:
+        int_or_evt = cache.get(domain, _UNDEF)
+        if isinstance(int_or_evt, Integration):
+            return int_or_evt
+
+    int_or_exc = (await async_get_integrations(hass, [domain]))[domain]
+    if isinstance(int_or_exc, Exception):
+        raise int_or_exc
+
+    return int_or_exc
+
+
+async def async_get_integrations(
+    hass: "HomeAssistant", domains: Iterable[str]
+) -> Dict[str, Union[Integration, Exception]]:
+    """Get integrations, or the errors resolving them.
+
+    The integrations that are not cached yet are resolved from their
+    manifests in a single executor job.
+    """
+    cache = hass.data.get(DATA_INTEGRATIONS)
     if cache is None:
         if not _async_mount_config_dir(hass):
-            raise IntegrationNotFound(domain)
+            return {domain: IntegrationNotFound(domain) for domain in domains}
         cache = hass.data[DATA_INTEGRATIONS] = {}
 
-    int_or_evt: Union[Integration, asyncio.Event, None] = cache.get(domain, _UNDEF)
+    results: Dict[str, Union[Integration, Exception]] = {}
+    in_progress: Dict[str, asyncio.Event] = {}
+    needed: Dict[str, asyncio.Event] = {}
 
-    if isinstance(int_or_evt, asyncio.Event):
-        await int_or_evt.wait()
+    for domain in domains:
+        int_or_evt = cache.get(domain, _UNDEF)
+
+        if isinstance(int_or_evt, asyncio.Event):
+            in_progress[domain] = int_or_evt
+        elif int_or_evt is not _UNDEF:
+            results[domain] = cast(Integration, int_or_evt)
+        elif domain not in needed:
+            needed[domain] = cache[domain] = asyncio.Event()
+
+    if needed:
+        try:
+            await _async_resolve_integrations(hass, list(needed), cache)
+        finally:
+            for domain, event in needed.items():
+                int_or_evt = cache.get(domain, _UNDEF)
+
+                # We don't cache that it doesn't exist, or else people can't
+                # fix it and then restart, because their config will never be
+                # valid.
+                if int_or_evt is event:
+                    cache.pop(domain)
+                    int_or_evt = _UNDEF
+
+                results[domain] = (
+                    IntegrationNotFound(domain)
+                    if int_or_evt is _UNDEF
+                    else cast(Integration, int_or_evt)
+                )
+                event.set()
+
+    for domain, event in in_progress.items():
+        await event.wait()
         int_or_evt = cache.get(domain, _UNDEF)
 
         # When we have waited and it's _UNDEF, it doesn't exist
-        # We don't cache that it doesn't exist, or else people can't fix it
-        # and then restart, because their config will never be valid.
-        if int_or_evt is _UNDEF:
-            raise IntegrationNotFound(domain)
+        results[domain] = (
+            IntegrationNotFound(domain)
+            if int_or_evt is _UNDEF
+            else cast(Integration, int_or_evt)
+        )
 
-    if int_or_evt is not _UNDEF:
-        return cast(Integration, int_or_evt)
+    return results
 
-    event = cache[domain] = asyncio.Event()
 
+async def _async_resolve_integrations(
+    hass: "HomeAssistant", domains: List[str], cache: Dict[str, Any]
+) -> None:
+    """Resolve integrations and store them in the cache."""
     # Instead of using resolve_from_root we use the cache of custom
     # components to find the integration.
-    integration = (await async_get_custom_components(hass)).get(domain)
-    if integration is not None:
+    custom = await async_get_custom_components(hass)
+    to_resolve = []
+
+    for domain in domains:
+        integration = custom.get(domain)
+        if integration is None:
+            to_resolve.append(domain)
+            continue
+
         _LOGGER.warning(CUSTOM_WARNING, domain)
         cache[domain] = integration
-        event.set()
-        return integration
+
+    if not to_resolve:
+        return
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
-    integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+    resolved = await hass.async_add_executor_job(
+        _resolve_integrations_from_root, hass, components, to_resolve
     )
 
-    if integration is not None:
-        cache[domain] = integration
-        event.set()
-        return integration
+    for domain in to_resolve:
+        integration = resolved.get(domain)
+
+        if integration is None:
+            integration = Integration.resolve_legacy(hass, domain)
+
+        if integration is not None:
+            cache[domain] = integration
 
-    integration = Integration.resolve_legacy(hass, domain)
-    if integration is not None:
-        cache[domain] = integration
-    else:
-        # Remove event from cache.
-        cache.pop(domain)
 
-    event.set()
+def _resolve_integrations_from_root(
+    hass: "HomeAssistant", root_module: ModuleType, domains: List[str]
+) -> Dict[str, Integration]:
+    """Resolve multiple integrations from a root module."""
+    resolved = {}
 
-    if not integration:
-        raise IntegrationNotFound(domain)
+    for domain in domains:
+        integration = Integration.resolve_from_root(hass, root_module, domain)
+        if integration is not None:
+            resolved[domain] = integration
 
-    return integration
+    return resolved
 
 
 class LoaderError(Exception):
@@ -493,7 +615,15 @@ async def async_component_dependencies(hass: "HomeAssistant", domain: str) -> Se
 
     Raises CircularDependency if a circular dependency is found.
     """
-    return await _async_component_dependencies(hass, domain, set(), set())
+    cache = hass.data.setdefault(DATA_COMPONENT_DEPENDENCIES, {})
+    dependencies = cache.get(domain)
+
+    if dependencies is None:
+        dependencies = cache[domain] = await _async_component_dependencies(
+            hass, domain, set(), set()
+        )
+
+    return set(dependencies)
 
 
 async def _async_component_dependencies(
@@ -504,6 +634,7 @@ async def _async_component_dependencies(
     Async friendly.
     """
     integration = await async_get_integration(hass, domain)
+    cache = hass.data[DATA_COMPONENT_DEPENDENCIES]
 
     loading.add(domain)
 
@@ -512,6 +643,11 @@ async def _async_component_dependencies(
         if dependency_domain in loaded:
             continue
 
+        # Resolved dependencies have no circular dependencies
+        if dependency_domain in cache:
+            loaded.update(cache[dependency_domain])
+            continue
+
         # If we are already loading it, we have a circular dependency.
         if dependency_domain in loading:
             raise CircularDependency(domain, dependency_domain)
@@ -120,6 +120,10 @@ async def async_process_requirements(
     kwargs = pip_kwargs(hass.config.config_dir)
 
     async with pip_lock:
+        # Scan the installed packages in the executor if they changed, checking
+        # the requirements is then a lookup.
+        await hass.async_add_executor_job(pkg_util.installed_versions)
+
         for req in requirements:
             if pkg_util.is_installed(req):
                 continue
@@ -135,10 +139,15 @@ def _install(hass: HomeAssistant, req: str, kwargs: Dict) -> bool:
     progress_path = Path(hass.config.path(PROGRESS_FILE))
     progress_path.touch()
     try:
-        return pkg_util.install_package(req, **kwargs)
+        if not pkg_util.install_package(req, **kwargs):
+            return False
     finally:
         progress_path.unlink()
 
+    # Scan again for the next requirements, they may have been installed too
+    pkg_util.installed_versions()
+    return True
+
 
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
@@ -10,6 +10,7 @@ from typing import Callable, Dict, TypeVar
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers import profiling
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -28,6 +29,11 @@ def run(args):
     parser = argparse.ArgumentParser(description=("Run a Home Assistant benchmark."))
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the fired events and the slowest listeners of each run",
+    )
 
     args = parser.parse_args()
 
@@ -40,12 +46,45 @@ def run(args):
             loop = asyncio.new_event_loop()
             hass = core.HomeAssistant(loop)
             hass.async_stop_track_tasks()
+            if args.profile:
+                profiler = profiling.async_start_profiler(hass)
             runtime = loop.run_until_complete(bench(hass))
             print(f"Benchmark {bench.__name__} done in {runtime}s")
+            if args.profile:
+                profiling.async_stop_profiler(hass)
+                print_profile(profiler.as_dict())
             loop.run_until_complete(hass.async_stop())
             loop.close()
 
 
+def print_profile(profile: dict, limit: int = 10) -> None:
+    """Print the measurements of the event bus profiler."""
+    for event_type, count in sorted(profile["events"].items()):
+        print(f"  Event {event_type} fired {count} times")
+
+    # Listeners still running when profiling stopped were not measured yet
+    listeners = [listener for listener in profile["listeners"] if listener["count"]]
+    for listener in listeners[:limit]:
+        print(
+            f"  Listener {listener['listener']} of {listener['event_type']}: "
+            f"{listener['count']} calls in {listener['total']:.3f}s, "
+            f"p50 {listener['p50'] * 1000:.3f}ms, "
+            f"p99 {listener['p99'] * 1000:.3f}ms, "
+            f"max {listener['max'] * 1000:.3f}ms"
+        )
+
+    for platform in profile["polling"][:limit]:
+        print(
+            f"  Polling {platform['platform']} {platform['domain']}: "
+            f"{platform['count']} polls in {platform['total']:.3f}s, "
+            f"max {platform['max'] * 1000:.3f}ms"
+        )
+
+    lag = profile["loop_lag"]
+    if lag["count"]:
+        print(f"  Event loop lag max {lag['max'] * 1000:.3f}ms")
+
+
 def benchmark(func: CALLABLE_T) -> CALLABLE_T:
     """Decorate to mark a benchmark."""
     BENCHMARKS[func.__name__] = func
@@ -208,3 +247,53 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def mqtt_resubscribe(hass):
+    """Re-subscribe to ten thousand MQTT topics after reconnecting."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.components import mqtt
+
+    topic_count = 10 ** 4
+    subscribed = 0
+    event = asyncio.Event()
+
+    def subscribe(topic, qos=0):
+        """Count the topics of a SUBSCRIBE packet."""
+        nonlocal subscribed
+        subscribed += len(topic) if isinstance(topic, list) else 1
+
+        if subscribed == topic_count:
+            hass.loop.call_soon_threadsafe(event.set)
+
+        return 0, 0
+
+    client = mqtt.MQTT(
+        hass,
+        broker="localhost",
+        port=1883,
+        client_id=None,
+        keepalive=60,
+        username=None,
+        password=None,
+        certificate=None,
+        client_key=None,
+        client_cert=None,
+        tls_insecure=None,
+        protocol=None,
+        will_message=None,
+        birth_message=None,
+        tls_version=None,
+    )
+    client._mqttc.subscribe = subscribe
+
+    for idx in range(topic_count):
+        await client.async_subscribe(f"benchmark/{idx}/state", None, 0)
+
+    start = timer()
+
+    client._mqtt_on_connect(None, None, None, 0)
+    await event.wait()
+
+    return timer() - start
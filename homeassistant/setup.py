@@ -9,6 +9,15 @@ from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.startup_timeline import (
+    PHASE_CONFIG,
+    PHASE_DEPENDENCIES,
+    PHASE_ENTRIES,
+    PHASE_IMPORT,
+    PHASE_REQUIREMENTS,
+    PHASE_SETUP,
+    async_record_phase,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -128,7 +137,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with async_record_phase(hass, domain, PHASE_IMPORT):
+            component = await integration.async_get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -136,9 +146,10 @@ async def _async_setup_component(
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with async_record_phase(hass, domain, PHASE_CONFIG):
+        processed_config = await conf_util.async_process_component_config(
+            hass, config, integration
+        )
 
     if processed_config is None:
         log_error("Invalid config.", integration.documentation)
@@ -176,7 +187,8 @@ async def _async_setup_component(
             hass.data[DATA_SETUP_STARTED].pop(domain)
             return False
 
-        result = await asyncio.wait_for(task, SLOW_SETUP_MAX_WAIT)
+        with async_record_phase(hass, domain, PHASE_SETUP):
+            result = await asyncio.wait_for(task, SLOW_SETUP_MAX_WAIT)
     except asyncio.TimeoutError:
         _LOGGER.error(
             "Setup of %s is taking longer than %s seconds."
@@ -213,12 +225,13 @@ async def _async_setup_component(
     await asyncio.sleep(0)
     await hass.config_entries.flow.async_wait_init_flow_finish(domain)
 
-    await asyncio.gather(
-        *[
-            entry.async_setup(hass, integration=integration)
-            for entry in hass.config_entries.async_entries(domain)
-        ]
-    )
+    with async_record_phase(hass, domain, PHASE_ENTRIES):
+        await asyncio.gather(
+            *[
+                entry.async_setup(hass, integration=integration)
+                for entry in hass.config_entries.async_entries(domain)
+            ]
+        )
 
     hass.config.components.add(domain)
     hass.data[DATA_SETUP_STARTED].pop(domain)
@@ -261,7 +274,8 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        with async_record_phase(hass, integration.domain, PHASE_IMPORT):
+            platform = await integration.async_get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -274,7 +288,8 @@ async def async_prepare_setup_platform(
     # If the integration is not set up yet, and can be set up, set it up.
     if integration.domain not in hass.config.components:
         try:
-            component = integration.get_component()
+            with async_record_phase(hass, integration.domain, PHASE_IMPORT):
+                component = await integration.async_get_component()
         except ImportError as exc:
             log_error(f"Unable to import the component ({exc}).")
             return None
@@ -301,15 +316,19 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if integration.dependencies and not await _async_process_dependencies(
-        hass, config, integration.domain, integration.dependencies
-    ):
-        raise HomeAssistantError("Could not set up all dependencies.")
+    if integration.dependencies:
+        with async_record_phase(hass, integration.domain, PHASE_DEPENDENCIES):
+            dependencies_set_up = await _async_process_dependencies(
+                hass, config, integration.domain, integration.dependencies
+            )
+        if not dependencies_set_up:
+            raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        await requirements.async_get_integration_with_requirements(
-            hass, integration.domain
-        )
+        with async_record_phase(hass, integration.domain, PHASE_REQUIREMENTS):
+            await requirements.async_get_integration_with_requirements(
+                hass, integration.domain
+            )
 
     processed.add(integration.domain)
 
@@ -53,13 +53,32 @@ def save_json(
 
     Returns True on success.
     """
+    write_json(filename, serialize_json(filename, data, encoder=encoder), private)
+
+
+def serialize_json(
+    filename: str,
+    data: Union[List, Dict],
+    *,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+    compact: bool = False,
+) -> str:
+    """Serialize data to save it as JSON to a file.
+
+    Compact JSON is not indented, which is serialized several times faster.
+    """
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        if compact:
+            return json.dumps(data, sort_keys=True, separators=(",", ":"), cls=encoder)
+        return json.dumps(data, sort_keys=True, indent=4, cls=encoder)
     except TypeError:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
         raise SerializationError(msg)
 
+
+def write_json(filename: str, json_data: str, private: bool = False) -> None:
+    """Write serialized JSON data to a file, replacing it atomically."""
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
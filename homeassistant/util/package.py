@@ -3,26 +3,30 @@ import asyncio
 import logging
 import os
 from pathlib import Path
+import re
 from subprocess import PIPE, Popen
 import sys
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import pkg_resources
 
 if sys.version_info[:2] >= (3, 8):
     from importlib.metadata import (  # pylint: disable=no-name-in-module,import-error
-        PackageNotFoundError,
-        version,
+        distributions,
     )
 else:
-    from importlib_metadata import (  # pylint: disable=import-error
-        PackageNotFoundError,
-        version,
-    )
+    from importlib_metadata import distributions  # pylint: disable=import-error
 
 _LOGGER = logging.getLogger(__name__)
 
+# Versions of the installed distributions and the modification times of the
+# directories of sys.path they were found in
+_INSTALLED: Optional[Tuple[Tuple, Dict[str, str]]] = None
+
+# Requirement pinned to a version, like most requirements of integrations
+_PINNED_REQUIREMENT = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)==([A-Za-z0-9.!+_-]+)$")
+
 
 def is_virtual_env() -> bool:
     """Return if we run in a virtual environment."""
@@ -37,12 +41,69 @@ def is_docker_env() -> bool:
     return Path("/.dockerenv").exists()
 
 
+def _canonical_name(name: str) -> str:
+    """Return the name of a distribution as pip compares them."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _sys_path_mtimes() -> Tuple:
+    """Return the modification times of the directories of sys.path."""
+    mtimes = []
+    for path in sys.path:
+        try:
+            mtimes.append((path, os.stat(path or ".").st_mtime_ns))
+        except OSError:
+            mtimes.append((path, None))
+    return tuple(mtimes)
+
+
+def installed_versions() -> Dict[str, str]:
+    """Return the versions of the installed distributions by canonical name.
+
+    The distributions are scanned once and scanned again when a directory of
+    sys.path changed, like when a package was installed or removed.
+    """
+    global _INSTALLED  # pylint: disable=global-statement
+
+    mtimes = _sys_path_mtimes()
+
+    if _INSTALLED is None or _INSTALLED[0] != mtimes:
+        versions: Dict[str, str] = {}
+        for dist in distributions():
+            name = dist.metadata["Name"]
+            # The first distribution on sys.path is the one that is imported
+            if name and _canonical_name(name) not in versions:
+                versions[_canonical_name(name)] = dist.version
+        _INSTALLED = (mtimes, versions)
+
+    return _INSTALLED[1]
+
+
+def _scanned_versions() -> Dict[str, str]:
+    """Return the versions found by the last scan of the distributions."""
+    if _INSTALLED is None:
+        return installed_versions()
+
+    return _INSTALLED[1]
+
+
 def is_installed(package: str) -> bool:
     """Check if a package is installed and will be loaded when we import it.
 
+    The distributions found by the last call of installed_versions are used,
+    without checking sys.path for changes.
+
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
+    # Parsing requirements is slow, a pinned version that is installed is
+    # found by comparing the version.
+    match = _PINNED_REQUIREMENT.match(package)
+    if match is not None:
+        name, pinned = match.groups()
+        if _scanned_versions().get(_canonical_name(name)) == pinned:
+            return True
+
     try:
         req = pkg_resources.Requirement.parse(package)
     except ValueError:
@@ -50,10 +111,8 @@ def is_installed(package: str) -> bool:
         # leaving it in for custom components.
         req = pkg_resources.Requirement.parse(urlparse(package).fragment)
 
-    try:
-        return version(req.project_name) in req
-    except PackageNotFoundError:
-        return False
+    installed = _scanned_versions().get(_canonical_name(req.project_name))
+    return installed is not None and installed in req
 
 
 def install_package(
@@ -990,6 +990,8 @@ def mock_integration(hass, module):
     _LOGGER.info("Adding mock integration: %s", module.DOMAIN)
     hass.data.setdefault(loader.DATA_INTEGRATIONS, {})[module.DOMAIN] = integration
     hass.data.setdefault(loader.DATA_COMPONENTS, {})[module.DOMAIN] = module
+    # Dependencies resolved before may have changed
+    hass.data.pop(loader.DATA_COMPONENT_DEPENDENCIES, None)
 
 
 def mock_entity_platform(hass, platform_path, module):
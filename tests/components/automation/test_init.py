@@ -533,6 +533,52 @@ async def test_reload_config_service(hass, calls, hass_admin_user, hass_read_onl
     assert calls[1].data.get("event") == "test_event2"
 
 
+async def test_reload_config_only_changed(hass, calls):
+    """Test reloading only rebuilds the automations whose config changed."""
+    hello = {
+        "id": "hello_id",
+        "alias": "hello",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"service": "test.automation"},
+    }
+    bye = {
+        "alias": "bye",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"service": "test.automation"},
+    }
+    assert await async_setup_component(
+        hass, automation.DOMAIN, {"automation": [hello, bye]}
+    )
+    component = hass.data[automation.DOMAIN]
+    hello_entity = component.get_entity("automation.hello")
+    bye_entity = component.get_entity("automation.bye")
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={
+            automation.DOMAIN: [
+                hello,
+                {**bye, "trigger": {"platform": "event", "event_type": "test_event3"}},
+            ]
+        },
+    ):
+        await common.async_reload(hass)
+        await hass.async_block_till_done()
+
+    assert component.get_entity("automation.hello") is hello_entity
+    assert component.get_entity("automation.bye") is not bye_entity
+    listeners = hass.bus.async_listeners()
+    assert listeners.get("test_event") == 1
+    assert listeners.get("test_event2") is None
+    assert listeners.get("test_event3") == 1
+
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event3")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
 async def test_reload_config_when_invalid_config(hass, calls):
     """Test the reload config service handling invalid config."""
     with assert_setup_component(1, automation.DOMAIN):
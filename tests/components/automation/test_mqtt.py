@@ -120,7 +120,7 @@ async def test_encoding_default(hass, calls):
     )
 
     mock_mqtt.async_subscribe.assert_called_once_with(
-        "test-topic", mock.ANY, 0, "utf-8"
+        "test-topic", mock.ANY, 0, "utf-8", wait=True
     )
 
 
@@ -139,4 +139,6 @@ async def test_encoding_custom(hass, calls):
         },
     )
 
-    mock_mqtt.async_subscribe.assert_called_once_with("test-topic", mock.ANY, 0, None)
+    mock_mqtt.async_subscribe.assert_called_once_with(
+        "test-topic", mock.ANY, 0, None, wait=True
+    )
@@ -276,7 +276,9 @@ async def test_device_support_mqtt(hass):
     with patch.dict(API_DISCOVERY_RESPONSE, api_discovery):
         await setup_axis_integration(hass)
 
-    mock_mqtt.async_subscribe.assert_called_with(f"{MAC}/#", mock.ANY, 0, "utf-8")
+    mock_mqtt.async_subscribe.assert_called_with(
+        f"{MAC}/#", mock.ANY, 0, "utf-8", wait=True
+    )
 
     topic = f"{MAC}/event/tns:onvif/Device/tns:axis/Sensor/PIR/$source/sensor/0"
     message = b'{"timestamp": 1590258472044, "topic": "onvif:Device/axis:Sensor/PIR", "message": {"source": {"sensor": "0"}, "key": {}, "data": {"state": "1"}}}'
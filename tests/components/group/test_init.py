@@ -14,6 +14,7 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.async_mock import patch
@@ -390,7 +391,14 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert self.hass.bus.listeners["state_changed"] == 1
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "hello.world",
+            "light.bowl",
+            "sensor.happy",
+            "test.one",
+            "test.two",
+        ]
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -405,7 +413,12 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert self.hass.bus.listeners["state_changed"] == 1
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "light.bowl",
+            "test.one",
+            "test.two",
+        ]
 
     def test_modify_group(self):
         """Test modifying a group."""
@@ -1,9 +1,12 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
+from functools import partial
 import json
 import unittest
 
+from sqlalchemy.exc import SQLAlchemyError
+
 from homeassistant.components import history, recorder
 from homeassistant.components.recorder.models import process_timestamp
 import homeassistant.core as ha
@@ -17,7 +20,7 @@ from tests.common import (
     init_recorder_component,
     mock_state_change_event,
 )
-from tests.components.recorder.common import wait_recording_done
+from tests.components.recorder.common import trigger_db_commit, wait_recording_done
 
 
 class TestComponentHistory(unittest.TestCase):
@@ -233,6 +236,39 @@ class TestComponentHistory(unittest.TestCase):
 
         assert states == hist
 
+    def test_get_significant_states_minimal_response_rows(self):
+        """Test minimal responses skip duplicate and hidden states."""
+        self.init_recorder()
+        zero = dt_util.utcnow()
+        for state, attributes in (
+            ("1", {"unit_of_measurement": "W"}),
+            ("1", {"unit_of_measurement": "kW"}),
+            ("2", {"hidden": True}),
+            ("3", {}),
+            # Nested attributes do not hide the entity
+            ("5", {"extra": {"hidden": True}}),
+            ("3", {}),
+            ("3", {"unit_of_measurement": "W"}),
+            ("4", {"unit_of_measurement": "W"}),
+        ):
+            self.hass.states.set("sensor.power", state, attributes)
+            wait_recording_done(self.hass)
+
+        hist = history.get_significant_states(
+            self.hass,
+            zero,
+            filters=history.Filters(),
+            include_start_time_state=False,
+            significant_changes_only=False,
+            minimal_response=True,
+        )
+
+        first, *middle, last = hist["sensor.power"]
+        assert first.state == "1"
+        assert first.attributes == {"unit_of_measurement": "W"}
+        assert [state["state"] for state in middle] == ["3", "5", "3"]
+        assert last == self.hass.states.get("sensor.power")
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -788,3 +824,124 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_period_api_with_statistics(hass, hass_client):
+    """Test the fetch period view serving rollups."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow() - timedelta(hours=1)
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.other", "5", {"unit_of_measurement": "W"})
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"statistics": "hour", "filter_entity_id": "sensor.power"},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert len(response_json) == 1
+    assert len(response_json[0]) == 1
+    rollup = response_json[0][0]
+    assert rollup["entity_id"] == "sensor.power"
+    assert rollup["period"] == "hour"
+    assert (rollup["mean"], rollup["min"], rollup["max"], rollup["count"]) == (
+        15,
+        10,
+        20,
+        2,
+    )
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"statistics": "week"}
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_streams_entities(hass, hass_client):
+    """Test the fetch period view streams every entity in order."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass,
+        "history",
+        {"history": {"use_include_order": True, "include": {"domains": ["light"]}}},
+    )
+    start = dt_util.utcnow() - timedelta(seconds=1)
+    hass.states.async_set("light.b", "on")
+    hass.states.async_set("light.a", "on")
+    hass.states.async_set("light.a", "off")
+    hass.states.async_set("switch.c", "on")
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(f"/api/history/period/{start.isoformat()}")
+    assert response.status == 200
+    response_json = await response.json()
+    assert [[state["entity_id"] for state in states] for states in response_json] == [
+        ["light.a", "light.a"],
+        ["light.b"],
+    ]
+    assert response_json[0][1]["state"] == "off"
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "switch.c,light.b,light.none"},
+    )
+    response_json = await response.json()
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "switch.c",
+        "light.b",
+    ]
+
+    response = await client.get(
+        f"/api/history/period/{(start - timedelta(days=2)).isoformat()}"
+    )
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_stream_errors(hass, hass_client):
+    """Test errors fetching the streamed history are reported."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow() - timedelta(seconds=1)
+    hass.states.async_set("light.a", "on")
+    hass.states.async_set("light.b", "on")
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    get_entity_significant_states = history._get_entity_significant_states
+    failing_entity_id = None
+
+    def fail_entity(session, entity_id, *args):
+        """Fail fetching the states of failing_entity_id."""
+        if entity_id == failing_entity_id:
+            raise SQLAlchemyError("Database is gone")
+        return get_entity_significant_states(session, entity_id, *args)
+
+    client = await hass_client()
+    with patch(
+        "homeassistant.components.history._get_entity_significant_states",
+        side_effect=fail_entity,
+    ), patch("homeassistant.components.history.STREAM_ENTITIES_PER_JOB", 1):
+        # The first batch is fetched before the status is sent
+        failing_entity_id = "light.a"
+        response = await client.get(f"/api/history/period/{start.isoformat()}")
+        assert response.status == 500
+
+        # Later batches end the streamed response with an error
+        failing_entity_id = "light.b"
+        response = await client.get(f"/api/history/period/{start.isoformat()}")
+        assert response.status == 200
+        response_json = await response.json()
+
+    assert len(response_json) == 2
+    assert response_json[0][0]["entity_id"] == "light.a"
+    assert "error" in response_json[1]
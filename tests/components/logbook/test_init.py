@@ -72,6 +72,7 @@ class TestComponentLogbook(unittest.TestCase):
         # Logbook entry service call results in firing an event.
         # Our service call will unblock when the event listeners have been
         # scheduled. This means that they may not have been processed yet.
+        trigger_db_commit(self.hass)
         self.hass.block_till_done()
         self.hass.data[recorder.DATA_INSTANCE].block_till_done()
 
@@ -1353,6 +1354,7 @@ async def test_logbook_describe_event(hass, hass_client):
         return_value=dt_util.utcnow() - timedelta(seconds=5),
     ):
         hass.bus.async_fire("some_event")
+        await hass.async_add_job(partial(trigger_db_commit, hass))
         await hass.async_block_till_done()
         await hass.async_add_executor_job(
             hass.data[recorder.DATA_INSTANCE].block_till_done
@@ -1410,6 +1412,7 @@ async def test_exclude_described_event(hass, hass_client):
         hass.bus.async_fire(
             "some_event", {logbook.ATTR_NAME: name, logbook.ATTR_ENTITY_ID: entity_id3}
         )
+        await hass.async_add_job(partial(trigger_db_commit, hass))
         await hass.async_block_till_done()
         await hass.async_add_executor_job(
             hass.data[recorder.DATA_INSTANCE].block_till_done
@@ -1509,3 +1512,100 @@ class MockLazyEventPartialState(ha.Event):
     def context_user_id(self):
         """Context user id of event."""
         return self.context.user_id
+
+
+async def test_logbook_view_paginated(hass, hass_client):
+    """Test the logbook view returns pages after an event_id."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for state in (STATE_OFF, STATE_ON, STATE_OFF, STATE_ON):
+        hass.states.async_set("switch.test", state)
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    # The first state of the entity is not an entry, but does not shorten the page
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}", params={"limit": 2}
+    )
+    assert response.status == 200
+    json = await response.json()
+    assert [entry["message"] for entry in json] == ["turned on", "turned off"]
+    after = response.headers[logbook.HEADER_NEXT_AFTER]
+
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}", params={"limit": 2, "after": after}
+    )
+    assert response.status == 200
+    json = await response.json()
+    assert [entry["message"] for entry in json] == ["turned on"]
+    assert logbook.HEADER_NEXT_AFTER not in response.headers
+
+    # A full last page has no next page
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}", params={"limit": 3}
+    )
+    assert response.status == 200
+    assert len(await response.json()) == 3
+    assert logbook.HEADER_NEXT_AFTER not in response.headers
+
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}", params={"limit": 0}
+    )
+    assert response.status == 400
+
+
+async def test_logbook_view_filters_in_database(hass, hass_client):
+    """Test hidden, continuous and excluded states are not returned."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass, "logbook", {logbook.DOMAIN: {"exclude": {"domains": ["light"]}}}
+    )
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for state in (STATE_OFF, STATE_ON):
+        hass.states.async_set("switch.test", state)
+        hass.states.async_set("switch.hidden", state, {ATTR_HIDDEN: True})
+        hass.states.async_set(
+            "switch.nested", state, {"extra": {ATTR_HIDDEN: True, "text": "hidden"}}
+        )
+        hass.states.async_set("light.test", state)
+        hass.states.async_set("sensor.temperature", state, {"unit_of_measurement": "C"})
+        hass.states.async_set(
+            "sensor.nested", state, {"extra": {"unit_of_measurement": "C"}}
+        )
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    with patch(
+        "homeassistant.components.logbook.LazyEventPartialState",
+        side_effect=logbook.LazyEventPartialState,
+    ) as lazy_event:
+        response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    assert response.status == 200
+    json = await response.json()
+
+    # Hidden and continuous states are not read from the database
+    read_entity_ids = {call[1][0].entity_id for call in lazy_event.mock_calls}
+    assert "switch.hidden" not in read_entity_ids
+    assert "sensor.temperature" not in read_entity_ids
+    assert "light.test" not in read_entity_ids
+    assert "switch.nested" in read_entity_ids
+
+    # Nested attributes do not hide entities or make them continuous
+    assert [entry["entity_id"] for entry in json] == [
+        "switch.test",
+        "switch.nested",
+        "sensor.nested",
+    ]
@@ -10,3 +10,10 @@ def mqtt_mock(loop, hass):
     client = loop.run_until_complete(async_mock_mqtt_component(hass))
     client.reset_mock()
     return client
+
+
+@pytest.fixture
+def mqtt_config_dir(hass, tmp_path):
+    """Fixture to keep files written by MQTT out of the testing config."""
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path
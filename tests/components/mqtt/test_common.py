@@ -486,7 +486,7 @@ async def help_test_entity_id_update_subscriptions(
     assert state is not None
     assert mock_mqtt.async_subscribe.call_count == len(topics)
     for topic in topics:
-        mock_mqtt.async_subscribe.assert_any_call(topic, ANY, ANY, ANY)
+        mock_mqtt.async_subscribe.assert_any_call(topic, ANY, ANY, ANY, wait=True)
     mock_mqtt.async_subscribe.reset_mock()
 
     registry.async_update_entity(f"{domain}.test", new_entity_id=f"{domain}.milk")
@@ -498,7 +498,7 @@ async def help_test_entity_id_update_subscriptions(
     state = hass.states.get(f"{domain}.milk")
     assert state is not None
     for topic in topics:
-        mock_mqtt.async_subscribe.assert_any_call(topic, ANY, ANY, ANY)
+        mock_mqtt.async_subscribe.assert_any_call(topic, ANY, ANY, ANY, wait=True)
 
 
 async def help_test_entity_id_update_discovery_update(
@@ -1,4 +1,5 @@
 """The tests for the MQTT component."""
+import asyncio
 from datetime import datetime, timedelta
 import json
 import ssl
@@ -18,6 +19,7 @@ from homeassistant.const import (
     TEMP_CELSIUS,
 )
 from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
@@ -637,9 +639,9 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
 
         expected = [
-            call("test/state", 2),
-            call("test/state", 0),
-            call("test/state", 1),
+            call([("test/state", 2)]),
+            call([("test/state", 0)]),
+            call([("test/state", 1)]),
         ]
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
@@ -651,7 +653,7 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.data["mqtt"]._mqtt_on_connect(None, None, None, 0)
         self.hass.block_till_done()
 
-        expected.append(call("test/state", 1))
+        expected.append(call([("test/state", 1)]))
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
 
@@ -806,16 +808,113 @@ async def test_mqtt_subscribes_topics_on_connect(hass):
         mqtt.Subscription("still/pending", None, 1),
     ]
 
-    hass.add_job = MagicMock()
-    hass.data["mqtt"]._mqtt_on_connect(None, None, 0, 0)
-
+    # Paho calls back from its own thread
+    await hass.async_add_executor_job(
+        hass.data["mqtt"]._mqtt_on_connect, None, None, 0, 0
+    )
     await hass.async_block_till_done()
 
     assert mqtt_client.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    # All topics are re-subscribed to in one packet with the highest qos
+    assert mqtt_client.subscribe.mock_calls == [
+        call([("topic/test", 0), ("home/sensor", 2), ("still/pending", 1)])
+    ]
+
+
+async def test_subscriptions_are_batched(hass, mqtt_config_dir):
+    """Test subscription changes are sent in as few packets as possible."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    hass.data["mqtt"].connected = True
+
+    unsub = await mqtt.async_subscribe(hass, "test/state", None, wait=False)
+    await mqtt.async_subscribe(hass, "test/+/state", None, 1, wait=False)
+    await mqtt.async_subscribe(hass, "test/+/state", None, 0, wait=False)
+    await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.mock_calls == [
+        call([("test/state", 0), ("test/+/state", 1)])
+    ]
+
+    unsub()
+    unsub_other = await mqtt.async_subscribe(hass, "test/other", None, wait=False)
+    await hass.async_block_till_done()
+
+    assert mqtt_client.unsubscribe.mock_calls == [call(["test/state"])]
+    assert mqtt_client.subscribe.mock_calls[1:] == [call([("test/other", 0)])]
+
+    # Changes cancelling out within the cooldown are not sent
+    unsub = await mqtt.async_subscribe(hass, "test/brief", None, wait=False)
+    unsub()
+    await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.call_count == 2
+    assert mqtt_client.unsubscribe.call_count == 1
+
+    # Unless the broker was already subscribed to the topic
+    unsub = await mqtt.async_subscribe(hass, "test/other", None, 1, wait=False)
+    unsub_other()
+    unsub()
+    await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.call_count == 2
+    assert mqtt_client.unsubscribe.mock_calls[1:] == [call(["test/other"])]
+
+
+async def test_concurrent_subscriptions_wait_for_one_packet(hass, mqtt_config_dir):
+    """Test concurrent subscriptions return once their shared packet was sent."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    hass.data["mqtt"].connected = True
+
+    await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state", None),
+        mqtt.async_subscribe(hass, "test/other", None, 1),
+    )
+
+    # Awaited means subscribed
+    assert mqtt_client.subscribe.mock_calls == [
+        call([("test/state", 0), ("test/other", 1)])
+    ]
+
+
+async def test_subscription_errors(hass, caplog, mqtt_config_dir):
+    """Test failing subscription packets are logged and reported."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    hass.data["mqtt"].connected = True
+    mqtt_client.subscribe.side_effect = [(4, 0), (0, 0)]
+
+    with patch("homeassistant.components.mqtt.MAX_TOPICS_PER_PACKET", 1):
+        await mqtt.async_subscribe(hass, "test/failed", None, wait=False)
+        await mqtt.async_subscribe(hass, "test/state", None, wait=False)
+        await hass.async_block_till_done()
+
+    # The packet after the failed one is still sent
+    assert mqtt_client.subscribe.mock_calls == [
+        call([("test/failed", 0)]),
+        call([("test/state", 0)]),
+    ]
+    assert "Failed to subscribe to test/failed" in caplog.text
+
+    mqtt_client.subscribe.side_effect = None
+    mqtt_client.subscribe.return_value = (4, 0)
+    with pytest.raises(HomeAssistantError):
+        await mqtt.async_subscribe(hass, "test/wait", None)
+
+    mqtt_client.subscribe.return_value = (0, 0)
+    await mqtt.async_subscribe(hass, "test/wait", None)
+    assert mqtt_client.subscribe.call_count == 4
+
+
+async def test_subscriptions_queued_while_disconnected(hass, mqtt_config_dir):
+    """Test queued subscriptions are dropped when disconnected."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    hass.data["mqtt"].connected = True
+
+    await mqtt.async_subscribe(hass, "test/state", None, wait=False)
+    hass.data["mqtt"]._mqtt_on_disconnect(None, None, 0)
+    await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.call_count == 0
 
 
 async def test_setup_fails_without_config(hass):
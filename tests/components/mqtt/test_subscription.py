@@ -133,7 +133,7 @@ async def test_qos_encoding_default(hass, mqtt_mock, caplog):
         {"test_topic1": {"topic": "test-topic1", "msg_callback": msg_callback}},
     )
     mock_mqtt.async_subscribe.assert_called_once_with(
-        "test-topic1", mock.ANY, 0, "utf-8"
+        "test-topic1", mock.ANY, 0, "utf-8", wait=True
     )
 
 
@@ -160,7 +160,7 @@ async def test_qos_encoding_custom(hass, mqtt_mock, caplog):
         },
     )
     mock_mqtt.async_subscribe.assert_called_once_with(
-        "test-topic1", mock.ANY, 1, "utf-16"
+        "test-topic1", mock.ANY, 1, "utf-16", wait=True
     )
 
 
@@ -0,0 +1,70 @@
+"""The tests for the MQTT topic trie."""
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+TOPIC_FILTERS = [
+    "sport/tennis/player1",
+    "sport/tennis/+",
+    "sport/+/player1",
+    "sport/#",
+    "+/+",
+    "/+",
+    "+",
+    "#",
+    "$SYS/#",
+    "$SYS/+/load",
+]
+
+TOPICS = [
+    "sport",
+    "sport/",
+    "sport/tennis",
+    "sport/tennis/player1",
+    "sport/tennis/player1/ranking",
+    "sport/golf/player1",
+    "/finance",
+    "finance",
+    "$SYS/broker/load",
+    "$SYS/uptime",
+]
+
+
+@pytest.mark.parametrize("topic", TOPICS)
+def test_match_like_paho(topic):
+    """Test the trie matches the same filters as the matcher of paho."""
+    trie = TopicTrie()
+    for topic_filter in TOPIC_FILTERS:
+        trie.add(topic_filter, topic_filter)
+
+    expected = []
+    for topic_filter in TOPIC_FILTERS:
+        matcher = MQTTMatcher()
+        matcher[topic_filter] = True
+        if next(matcher.iter_match(topic), False):
+            expected.append(topic_filter)
+
+    assert trie.match(topic) == expected
+
+
+def test_remove():
+    """Test removing items keeps the other items of a filter."""
+    trie = TopicTrie()
+    first, second = object(), object()
+    trie.add("home/+/state", first)
+    trie.add("home/+/state", second)
+    trie.add("home/#", "other")
+
+    trie.remove("home/+/state", first)
+    assert trie.match("home/kitchen/state") == [second, "other"]
+
+    trie.remove("home/+/state", second)
+    assert trie.match("home/kitchen/state") == ["other"]
+    assert "+" not in trie._root.children["home"].children
+
+    with pytest.raises(KeyError):
+        trie.remove("home/+/state", second)
+
+    trie.remove("home/#", "other")
+    assert trie._root.children == {}
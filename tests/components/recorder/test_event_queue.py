@@ -0,0 +1,109 @@
+"""The tests for the recorder event queue."""
+import pytest
+import voluptuous as vol
+
+from homeassistant.components.recorder import CONFIG_SCHEMA
+from homeassistant.components.recorder.const import (
+    QUEUE_POLICY_COALESCE,
+    QUEUE_POLICY_DROP_OLDEST,
+)
+from homeassistant.components.recorder.event_queue import EventQueue
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+
+def _state_event(entity_id, state):
+    """Return a state changed event."""
+    return Event(EVENT_STATE_CHANGED, {"entity_id": entity_id, "new_state": state})
+
+
+def _drain(queue):
+    """Get all items from the queue."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get())
+        queue.task_done()
+    return items
+
+
+def test_unbounded_queue():
+    """Test a queue without maximum accepts all events."""
+    queue = EventQueue()
+    for idx in range(100):
+        queue.put_event(Event("test", {"idx": idx}))
+
+    assert queue.qsize() == 100
+    assert queue.queued_events == 100
+    assert queue.dropped == 0
+
+    # The recorder keeps all events unless a maximum is configured
+    assert CONFIG_SCHEMA({"recorder": {}})["recorder"]["max_queue_size"] == 0
+
+
+def test_drop_oldest():
+    """Test the oldest event is dropped when the queue is full."""
+    queue = EventQueue(3, QUEUE_POLICY_DROP_OLDEST)
+    queue.put(None)
+    for idx in range(5):
+        queue.put_event(Event("test", {"idx": idx}))
+
+    assert queue.dropped == 2
+    assert queue.queued_events == 3
+    items = _drain(queue)
+    # Tasks that are not events are never dropped and do not count
+    assert items[0] is None
+    assert [item.data["idx"] for item in items[1:]] == [2, 3, 4]
+    assert queue.queued_events == 0
+    assert queue.unfinished_tasks == 0
+
+
+def test_coalesce_state_changes():
+    """Test state changes of the same entity are coalesced when full."""
+    queue = EventQueue(2, QUEUE_POLICY_COALESCE)
+    queue.put_event(_state_event("sensor.power", "1"))
+    queue.put_event(_state_event("sensor.other", "1"))
+    queue.put_event(_state_event("sensor.power", "2"))
+    queue.put_event(_state_event("sensor.power", "3"))
+
+    assert queue.qsize() == 2
+    assert queue.dropped == 2
+
+    items = _drain(queue)
+    assert [item.data["new_state"] for item in items] == ["3", "1"]
+    assert queue.unfinished_tasks == 0
+
+    # Once written, the next state change is queued again
+    queue.put_event(_state_event("sensor.power", "4"))
+    queue.put_event(_state_event("sensor.power", "5"))
+    items = _drain(queue)
+    assert [item.data["new_state"] for item in items] == ["4", "5"]
+
+
+def test_coalesce_drops_oldest_without_match():
+    """Test the oldest event is dropped if there is nothing to coalesce."""
+    queue = EventQueue(2, QUEUE_POLICY_COALESCE)
+    queue.put_event(_state_event("sensor.one", "1"))
+    queue.put_event(Event("test"))
+    queue.put_event(_state_event("sensor.two", "1"))
+
+    items = _drain(queue)
+    assert [item.event_type for item in items] == ["test", EVENT_STATE_CHANGED]
+    assert items[1].data["entity_id"] == "sensor.two"
+
+    # The dropped holder is no longer used for coalescing
+    queue.put_event(_state_event("sensor.one", "2"))
+    assert queue.qsize() == 1
+
+
+def test_full_queue_never_blocks():
+    """Test the default policy makes room instead of blocking."""
+    queue = EventQueue(1)
+    assert queue.policy == QUEUE_POLICY_COALESCE
+
+    queue.put_event(Event("test", {"idx": 0}))
+    queue.put_event(Event("test", {"idx": 1}))
+    assert queue.dropped == 1
+    assert [item.data["idx"] for item in _drain(queue)] == [1]
+
+    with pytest.raises(vol.Invalid):
+        CONFIG_SCHEMA({"recorder": {"queue_policy": "block"}})
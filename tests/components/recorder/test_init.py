@@ -3,8 +3,6 @@
 from datetime import datetime, timedelta
 import unittest
 
-import pytest
-
 from homeassistant.components.recorder import (
     Recorder,
     run_information,
@@ -12,7 +10,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL
 from homeassistant.core import ATTR_NOW, EVENT_TIME_CHANGED, callback
@@ -96,23 +99,6 @@ class TestRecorder(unittest.TestCase):
         )
 
 
-@pytest.fixture
-def hass_recorder():
-    """Home Assistant fixture with in-memory recorder."""
-    hass = get_test_home_assistant()
-
-    def setup_recorder(config=None):
-        """Set up with params."""
-        init_recorder_component(hass, config)
-        hass.start()
-        hass.block_till_done()
-        hass.data[DATA_INSTANCE].block_till_done()
-        return hass
-
-    yield setup_recorder
-    hass.stop()
-
-
 def _add_entities(hass, entity_ids):
     """Add entities."""
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
@@ -125,6 +111,8 @@ def _add_entities(hass, entity_ids):
 
 
 def _add_events(hass, events):
+    # Write events that are still waiting for the next commit
+    wait_recording_done(hass)
     with session_scope(hass=hass) as session:
         session.query(Events).delete(synchronize_session=False)
     for event_type in events:
@@ -251,7 +239,7 @@ def test_auto_purge(hass_recorder):
     test_time = tz.localize(datetime(2020, 1, 1, 4, 12, 0))
 
     with patch(
-        "homeassistant.components.recorder.purge.purge_old_data"
+        "homeassistant.components.recorder.purge.purge_old_data", return_value=True
     ) as purge_old_data:
         for delta in (-1, 0, 1):
             hass.bus.fire(
@@ -291,6 +279,35 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test states with the same attributes share them."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"shared": True})
+    hass.states.set("test.two", "on", {"shared": True})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"shared": True})
+    hass.states.set("test.two", "off", {"shared": False})
+    wait_recording_done(hass)
+    # Forgotten ids are looked up in the database
+    hass.data[DATA_INSTANCE].clear_state_attributes_cache()
+    hass.states.set("test.one", "on", {"shared": True})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+
+        states = list(session.query(States))
+        assert len(states) == 5
+        assert all(state.attributes is None for state in states)
+        assert len({state.attributes_id for state in states}) == 2
+        assert states[3].attributes_id != states[0].attributes_id
+        assert states[4].attributes_id == states[0].attributes_id
+
+        assert states[3].to_native() == hass.states.get("test.two")
+        assert states[4].to_native() == hass.states.get("test.one")
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -1,6 +1,7 @@
 """The tests for the Recorder component."""
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.engine import reflection
 from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
@@ -78,3 +79,22 @@ def test_forgiving_add_index():
     engine = create_engine("sqlite://", poolclass=StaticPool)
     models.Base.metadata.create_all(engine)
     migration._create_index(engine, "states", "ix_states_context_id")
+
+
+@pytest.mark.parametrize(
+    "version,table_name,index_name",
+    [
+        (9, "state_attributes", "ix_state_attributes_hash"),
+        (10, "statistics", "ix_statistics_entity_id_period_start"),
+    ],
+)
+def test_create_table(version, table_name, index_name):
+    """Test tables are created with their index, re-runnably."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    engine.execute("CREATE TABLE states (id int)")
+    migration._apply_update(engine, version, version - 1)
+    migration._apply_update(engine, version, version - 1)
+
+    inspector = reflection.Inspector.from_engine(engine)
+    assert table_name in inspector.get_table_names()
+    assert index_name in [index["name"] for index in inspector.get_indexes(table_name)]
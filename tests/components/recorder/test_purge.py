@@ -3,12 +3,21 @@ from datetime import datetime, timedelta
 import json
 import unittest
 
+from sqlalchemy import func
+
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import (
+    Events,
+    StateAttributes,
+    States,
+    Statistics,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 
+from .common import wait_recording_done
+
 from tests.async_mock import patch
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -108,6 +117,76 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 states left after purging
             assert states.count() == 2
 
+    def test_purge_old_states_in_batches(self):
+        """Test deleting old states in batches."""
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with session_scope(hass=self.hass) as session, patch(
+            "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2
+        ):
+            states = session.query(States)
+            assert states.count() == 6
+
+            assert not purge_old_data(instance, 4, repack=False)
+            assert states.count() == 4
+            assert not purge_old_data(instance, 4, repack=False)
+            assert states.count() == 2
+            assert purge_old_data(instance, 4, repack=False)
+            assert states.count() == 2
+
+    def test_purge_old_state_attributes(self):
+        """Test deleting shared attributes no longer used by any state."""
+        self.hass.states.set("test.recorder", "on", {"purge": True})
+        self.hass.states.set("test.recorder", "on", {"purge": False})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            session.query(States).filter(
+                States.state_id == session.query(func.min(States.state_id))
+            ).update(
+                {"last_updated": datetime.now() - timedelta(days=5)},
+                synchronize_session=False,
+            )
+
+        with session_scope(hass=self.hass) as session:
+            state_attributes = session.query(StateAttributes)
+            assert state_attributes.count() == 2
+
+            # run purge_old_data()
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+            assert state_attributes.count() == 1
+            assert state_attributes.one().shared_attrs == '{"purge": false}'
+
+    def test_purge_old_hourly_statistics(self):
+        """Test deleting hourly rollups older than they are kept."""
+        now = datetime.now()
+        with session_scope(hass=self.hass) as session:
+            for period, days in (("hour", 40), ("hour", 20), ("day", 40)):
+                session.add(
+                    Statistics(
+                        entity_id="sensor.power",
+                        period=period,
+                        start=now - timedelta(days=days),
+                        count=1,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            statistics = session.query(Statistics)
+
+            # Kept at least as long as the states
+            purge_old_data(self.hass.data[DATA_INSTANCE], 50, repack=False)
+            assert statistics.count() == 3
+
+            # Daily rollups are kept forever
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert {(row.period, (now - row.start).days) for row in statistics} == {
+                ("hour", 20),
+                ("day", 40),
+            }
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -122,6 +201,22 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_method_in_batches(self):
+        """Test purge method continues until all batches are purged."""
+        self._add_test_events()
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session, patch(
+            "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 1
+        ):
+            self.hass.services.call("recorder", "purge", service_data={"keep_days": 4})
+            self.hass.block_till_done()
+            self.hass.data[DATA_INSTANCE].block_till_done()
+
+            assert session.query(States).count() == 2
+            events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+            assert events.count() == 2
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
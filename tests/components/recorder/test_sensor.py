@@ -0,0 +1,36 @@
+"""The tests for the recorder sensors."""
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.setup import async_setup_component
+
+from tests.common import init_recorder_component
+
+
+async def test_recorder_sensors(hass):
+    """Test the recorder queue and commit duration sensors."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    assert await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "recorder"}}
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_queue")
+    assert state.state == "0"
+    assert state.attributes["dropped_events"] == 0
+    assert state.attributes["max_queue_size"] == 0
+    assert state.attributes["queue_policy"] == "coalesce"
+    assert state.attributes["unit_of_measurement"] == "events"
+
+    state = hass.states.get("sensor.recorder_commit_duration")
+    assert state.attributes["unit_of_measurement"] == "ms"
+
+    instance = hass.data[DATA_INSTANCE]
+    instance.last_commit_duration = 0.0123
+    instance.queue.dropped = 5
+    await hass.helpers.entity_component.async_update_entity("sensor.recorder_queue")
+    await hass.helpers.entity_component.async_update_entity(
+        "sensor.recorder_commit_duration"
+    )
+
+    assert hass.states.get("sensor.recorder_commit_duration").state == "12.3"
+    state = hass.states.get("sensor.recorder_queue")
+    assert state.attributes["dropped_events"] == 5
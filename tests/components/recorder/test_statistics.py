@@ -0,0 +1,81 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_DAY,
+    PERIOD_HOUR,
+    numeric_value,
+    period_start,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+
+
+def test_period_start():
+    """Test the start of hours and days."""
+    original_tz = dt_util.DEFAULT_TIME_ZONE
+    tz = dt_util.get_time_zone("Europe/Copenhagen")
+    dt_util.set_default_time_zone(tz)
+
+    try:
+        point_in_time = datetime(2020, 6, 1, 23, 30, 15, tzinfo=dt_util.UTC)
+        assert period_start(PERIOD_HOUR, point_in_time) == datetime(
+            2020, 6, 1, 23, tzinfo=dt_util.UTC
+        )
+        # Already the 2nd in Copenhagen, which starts at 22:00 UTC in the summer
+        assert period_start(PERIOD_DAY, point_in_time) == datetime(
+            2020, 6, 1, 22, tzinfo=dt_util.UTC
+        )
+    finally:
+        dt_util.set_default_time_zone(original_tz)
+
+
+def test_numeric_value():
+    """Test only finite numbers of states with a unit are aggregated."""
+    attributes = {ATTR_UNIT_OF_MEASUREMENT: "W"}
+    assert numeric_value(State("sensor.power", "10.5", attributes)) == 10.5
+    assert numeric_value(State("sensor.power", "10.5")) is None
+    for value in ("unavailable", "nan", "inf", "-inf"):
+        assert numeric_value(State("sensor.power", value, attributes)) is None
+
+
+def test_compile_statistics(hass_recorder):
+    """Test numeric states are rolled up as they are recorded."""
+    hass = hass_recorder()
+    attributes = {ATTR_UNIT_OF_MEASUREMENT: "W"}
+    start = dt_util.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    for minutes, value in ((10, "10"), (20, "30"), (30, "unavailable"), (70, "5")):
+        with patch(
+            "homeassistant.core.dt_util.utcnow",
+            return_value=start + timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.power", value, attributes)
+        hass.states.set("sensor.text", value)
+        # Rows of the current hour are updated across commits
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        rows = list(
+            session.query(Statistics).order_by(Statistics.period, Statistics.start)
+        )
+        assert [row.entity_id for row in rows] == ["sensor.power"] * 3
+
+        day, first_hour, second_hour = rows
+        assert day.period == PERIOD_DAY
+        assert (day.count, day.min, day.max, day.mean, day.last) == (3, 5, 30, 15, 5)
+
+        assert first_hour.period == PERIOD_HOUR
+        assert first_hour.start == start.replace(tzinfo=None)
+        assert (first_hour.count, first_hour.mean, first_hour.last) == (2, 20, 30)
+
+        assert second_hour.start == (start + timedelta(hours=1)).replace(tzinfo=None)
+        assert (second_hour.count, second_hour.mean, second_hour.last) == (1, 5, 5)
@@ -293,6 +293,52 @@ async def test_service_descriptions(hass):
     )
 
 
+async def test_reload_only_changed(hass):
+    """Test reloading only replaces the scripts whose config changed."""
+    event = "test_event"
+    events = []
+
+    @callback
+    def record_event(event):
+        """Add recorded event to set."""
+        events.append(event)
+
+    hass.bus.async_listen(event, record_event)
+
+    config = {
+        "script": {
+            "test": {"sequence": [{"wait_template": "{{ false }}"}, {"event": event}]},
+            "test2": {"sequence": [{"event": event}]},
+        }
+    }
+    assert await async_setup_component(hass, "script", config)
+    component = hass.data[DOMAIN]
+    test_entity = component.get_entity(ENTITY_ID)
+
+    await hass.services.async_call(DOMAIN, "test")
+    await hass.async_block_till_done()
+    assert script.is_on(hass, ENTITY_ID)
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        return_value={
+            "script": {
+                "test": config["script"]["test"],
+                "test2": {"alias": "Changed", "sequence": [{"event": event}]},
+            }
+        },
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert component.get_entity(ENTITY_ID) is test_entity
+    assert script.is_on(hass, ENTITY_ID)
+    assert hass.states.get("script.test2").name == "Changed"
+    assert hass.services.has_service(DOMAIN, "test2")
+
+    await hass.services.async_call(DOMAIN, "test2", blocking=True)
+    assert len(events) == 1
+
+
 async def test_shared_context(hass):
     """Test that the shared context is passed down the chain."""
     event = "test_event"
@@ -1,7 +1,7 @@
 """Tests for WebSocket API commands."""
 from async_timeout import timeout
 
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, messages
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
@@ -10,9 +10,11 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_timeline
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
+from tests.async_mock import patch
 from tests.common import async_mock_service
 
 
@@ -186,6 +188,31 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_serializes_once(hass, websocket_client):
+    """Test an event is serialized once for all subscriptions."""
+    for iden in (5, 6):
+        await websocket_client.send_json(
+            {"id": iden, "type": "subscribe_events", "event_type": "test_event"}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    with patch(
+        "homeassistant.components.websocket_api.messages.message_to_json",
+        wraps=messages.message_to_json,
+    ) as mock_to_json:
+        hass.bus.async_fire("test_event", {"hello": "world"})
+
+        with timeout(3):
+            first = await websocket_client.receive_json()
+            second = await websocket_client.receive_json()
+
+    assert mock_to_json.call_count == 1
+    assert {first["id"], second["id"]} == {5, 6}
+    assert first["event"] == second["event"]
+    assert first["event"]["data"] == {"hello": "world"}
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -388,6 +415,186 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends compressed states and their changes."""
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    hass.states.async_set("light.permitted", "off", {"color": "red", "size": 2})
+    hass.states.async_set("light.not_permitted", "off")
+    state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "size": 2},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on", {"color": "blue"})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "a": {"color": "blue"},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                },
+                "-": {"a": ["size"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"color": "blue", "size": 3})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"size": 3},
+                    "c": state.context.id,
+                    "lu": state.last_updated.timestamp(),
+                },
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_with_entity_ids(hass, websocket_client):
+    """Test subscribe entities only sends the requested entities."""
+    hass.states.async_set("light.included", "off")
+    hass.states.async_set("light.excluded", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.included", "light.added"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.included"]
+
+    hass.states.async_set("light.excluded", "on")
+    hass.states.async_set("light.added", "on")
+    state = hass.states.get("light.added")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.added": {
+                "s": "on",
+                "a": {},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
+async def test_profiler(hass, websocket_client):
+    """Test profiling the event bus."""
+    await websocket_client.send_json({"id": 5, "type": "profiler/stats"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+    await websocket_client.send_json({"id": 6, "type": "profiler/start"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.bus.async_listen("test_event", callback(lambda event: None))
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 7, "type": "profiler/stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["events"]["test_event"] == 1
+    assert [
+        listener["count"]
+        for listener in msg["result"]["listeners"]
+        if listener["event_type"] == "test_event"
+    ] == [1]
+
+    await websocket_client.send_json({"id": 8, "type": "profiler/stop"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["events"]["test_event"] == 1
+
+    await websocket_client.send_json({"id": 9, "type": "profiler/stop"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+
+async def test_profiler_requires_admin(hass, websocket_client, hass_admin_user):
+    """Test profiling the event bus without being admin."""
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 5, "type": "profiler/start"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_startup_timeline(hass, websocket_client):
+    """Test getting the startup timeline."""
+    await websocket_client.send_json({"id": 5, "type": "startup/timeline"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+    timeline = startup_timeline.async_start_timeline(hass)
+    with startup_timeline.async_record_phase(hass, "test", "setup"):
+        pass
+    timeline.async_stop()
+
+    await websocket_client.send_json({"id": 6, "type": "startup/timeline"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert [integration["domain"] for integration in msg["result"]["integrations"]] == [
+        "test"
+    ]
+
+
 async def test_render_template_renders_template(
     hass, websocket_client, hass_admin_user
 ):
@@ -1,4 +1,5 @@
 """Test Websocket API http module."""
+import asyncio
 from datetime import timedelta
 
 from aiohttp import WSMsgType
@@ -53,6 +54,9 @@ async def test_pending_msg_peak(hass, mock_low_peak, hass_ws_client, caplog):
     for _ in range(5):
         instance._to_write.put_nowait(None)
 
+    # Let the writer stop before the peak check is started
+    await asyncio.sleep(0)
+
     # Trigger the peak check
     instance._send_message({})
 
@@ -3,7 +3,7 @@ from functools import partial
 
 import pytest
 
-from homeassistant.core import callback
+from homeassistant.core import HassJob, callback
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
@@ -113,6 +113,28 @@ async def test_simple_coro(hass):
     assert calls == [3, "bla"]
 
 
+async def test_hass_job(hass):
+    """Test connecting a job."""
+    calls = []
+
+    @callback
+    def test_funct(data):
+        """Test function."""
+        calls.append(data)
+
+    unsub = async_dispatcher_connect(hass, "test", HassJob(test_funct))
+    async_dispatcher_send(hass, "test", 3)
+    await hass.async_block_till_done()
+
+    assert calls == [3]
+
+    unsub()
+    async_dispatcher_send(hass, "test", "bla")
+    await hass.async_block_till_done()
+
+    assert calls == [3]
+
+
 async def test_simple_function_multiargs(hass):
     """Test simple function (executor)."""
     calls = []
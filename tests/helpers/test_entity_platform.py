@@ -1,6 +1,7 @@
 """Tests for the EntityPlatform helper."""
 import asyncio
 from datetime import timedelta
+from itertools import count
 import logging
 
 import pytest
@@ -16,7 +17,7 @@ from homeassistant.helpers.entity_component import (
 )
 import homeassistant.util.dt as dt_util
 
-from tests.async_mock import Mock, patch
+from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
     MockConfigEntry,
     MockEntity,
@@ -90,6 +91,135 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_starts_within_first_interval(hass):
+    """Test the first poll is moved forward by a random part of the interval."""
+    platform = MockEntityPlatform(hass)
+    ent = MockEntity(should_poll=True)
+    ent.async_update = AsyncMock()
+
+    with patch("homeassistant.helpers.entity_platform.random.random", return_value=1):
+        await platform.async_add_entities([ent])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=7))
+    await hass.async_block_till_done()
+    assert ent.async_update.call_count == 0
+
+    async_fire_time_changed(hass, now + timedelta(seconds=8))
+    await hass.async_block_till_done()
+    assert ent.async_update.call_count == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert ent.async_update.call_count == 2
+
+
+async def test_polling_spreads_entities_over_interval(hass):
+    """Test every entity of a platform keeps its own point in the interval."""
+    platform = MockEntityPlatform(hass)
+    early = MockEntity(name="early", should_poll=True)
+    early.async_update = AsyncMock()
+    late = MockEntity(name="late", should_poll=True)
+    late.async_update = AsyncMock()
+
+    with patch(
+        "homeassistant.helpers.entity_platform.random.random", side_effect=[1, 0]
+    ):
+        await platform.async_add_entities([early, late])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=8))
+    await hass.async_block_till_done()
+    assert early.async_update.call_count == 1
+    assert late.async_update.call_count == 0
+
+    async_fire_time_changed(hass, now + timedelta(seconds=15))
+    await hass.async_block_till_done()
+    assert early.async_update.call_count == 1
+    assert late.async_update.call_count == 1
+
+    await platform.async_remove_entity(late.entity_id)
+    assert list(platform._poll_unsubs) == [early.entity_id]
+
+
+async def test_polling_skips_entities_still_updating(hass, caplog):
+    """Test an entity still updating since the previous interval is skipped."""
+    platform = MockEntityPlatform(hass)
+    release = asyncio.Event()
+
+    slow = MockEntity(name="slow", should_poll=True)
+    slow.async_update = AsyncMock(side_effect=release.wait)
+    await platform.async_add_entities([slow])
+
+    first = hass.loop.create_task(
+        platform._async_poll_entity(slow.entity_id, dt_util.utcnow())
+    )
+    while not slow.async_update.called:
+        await asyncio.sleep(0)
+
+    await platform._async_poll_entity(slow.entity_id, dt_util.utcnow())
+    assert slow.async_update.call_count == 1
+    assert (
+        "Updating test_domain.slow took longer than the scheduled update interval"
+        in caplog.text
+    )
+
+    release.set()
+    await first
+    assert platform.poll_durations.count == 1
+
+
+async def test_polling_duration_excludes_parallel_updates(hass):
+    """Test the wait for parallel updates is not part of the poll duration."""
+    mock_platform = MockPlatform()
+    mock_platform.PARALLEL_UPDATES = 1
+    platform = MockEntityPlatform(hass, platform=mock_platform)
+    ent = MockEntity(should_poll=True)
+    ent.async_update = AsyncMock()
+    await platform.async_add_entities([ent])
+
+    await ent.parallel_updates.acquire()
+    task = hass.loop.create_task(
+        platform._async_poll_entity(ent.entity_id, dt_util.utcnow())
+    )
+    await asyncio.sleep(0.1)
+    assert not ent.async_update.called
+    ent.parallel_updates.release()
+    await task
+
+    assert ent.async_update.call_count == 1
+    assert ent.last_update_duration < 0.1
+    assert platform.poll_durations.max < 0.1
+
+
+async def test_polling_backs_off_slow_entities(hass, caplog):
+    """Test entities whose updates keep taking too long are polled less."""
+    platform = MockEntityPlatform(hass)
+    ent = MockEntity(name="slow", should_poll=True)
+    ent.async_update = AsyncMock()
+    await platform.async_add_entities([ent])
+
+    # Every update takes 20 seconds, longer than the scan interval of 15
+    with patch("homeassistant.helpers.entity.timer", side_effect=count(0, 20)):
+        for _ in range(3):
+            await platform._async_poll_entity(ent.entity_id, dt_util.utcnow())
+
+        assert ent.async_update.call_count == 3
+        assert "updating it every 0:00:30" in caplog.text
+
+        for _ in range(3):
+            await platform._async_poll_entity(ent.entity_id, dt_util.utcnow())
+
+        assert ent.async_update.call_count == 5
+
+    # Back to the scan interval once updates are fast again
+    with patch("homeassistant.helpers.entity.timer", side_effect=count(0, 1)):
+        for _ in range(3):
+            await platform._async_poll_entity(ent.entity_id, dt_util.utcnow())
+
+        assert ent.async_update.call_count == 7
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -152,6 +282,10 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
 
     component.setup({DOMAIN: {"platform": "platform"}})
 
+    await hass.async_block_till_done()
+    assert not mock_track.called
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
     await hass.async_block_till_done()
     assert mock_track.called
     assert timedelta(seconds=30) == mock_track.call_args[0][2]
@@ -371,8 +505,12 @@ async def test_async_remove_with_platform(hass):
     entity1 = MockEntity(name="test_1")
     await component.async_add_entities([entity1])
     assert len(hass.states.async_entity_ids()) == 1
+    assert component.get_entity(entity1.entity_id) is entity1
     await entity1.async_remove()
     assert len(hass.states.async_entity_ids()) == 0
+    assert component.get_entity(entity1.entity_id) is None
+    assert hass.data[entity_platform.DATA_DOMAIN_ENTITIES][DOMAIN] == {}
+    assert hass.data[entity_platform.DATA_INTEGRATION_ENTITIES][DOMAIN] == {}
 
 
 async def test_not_adding_duplicate_entities_with_unique_id(hass):
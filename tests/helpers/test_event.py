@@ -10,11 +10,15 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.helpers.event import (
+    TRACK_POINT_IN_TIME_SCHEDULER,
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_STATE_CHANGE_LISTENER,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
     async_track_state_change,
+    async_track_state_change_event,
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
@@ -85,6 +89,127 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_shared_listener(hass):
+    """Test pending points in time share one time listener."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x, idx=idx: runs.append(idx)),
+            birthday_paulus + timedelta(seconds=idx % 3),
+        )
+        for idx in range(6)
+    ]
+    scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER]
+
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+    assert scheduler.pending == 6
+
+    unsubs[4]()
+    # Cancelling twice is a no-op
+    unsubs[4]()
+    assert scheduler.pending == 5
+
+    _send_time_changed(hass, birthday_paulus + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == [0, 3, 1]
+    assert scheduler.pending == 2
+
+    # Cancelling an action that already ran is a no-op
+    unsubs[0]()
+    assert scheduler.pending == 2
+
+    _send_time_changed(hass, birthday_paulus + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == [0, 3, 1, 2, 5]
+    assert scheduler.pending == 0
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(6)), birthday_paulus
+    )
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+
+    unsub()
+    assert scheduler.pending == 0
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_track_state_change_event(hass):
+    """Test async_track_state_change_event."""
+    single_entity_id_tracker = []
+    multiple_entity_id_tracker = []
+
+    @ha.callback
+    def single_run_callback(event):
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+
+        single_entity_id_tracker.append((old_state, new_state))
+
+    @ha.callback
+    def multiple_run_callback(event):
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+
+        multiple_entity_id_tracker.append((old_state, new_state))
+
+    @ha.callback
+    def callback_that_throws(event):
+        raise ValueError
+
+    unsub_single = async_track_state_change_event(
+        hass, ["light.Bowl"], single_run_callback
+    )
+    unsub_multi = async_track_state_change_event(
+        hass, ["light.Bowl", "switch.kitchen"], multiple_run_callback
+    )
+    unsub_throws = async_track_state_change_event(
+        hass, "light.bowl", callback_that_throws
+    )
+
+    assert hass.bus.async_listeners()[ha.EVENT_STATE_CHANGED] == 1
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 3
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["switch.kitchen"]) == 1
+
+    # Adding state to state machine
+    hass.states.async_set("light.Bowl", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert single_entity_id_tracker[-1][0] is None
+    assert single_entity_id_tracker[-1][1] is not None
+    assert len(multiple_entity_id_tracker) == 1
+
+    # Set same state should not trigger a state change/listener
+    hass.states.async_set("light.Bowl", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 1
+
+    # Other entities are not dispatched to the single tracker
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_set("switch.other", "on")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 2
+
+    unsub_single()
+    unsub_throws()
+    assert "light.bowl" in hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+
+    hass.states.async_set("light.Bowl", "off")
+    await hass.async_block_till_done()
+    assert len(single_entity_id_tracker) == 1
+    assert len(multiple_entity_id_tracker) == 3
+
+    unsub_multi()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+    assert TRACK_STATE_CHANGE_LISTENER not in hass.data
+    assert ha.EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -598,6 +723,33 @@ async def test_async_track_time_change(hass):
     assert len(wildcard_runs) == 3
 
 
+async def test_async_track_time_change_shares_scheduler(hass):
+    """Test time patterns are armed on the point in time scheduler."""
+    specific_runs = []
+
+    unsubs = [
+        async_track_utc_time_change(
+            hass, lambda x: specific_runs.append(1), minute="/5", second=0
+        )
+        for _ in range(10)
+    ]
+    scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER]
+
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+    assert scheduler.pending == 10
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 12, 0, 0))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 10
+    assert scheduler.pending == 10
+
+    for unsub in unsubs:
+        unsub()
+
+    assert scheduler.pending == 0
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_periodic_task_minute(hass):
     """Test periodic tasks per minute."""
     specific_runs = []
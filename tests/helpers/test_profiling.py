@@ -0,0 +1,163 @@
+"""Test the event bus profiler."""
+import asyncio
+import gc
+
+from homeassistant.core import callback
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers import profiling
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+import homeassistant.util.dt as dt_util
+
+from tests.async_mock import patch
+from tests.common import MockEntity, MockEntityPlatform, async_fire_time_changed
+
+
+async def test_profile_listeners(hass):
+    """Test listeners are measured per event type."""
+    calls = []
+
+    @callback
+    def callback_listener(event):
+        """Handle event in the event loop."""
+        calls.append(event)
+
+    async def coro_listener(event):
+        """Handle event in a coroutine."""
+        calls.append(event)
+
+    def executor_listener(event):
+        """Handle event in the executor."""
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", callback_listener)
+    hass.bus.async_listen("test_event", coro_listener)
+    hass.bus.async_listen("test_event", executor_listener)
+
+    profiler = profiling.async_start_profiler(hass)
+    assert profiling.async_start_profiler(hass) is profiler
+    assert profiling.async_get_profiler(hass) is profiler
+
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("other_event")
+    await hass.async_block_till_done()
+
+    assert profiling.async_stop_profiler(hass) is profiler
+    assert profiling.async_get_profiler(hass) is None
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 9
+
+    profile = profiler.as_dict()
+    assert profile["events"] == {"test_event": 2, "other_event": 1}
+
+    listeners = {listener["listener"]: listener for listener in profile["listeners"]}
+    assert len(listeners) == 3
+    for func in (callback_listener, coro_listener, executor_listener):
+        listener = listeners[f"{__name__}.{func.__qualname__}"]
+        assert listener["event_type"] == "test_event"
+        assert listener["count"] == 2
+        assert 0 <= listener["p50"] <= listener["p99"] <= listener["max"]
+
+
+async def test_profile_removed_listeners(hass):
+    """Test the jobs of removed listeners are not kept alive."""
+    profiler = profiling.async_start_profiler(hass)
+
+    for _ in range(3):
+        hass.bus.async_listen_once("test_event", lambda event: None)
+        hass.bus.async_fire("test_event")
+        await hass.async_block_till_done()
+
+    gc.collect()
+    assert not profiler._jobs["test_event"]
+    assert profiler.as_dict()["listeners"][0]["count"] == 3
+    profiling.async_stop_profiler(hass)
+
+
+async def test_profile_reuses_profiled_jobs(hass):
+    """Test the profiled job of a listener is built once."""
+    hass.bus.async_listen("test_event", callback(lambda event: None))
+    profiler = profiling.async_start_profiler(hass)
+
+    with patch.object(profiler, "_wrap_job", wraps=profiler._wrap_job) as mock_wrap_job:
+        for _ in range(3):
+            hass.bus.async_fire("test_event")
+        await hass.async_block_till_done()
+
+    assert len(mock_wrap_job.mock_calls) == 1
+    assert profiler.as_dict()["listeners"][0]["count"] == 3
+    profiling.async_stop_profiler(hass)
+
+
+async def test_profile_shared_listeners(hass):
+    """Test the actions of the state change and time trackers are measured."""
+    calls = []
+
+    @callback
+    def state_action(event):
+        """Handle a state change of a tracked entity."""
+        calls.append(event)
+
+    @callback
+    def time_action(now):
+        """Handle a point in time."""
+        calls.append(now)
+
+    now = dt_util.utcnow()
+    async_track_state_change_event(hass, ["light.kitchen"], state_action)
+    async_track_point_in_utc_time(hass, time_action, now)
+    profiler = profiling.async_start_profiler(hass)
+
+    hass.states.async_set("light.kitchen", "on")
+    async_fire_time_changed(hass, now)
+    await hass.async_block_till_done()
+    profiling.async_stop_profiler(hass)
+    assert len(calls) == 2
+
+    listeners = {
+        listener["listener"]: listener for listener in profiler.as_dict()["listeners"]
+    }
+    for action, event_type in (
+        (state_action, EVENT_STATE_CHANGED),
+        (time_action, EVENT_TIME_CHANGED),
+    ):
+        listener = listeners[f"{__name__}.{action.__qualname__}"]
+        assert listener["event_type"] == event_type
+        assert listener["count"] == 1
+
+
+async def test_profile_loop_lag(hass):
+    """Test the event loop lag and executor queue are sampled."""
+    with patch("homeassistant.helpers.profiling.LAG_INTERVAL", 0.01):
+        profiler = profiling.async_start_profiler(hass)
+        await asyncio.sleep(0.05)
+        profiling.async_stop_profiler(hass)
+
+    profile = profiler.as_dict()
+    assert profile["loop_lag"]["count"] > 0
+    assert profile["loop_lag"]["p50"] >= 0
+    assert profile["executor_queue"]["count"] == profile["loop_lag"]["count"]
+    assert profile["executor_queue"]["current"] == 0
+    assert profile["duration"] > 0
+
+
+async def test_profile_polling(hass):
+    """Test the poll durations of entity platforms are reported."""
+    platform = MockEntityPlatform(hass)
+    entity = MockEntity(should_poll=True)
+    await platform.async_add_entities([entity])
+
+    profiler = profiling.async_start_profiler(hass)
+    await platform._async_poll_entity(entity.entity_id, dt_util.utcnow())
+    profiling.async_stop_profiler(hass)
+
+    polling = profiler.as_dict()["polling"]
+    assert len(polling) == 1
+    assert polling[0]["domain"] == "test_domain"
+    assert polling[0]["platform"] == "test_platform"
+    assert polling[0]["count"] == 1
@@ -1,5 +1,5 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.core import CoreState, State
@@ -7,6 +7,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE_TASK,
+    DELTA_STORAGE_KEY,
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
@@ -268,3 +269,90 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_dump_changed_states(hass, hass_storage):
+    """Test only the changed states are dumped between saves of all states."""
+    for entity_id in ("input_boolean.b0", "input_boolean.b1", "input_boolean.b2"):
+        hass.states.async_set(entity_id, "off")
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states()
+
+    # All states are saved as they are all new
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 3
+    assert DELTA_STORAGE_KEY not in hass_storage
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data:
+        await data.async_dump_states()
+    assert not mock_write_data.called
+
+    hass.states.async_set("input_boolean.b1", "on")
+    await data.async_dump_states()
+
+    assert [
+        (item["state"]["entity_id"], item["state"]["state"])
+        for item in hass_storage[DELTA_STORAGE_KEY]["data"]
+    ] == [("input_boolean.b1", "on")]
+    assert {
+        item["state"]["entity_id"]: item["state"]["state"]
+        for item in hass_storage[STORAGE_KEY]["data"]
+    }["input_boolean.b1"] == "off"
+
+    # Emulate a fresh load
+    hass.data[DATA_RESTORE_STATE_TASK] = None
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+
+    with patch("homeassistant.helpers.restore_state.Store.async_save"), patch.object(
+        hass.states, "async_all", return_value=[]
+    ):
+        state = await entity.async_get_last_state()
+        await hass.async_block_till_done()
+
+    assert state.state == "on"
+
+    # Changes grew past half of the states, all states are saved
+    hass.states.async_set("input_boolean.b2", "on")
+    await data.async_dump_states()
+
+    assert hass_storage[DELTA_STORAGE_KEY]["data"] == []
+    assert {
+        item["state"]["entity_id"]: item["state"]["state"]
+        for item in hass_storage[STORAGE_KEY]["data"]
+    } == {
+        "input_boolean.b0": "off",
+        "input_boolean.b1": "on",
+        "input_boolean.b2": "on",
+    }
+
+
+async def test_stale_changed_states_ignored(hass, hass_storage):
+    """Test changed states older than the saved states are ignored."""
+    now = dt_util.utcnow()
+    for key, state, last_seen in (
+        (STORAGE_KEY, "on", now),
+        (DELTA_STORAGE_KEY, "off", now - timedelta(minutes=15)),
+    ):
+        hass_storage[key] = {
+            "version": 1,
+            "key": key,
+            "data": [
+                StoredState(State("input_boolean.b0", state), last_seen).as_dict()
+            ],
+        }
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+
+    state = await entity.async_get_last_state()
+    assert state.state == "on"
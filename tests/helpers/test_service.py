@@ -573,6 +573,27 @@ async def test_call_with_omit_entity_id(hass, mock_handle_entity_call, mock_enti
     assert len(mock_handle_entity_call.mock_calls) == 0
 
 
+async def test_call_with_registered_entities(
+    hass, mock_handle_entity_call, mock_entities, caplog
+):
+    """Check targeted entities are looked up in the registered entities."""
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.kitchen", "light.unknown"]},
+        ),
+    )
+
+    assert [call[1][1] for call in mock_handle_entity_call.mock_calls] == [
+        mock_entities["light.kitchen"]
+    ]
+    assert "Unable to find referenced entities light.unknown" in caplog.text
+
+
 async def test_register_admin_service(hass, hass_read_only_user, hass_admin_user):
     """Test the register admin service."""
     calls = []
@@ -0,0 +1,63 @@
+"""Test the startup timeline."""
+import time
+
+from homeassistant.helpers import startup_timeline
+from homeassistant.setup import async_setup_component
+
+from tests.async_mock import patch
+from tests.common import MockModule, mock_integration
+
+
+async def test_record_setup(hass):
+    """Test the phases of setting up integrations are recorded."""
+
+    async def async_setup(hass, config):
+        """Block the event loop while setting up."""
+        time.sleep(0.05)
+        return True
+
+    mock_integration(hass, MockModule("dep"))
+    mock_integration(
+        hass, MockModule("comp", dependencies=["dep"], async_setup=async_setup)
+    )
+
+    with patch("homeassistant.helpers.startup_timeline.LAG_INTERVAL", 0.01):
+        timeline = startup_timeline.async_start_timeline(hass)
+        assert await async_setup_component(hass, "comp", {})
+        await hass.async_block_till_done()
+        timeline.async_stop()
+
+    assert startup_timeline.async_get_timeline(hass) is timeline
+
+    # Not recorded once stopped
+    mock_integration(hass, MockModule("other"))
+    assert await async_setup_component(hass, "other", {})
+
+    result = timeline.as_dict()
+    assert [integration["domain"] for integration in result["integrations"]] == [
+        "comp",
+        "dep",
+    ]
+
+    comp = result["integrations"][0]["phases"]
+    assert set(comp) == {
+        startup_timeline.PHASE_DEPENDENCIES,
+        startup_timeline.PHASE_IMPORT,
+        startup_timeline.PHASE_CONFIG,
+        startup_timeline.PHASE_SETUP,
+        startup_timeline.PHASE_ENTRIES,
+    }
+    setup = comp[startup_timeline.PHASE_SETUP]
+    assert setup["duration"] >= 0.05
+    assert setup["loop_blocked"] > 0
+    assert comp[startup_timeline.PHASE_DEPENDENCIES]["start"] <= setup["start"]
+    assert result["loop_blocked"] >= setup["loop_blocked"]
+    assert result["duration"] >= setup["duration"]
+
+
+async def test_record_phase_without_timeline(hass):
+    """Test phases are not recorded without a timeline."""
+    with startup_timeline.async_record_phase(hass, "comp", "setup"):
+        pass
+
+    assert startup_timeline.async_get_timeline(hass) is None
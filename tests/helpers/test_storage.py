@@ -236,3 +236,89 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+async def test_writes_flushed_together(hass, hass_storage):
+    """Test writes of stores in the same loop iteration share an executor job."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2")
+
+    with patch(
+        "homeassistant.helpers.storage._write_pending", wraps=storage._write_pending,
+    ) as mock_write:
+        await asyncio.gather(store.async_save(MOCK_DATA), store2.async_save(MOCK_DATA2))
+
+    assert len(mock_write.mock_calls) == 1
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+
+
+async def test_delayed_saves_flushed_together(hass, hass_storage):
+    """Test staggered delayed saves of stores share an executor job."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2")
+    now = dt.utcnow()
+
+    with patch(
+        "homeassistant.helpers.storage._write_pending", wraps=storage._write_pending,
+    ) as mock_write:
+        store.async_delay_save(lambda: MOCK_DATA, 1)
+        store2.async_delay_save(lambda: MOCK_DATA2, 2)
+
+        async_fire_time_changed(hass, now + timedelta(seconds=1.5))
+        await asyncio.sleep(storage.WRITE_COALESCE_DELAY / 3)
+        assert store.key not in hass_storage
+
+        async_fire_time_changed(hass, now + timedelta(seconds=2.5))
+        await hass.async_block_till_done()
+
+    assert len(mock_write.mock_calls) == 1
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+
+
+async def test_final_write_flushes_delayed_saves(hass, store, hass_storage):
+    """Test delayed saves waiting for other stores are written on final write."""
+    with patch("homeassistant.helpers.storage.WRITE_COALESCE_DELAY", 100):
+        store.async_delay_save(lambda: MOCK_DATA, 1)
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await asyncio.sleep(0.01)
+        assert store.key not in hass_storage
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+
+
+async def test_write_errors_logged(hass, store, hass_storage, caplog):
+    """Test a failed write is logged and does not fail other writes."""
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2")
+
+    with patch.object(
+        store, "_write_data", side_effect=storage.json_util.WriteError("Boom")
+    ):
+        await asyncio.gather(store.async_save(MOCK_DATA), store2.async_save(MOCK_DATA2))
+
+    assert f"Error writing config for {MOCK_KEY}: Boom" in caplog.text
+    assert store.key not in hass_storage
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+
+
+def test_write_data_unchanged(tmp_path):
+    """Test data is only written when it changed since the last write."""
+    store = storage.Store(Mock(), MOCK_VERSION, MOCK_KEY, compact=True)
+    path = str(tmp_path / storage.STORAGE_DIR / MOCK_KEY)
+
+    with patch(
+        "homeassistant.util.json.write_json", wraps=storage.json_util.write_json
+    ) as mock_write:
+        store._write_data(path, {"data": MOCK_DATA})
+        store._write_data(path, {"data": MOCK_DATA})
+        assert len(mock_write.mock_calls) == 1
+
+        with open(path) as fil:
+            assert fil.read() == '{"data":{"hello":"world"}}'
+
+        store._write_data(path, {"data": MOCK_DATA2})
+        assert len(mock_write.mock_calls) == 2
@@ -0,0 +1,23 @@
+"""Test the benchmark script."""
+from homeassistant.helpers import profiling
+from homeassistant.scripts import benchmark
+
+
+async def test_print_profile_running_listener(hass, capsys):
+    """Test listeners that did not finish yet are not printed."""
+
+    async def slow_listener(event):
+        """Handle the event after profiling stopped."""
+        await hass.async_add_executor_job(lambda: None)
+
+    hass.bus.async_listen("test_event", slow_listener)
+    profiler = profiling.async_start_profiler(hass)
+    hass.bus.async_fire("test_event")
+    profiling.async_stop_profiler(hass)
+
+    benchmark.print_profile(profiler.as_dict())
+    await hass.async_block_till_done()
+
+    output = capsys.readouterr().out
+    assert "Event test_event fired 1 times" in output
+    assert "Listener" not in output
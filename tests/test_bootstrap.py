@@ -7,9 +7,10 @@ from unittest.mock import Mock
 
 import pytest
 
-from homeassistant import bootstrap
+from homeassistant import bootstrap, loader
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_timeline
 import homeassistant.util.dt as dt_util
 
 from tests.async_mock import patch
@@ -90,6 +91,45 @@ async def test_setting_up_config(hass, caplog):
     assert "group" in hass.config.components
 
 
+async def test_prefetch_integrations(hass):
+    """Test integrations are imported unless they need requirements to install."""
+    hass.config.skip_pip = False
+    mock_integration(hass, MockModule("needs_reqs", requirements=["package==1.0"]))
+    mock_integration(hass, MockModule("depends_on_reqs", dependencies=["needs_reqs"]))
+    mock_integration(hass, MockModule("has_reqs", requirements=["installed==1.0"]))
+    mock_integration(hass, MockModule("depends_on_has_reqs", dependencies=["has_reqs"]))
+    mock_integration(hass, MockModule("no_reqs"))
+    imported = {}
+
+    async def mock_import_modules(self, platform_names=(), *, component=True):
+        """Record the imported integrations."""
+        imported[self.domain] = list(platform_names)
+
+    config = {
+        "needs_reqs": {},
+        "depends_on_reqs": {},
+        "has_reqs": {},
+        "depends_on_has_reqs": {},
+        "no_reqs": {},
+        "light": {"platform": "no_reqs"},
+        "sensor": [{"platform": "needs_reqs"}],
+    }
+    with patch.object(
+        loader.Integration, "async_import_modules", mock_import_modules
+    ), patch(
+        "homeassistant.bootstrap.is_installed", side_effect=lambda req: req[0] == "i"
+    ):
+        await bootstrap._async_prefetch_integrations(hass, config, set(config))
+
+    assert imported == {
+        "has_reqs": [],
+        "depends_on_has_reqs": [],
+        "no_reqs": ["light"],
+        "light": [],
+        "sensor": [],
+    }
+
+
 async def test_setup_after_deps_all_present(hass, caplog):
     """Test after_dependencies when all present."""
     caplog.set_level(logging.DEBUG)
@@ -131,6 +171,25 @@ async def test_setup_after_deps_all_present(hass, caplog):
     assert "second_dep" in hass.config.components
     assert order == ["root", "first_dep", "second_dep"]
 
+    timeline = startup_timeline.async_get_timeline(hass).as_dict()
+    setup_started = {
+        integration["domain"]: integration["phases"]["setup"]["start"]
+        for integration in timeline["integrations"]
+    }
+    assert setup_started["root"] < setup_started["first_dep"]
+    assert setup_started["first_dep"] < setup_started["second_dep"]
+
+
+async def test_timeline_stopped_on_error(hass):
+    """Test the startup timeline is stopped when setting up fails."""
+    with patch(
+        "homeassistant.bootstrap._get_domains", side_effect=HomeAssistantError
+    ), pytest.raises(HomeAssistantError):
+        await bootstrap._async_set_up_integrations(hass, {})
+
+    timeline = startup_timeline.async_get_timeline(hass)
+    assert timeline._lag_handle is None
+
 
 async def test_setup_after_deps_not_trigger_load(hass, caplog):
     """Test after_dependencies does not trigger loading it."""
@@ -112,6 +112,70 @@ def test_async_add_job_add_threaded_job_to_pool():
     assert len(hass.loop.run_in_executor.mock_calls) == 1
 
 
+def test_async_add_hass_job_schedule_callback():
+    """Test that we schedule coroutines and add jobs to the job pool."""
+    hass = MagicMock()
+    job = MagicMock()
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(hass.loop.call_soon.mock_calls) == 1
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.add_job.mock_calls) == 0
+
+
+def test_async_add_hass_job_schedule_partial_callback():
+    """Test that we schedule partial coros and add jobs to the job pool."""
+    hass = MagicMock()
+    job = MagicMock()
+    partial = functools.partial(ha.callback(job))
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
+    assert len(hass.loop.call_soon.mock_calls) == 1
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.add_job.mock_calls) == 0
+
+
+def test_async_add_hass_job_schedule_coroutinefunction(loop):
+    """Test that we schedule coroutines and add jobs to the job pool."""
+    hass = MagicMock(loop=MagicMock(wraps=loop))
+
+    async def job():
+        pass
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
+    assert len(hass.loop.call_soon.mock_calls) == 0
+    assert len(hass.loop.create_task.mock_calls) == 1
+    assert len(hass.add_job.mock_calls) == 0
+
+
+def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
+    """Test that we schedule partial coros and add jobs to the job pool."""
+    hass = MagicMock(loop=MagicMock(wraps=loop))
+
+    async def job():
+        pass
+
+    partial = functools.partial(job)
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
+    assert len(hass.loop.call_soon.mock_calls) == 0
+    assert len(hass.loop.create_task.mock_calls) == 1
+    assert len(hass.add_job.mock_calls) == 0
+
+
+def test_async_add_hass_job_add_threaded_job_to_pool():
+    """Test that we schedule coroutines and add jobs to the job pool."""
+    hass = MagicMock()
+
+    def job():
+        pass
+
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
+    assert len(hass.loop.call_soon.mock_calls) == 0
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.loop.run_in_executor.mock_calls) == 1
+
+
 def test_async_create_task_schedule_coroutine(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
@@ -151,6 +215,59 @@ def test_async_run_job_delegates_non_async():
     assert len(hass.async_add_job.mock_calls) == 1
 
 
+def test_async_run_hass_job_calls_callback():
+    """Test that the callback annotation is respected."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 0
+
+
+def test_async_run_hass_job_delegates_non_async():
+    """Test that the callback annotation is respected."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(job))
+    assert len(calls) == 0
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+
+
+def test_hass_job_types():
+    """Test the job type is determined once when creating a job."""
+
+    async def coro_job():
+        pass
+
+    @ha.callback
+    def callback_job():
+        pass
+
+    def executor_job():
+        pass
+
+    assert ha.HassJob(coro_job).job_type == ha.HassJobType.Coroutinefunction
+    assert (
+        ha.HassJob(functools.partial(coro_job)).job_type
+        == ha.HassJobType.Coroutinefunction
+    )
+    assert ha.HassJob(callback_job).job_type == ha.HassJobType.Callback
+    assert ha.HassJob(executor_job).job_type == ha.HassJobType.Executor
+
+    coro = coro_job()
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+    coro.close()
+
+
 def test_stage_shutdown():
     """Simulate a shutdown, test calling stuff."""
     hass = get_test_home_assistant()
@@ -1,4 +1,6 @@
 """Test to verify that we can load components."""
+import sys
+
 import pytest
 
 from homeassistant.components import http, hue
@@ -36,6 +38,33 @@ async def test_component_dependencies(hass):
         print(await loader.async_component_dependencies(hass, "nonexisting"))
 
 
+async def test_component_dependencies_cached(hass):
+    """Test the dependencies of a component are only resolved once."""
+    mock_integration(hass, MockModule("mod1"))
+    mock_integration(hass, MockModule("mod2", ["mod1"]))
+    mock_integration(hass, MockModule("mod3", ["mod2"]))
+
+    assert await loader.async_component_dependencies(hass, "mod2") == {
+        "mod1",
+        "mod2",
+    }
+
+    with patch(
+        "homeassistant.loader.async_get_integration",
+        wraps=loader.async_get_integration,
+    ) as mock_get:
+        dependencies = await loader.async_component_dependencies(hass, "mod3")
+        dependencies.add("mod4")
+        assert await loader.async_component_dependencies(hass, "mod3") == {
+            "mod1",
+            "mod2",
+            "mod3",
+        }
+
+    # Only mod3 itself was resolved, the dependencies of mod2 were cached
+    assert len(mock_get.mock_calls) == 1
+
+
 def test_component_loader(hass):
     """Test loading components."""
     components = loader.Components(hass)
@@ -126,6 +155,49 @@ async def test_get_integration(hass):
     assert hue_light == integration.get_platform("light")
 
 
+async def test_get_integration_in_executor(hass):
+    """Test importing an integration and its platforms in the executor."""
+    integration = await loader.async_get_integration(hass, "test")
+
+    with patch.dict(sys.modules):
+        for name in ("custom_components.test", "custom_components.test.light"):
+            sys.modules.pop(name, None)
+
+        component = await integration.async_get_component()
+        platform = await integration.async_get_platform("light")
+
+    assert component.__name__ == "custom_components.test"
+    assert platform.__name__ == "custom_components.test.light"
+    assert hass.data[loader.DATA_IMPORT_TIMES]["test"] > 0
+
+
+async def test_get_integrations(hass):
+    """Test resolving integrations together."""
+    with patch(
+        "homeassistant.loader._resolve_integrations_from_root",
+        wraps=loader._resolve_integrations_from_root,
+    ) as mock_resolve:
+        integrations = await loader.async_get_integrations(
+            hass, ["hue", "test_package", "non_existing"]
+        )
+
+    assert len(mock_resolve.mock_calls) == 1
+    assert integrations["hue"].domain == "hue"
+    assert integrations["test_package"].domain == "test_package"
+    assert isinstance(integrations["non_existing"], loader.IntegrationNotFound)
+    assert "non_existing" not in hass.data[loader.DATA_INTEGRATIONS]
+
+    # Integrations that do not exist are not cached
+    with patch(
+        "homeassistant.loader._resolve_integrations_from_root", return_value={}
+    ) as mock_resolve:
+        assert await loader.async_get_integration(hass, "hue") is integrations["hue"]
+        with pytest.raises(loader.IntegrationNotFound):
+            await loader.async_get_integration(hass, "non_existing")
+
+    assert len(mock_resolve.mock_calls) == 1
+
+
 async def test_get_integration_legacy(hass):
     """Test resolving integration."""
     integration = await loader.async_get_integration(hass, "test_embedded")
@@ -94,6 +94,22 @@ async def test_install_missing_package(hass):
     assert len(mock_inst.mock_calls) == 1
 
 
+async def test_install_scans_packages_in_executor(hass):
+    """Test installed packages are scanned once and after every install."""
+    with patch(
+        "homeassistant.util.package.installed_versions", return_value={}
+    ) as mock_versions, patch(
+        "homeassistant.util.package.is_installed", return_value=False
+    ), patch(
+        "homeassistant.util.package.install_package", return_value=True
+    ):
+        await async_process_requirements(
+            hass, "test_component", ["hello==1.0.0", "world==1.0.0"]
+        )
+
+    assert len(mock_versions.mock_calls) == 3
+
+
 async def test_get_integration_with_requirements(hass):
     """Check getting an integration with loaded requirements."""
     hass.config.skip_pip = False
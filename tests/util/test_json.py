@@ -17,6 +17,7 @@ from homeassistant.util.json import (
     find_paths_unserializable_data,
     load_json,
     save_json,
+    serialize_json,
 )
 
 from tests.async_mock import Mock
@@ -54,6 +55,14 @@ def test_save_and_load():
     assert data == TEST_JSON_A
 
 
+def test_serialize_compact():
+    """Test serializing without indentation."""
+    assert serialize_json("test.json", TEST_JSON_A, compact=True) == '{"B":"two","a":1}'
+    assert serialize_json("test.json", TEST_JSON_A) == dumps(
+        TEST_JSON_A, sort_keys=True, indent=4
+    )
+
+
 # Skipped on Windows
 @unittest.skipIf(
     sys.platform.startswith("win"), "private permissions not supported on Windows"
@@ -248,3 +248,41 @@ def test_check_package_global():
 def test_check_package_zip():
     """Test for an installed zip package."""
     assert not package.is_installed(TEST_ZIP_REQ)
+
+
+def test_check_package_pinned():
+    """Test for a package pinned to a version."""
+    installed_package = list(pkg_resources.working_set)[0]
+    name = installed_package.project_name
+    assert package.is_installed(f"{name}=={installed_package.version}")
+    assert not package.is_installed(f"{name}==0.0.0.dev0")
+    assert package.is_installed(f"{name.upper()}>={installed_package.version}")
+
+
+def test_installed_versions_cached():
+    """Test installed distributions are scanned again when sys.path changed."""
+    with patch.object(package, "_INSTALLED", None), patch(
+        "homeassistant.util.package.distributions", wraps=package.distributions
+    ) as mock_distributions:
+        versions = package.installed_versions()
+        assert package.installed_versions() is versions
+        assert len(mock_distributions.mock_calls) == 1
+
+        with patch(
+            "homeassistant.util.package._sys_path_mtimes", return_value=(("path", 1),)
+        ):
+            assert package.installed_versions() == versions
+
+        assert len(mock_distributions.mock_calls) == 2
+
+
+def test_is_installed_uses_last_scan():
+    """Test checking a requirement does not check sys.path for changes."""
+    with patch.object(package, "_INSTALLED", ((), {"hello": "1.0.0"})), patch(
+        "homeassistant.util.package._sys_path_mtimes"
+    ) as mock_mtimes:
+        assert package.is_installed("hello==1.0.0")
+        assert package.is_installed("Hello>=0.9")
+        assert not package.is_installed("world==1.0.0")
+
+    assert not mock_mtimes.called